@@ -0,0 +1,276 @@
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.auto_diff.forward_mode.fnode import Fnode
+from src.auto_diff.forward_mode.vector_fn import Vector_Fn
+from src.auto_diff.forward_mode import chunked
+import src.auto_diff.forward_mode.elem as elem_fn
+from src.auto_diff.reverse_mode.rnode import Rnode
+from src.auto_diff.reverse_mode.compiled import trace
+from src.auto_diff.reverse_mode.codegen import codegen
+from src.auto_diff.reverse_mode.checkpoint import checkpoint_grad
+import src.auto_diff.reverse_mode.elem as elem_rn
+
+"""Benchmark suite for both automatic differentiation engines
+
+Usage:
+    python benchmarks/run.py                                  # run and print every case
+    python benchmarks/run.py --quick                          # smallest size of every case only
+    python benchmarks/run.py --output results.json            # record the results
+    python benchmarks/run.py --save-baseline                  # record benchmarks/baseline.json
+    python benchmarks/run.py --baseline --threshold 1.5
+        # compare with benchmarks/baseline.json (or --baseline PATH), exit with status 1 if a case is
+        # more than 1.5x slower
+
+Timings depend on the machine and on the python and numpy versions, so no baseline is kept in the
+repository: record one with --save-baseline on the machine and toolchain it will be compared on
+(e.g. before starting a change).
+"""
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+
+def rosenbrock(*x):
+    total = 0
+    for i in range(len(x) - 1):
+        total = total + 100 * (x[i + 1] - x[i] ** 2) ** 2 + (1 - x[i]) ** 2
+    return total
+
+
+def _rosenbrock_fnode(n):
+    x0 = np.linspace(-1, 1, n)
+
+    def run():
+        rosenbrock(*[Fnode(v, 1, i) for i, v in enumerate(x0)]).deriv
+    return run
+
+
+def _rosenbrock_chunked(n):
+    x0 = list(np.linspace(-1, 1, n))
+    return lambda: chunked.gradient(rosenbrock, x0)
+
+
+def _rosenbrock_rnode(n):
+    x0 = np.linspace(-1, 1, n)
+
+    def run():
+        x = [Rnode(v) for v in x0]
+        rosenbrock(*x).backward(retain_graph=False)
+    return run
+
+
+def _rosenbrock_compiled(n):
+    x0 = list(np.linspace(-1, 1, n))
+    compiled = trace(rosenbrock, *x0)
+    return lambda: compiled.gradient(*x0)
+
+
+def _rosenbrock_codegen(n):
+    x0 = list(np.linspace(-1, 1, n))
+    generated = codegen(rosenbrock, *x0)
+    return lambda: generated.gradient(*x0)
+
+
+def _elem_points(points):
+    x0 = np.linspace(0.1, 0.9, points)
+
+    def run():
+        x = Fnode(x0, 1, 'x')
+        (elem_fn.sin(elem_fn.exp(x)) * elem_fn.ln(x) + elem_fn.sqrt(x) / elem_fn.cosh(x)).deriv
+    return run
+
+
+def _vector_fn(width, points=1000):
+    rng = np.random.RandomState(0)
+    x = [Fnode(rng.rand(points), 1, i) for i in range(width)]
+    outputs = [x[i] * x[(i + 1) % width] + elem_fn.sin(x[(i + 3) % width]) for i in range(width)]
+    result = Vector_Fn(outputs)
+    return lambda: result.get_deriv()
+
+
+def _depth_rnode(depth):
+    def run():
+        x = Rnode(0.5)
+        y = x
+        for _ in range(depth):
+            y = elem_rn.sin(y) * 1.01 + 0.01
+        y.backward(retain_graph=False)
+    return run
+
+
+def _mlp_rnode(width, depth=3, batch=32):
+    rng = np.random.RandomState(0)
+    weights = [rng.randn(width, width) / np.sqrt(width) for _ in range(depth)]
+    inputs = rng.randn(width, batch)
+
+    def run():
+        params = [Rnode(w) for w in weights]
+        h = Rnode(inputs)
+        for w in params:
+            h = elem_rn.tanh(w @ h)
+        (h * h).mean().backward(retain_graph=False)
+    return run
+
+
+def _lotka_volterra_step(state, dt=0.01):
+    prey, predator, alpha = state
+    return [prey + dt * (alpha * prey - prey * predator),
+            predator + dt * (prey * predator - predator),
+            alpha]
+
+
+def _ode_rnode(steps):
+    def run():
+        state = [Rnode(1.5), Rnode(1.0), Rnode(1.1)]
+        leaves = list(state)
+        for _ in range(steps):
+            state = _lotka_volterra_step(state)
+        (state[0] * state[0] + state[1]).backward(retain_graph=False)
+        return [leaf.grad_value for leaf in leaves]
+    return run
+
+
+def _ode_checkpoint(steps):
+    loss = lambda state: state[0] * state[0] + state[1]
+    return lambda: checkpoint_grad(_lotka_volterra_step, [1.5, 1.0, 1.1], steps, loss)
+
+
+# name -> (setup function, sizes swept, name of the swept dimension)
+CASES = {
+    'rosenbrock_forward_fnode': (_rosenbrock_fnode, [2, 8, 32], 'n'),
+    'rosenbrock_forward_chunked': (_rosenbrock_chunked, [2, 8, 32], 'n'),
+    'rosenbrock_reverse_rnode': (_rosenbrock_rnode, [2, 32, 256], 'n'),
+    'rosenbrock_reverse_compiled': (_rosenbrock_compiled, [2, 32, 256], 'n'),
+    'rosenbrock_reverse_codegen': (_rosenbrock_codegen, [2, 32, 256], 'n'),
+    'elem_forward_points': (_elem_points, [10, 1000, 100000], 'points'),
+    'vector_fn_get_deriv': (_vector_fn, [5, 20, 50], 'outputs'),
+    'graph_depth_rnode': (_depth_rnode, [100, 1000, 10000], 'depth'),
+    'mlp_reverse_rnode': (_mlp_rnode, [16, 64, 256], 'width'),
+    'ode_rollout_rnode': (_ode_rnode, [100, 1000], 'steps'),
+    'ode_rollout_checkpoint': (_ode_checkpoint, [100, 1000], 'steps'),
+}
+
+
+def time_call(function, min_time=0.05, repeats=3):
+    """
+    Returns the best time per call in seconds over repeats rounds, each running function enough times to
+    last at least min_time
+    """
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or number >= 1 << 20:
+            break
+        number *= 2 if elapsed == 0 else max(2, int(min_time / elapsed) + 1)
+
+    best = elapsed / number
+    for _ in range(repeats - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best
+
+
+def run(cases=None, quick=False, min_time=0.05, repeats=3, verbose=True):
+    """
+    Runs the benchmark cases
+
+    Parameters:
+    cases: names of the cases to run, all of them by default
+    quick: only run the smallest size of every case
+    min_time, repeats: see time_call
+
+    Returns:
+    A dictionary mapping 'case[dimension=size]' to the best time per call in seconds
+    """
+    results = {}
+    for name in (cases or CASES):
+        setup, sizes, dimension = CASES[name]
+        for size in (sizes[:1] if quick else sizes):
+            key = '{}[{}={}]'.format(name, dimension, size)
+            results[key] = time_call(setup(size), min_time, repeats)
+            if verbose:
+                print('{:<50} {:>12.3e} s'.format(key, results[key]))
+    return results
+
+
+def compare(results, baseline, threshold=1.5):
+    """
+    Compares results with a baseline
+
+    Returns:
+    A list of (key, baseline seconds, current seconds, ratio) for the cases present in both, and the list
+    of keys whose ratio exceeds threshold
+    """
+    rows = []
+    regressions = []
+    for key in sorted(set(results) & set(baseline)):
+        ratio = results[key] / baseline[key]
+        rows.append((key, baseline[key], results[key], ratio))
+        if ratio > threshold:
+            regressions.append(key)
+    return rows, regressions
+
+
+def _metadata():
+    return {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'machine': platform.machine(),
+        'platform': platform.platform(),
+        'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the automatic differentiation engines")
+    parser.add_argument('--cases', nargs='*', choices=sorted(CASES), help="cases to run, all by default")
+    parser.add_argument('--quick', action='store_true', help="only run the smallest size of every case")
+    parser.add_argument('--min-time', type=float, default=0.05, help="minimum seconds per timing round")
+    parser.add_argument('--repeats', type=int, default=3, help="timing rounds per case, the best is kept")
+    parser.add_argument('--output', help="write the results to this JSON file")
+    parser.add_argument('--baseline', nargs='?', const=BASELINE,
+                        help="compare with the results stored in this JSON file, " + BASELINE + " by default")
+    parser.add_argument('--threshold', type=float, default=1.5,
+                        help="slowdown ratio above which a case counts as a regression")
+    parser.add_argument('--save-baseline', action='store_true', help="write the results to " + BASELINE)
+    args = parser.parse_args(argv)
+
+    results = run(args.cases, args.quick, args.min_time, args.repeats)
+    record = {'metadata': _metadata(), 'results': results}
+    for path in [args.output, BASELINE if args.save_baseline else None]:
+        if path:
+            with open(path, 'w') as f:
+                json.dump(record, f, indent=2, sort_keys=True)
+
+    if args.baseline:
+        if not os.path.exists(args.baseline):
+            print('\nNo baseline at {}, record one with --save-baseline'.format(args.baseline))
+            return 2
+        with open(args.baseline) as f:
+            baseline = json.load(f)['results']
+        rows, regressions = compare(results, baseline, args.threshold)
+        print()
+        print('{:<50} {:>12} {:>12} {:>8}'.format('case', 'baseline', 'current', 'ratio'))
+        for key, before, after, ratio in rows:
+            flag = '  REGRESSION' if key in regressions else ''
+            print('{:<50} {:>12.3e} {:>12.3e} {:>8.2f}{}'.format(key, before, after, ratio, flag))
+        if regressions:
+            print('\n{} case(s) slower than {}x the baseline'.format(len(regressions), args.threshold))
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,78 @@
+import numpy as np
+from src.auto_diff.forward_mode.dense_fnode import DenseFnode, VarRegistry
+
+"""Chunked multi-tangent (vector) forward mode"""
+
+
+def _seeded_inputs(x, start, stop):
+    """
+    Returns one DenseFnode per input whose derivative columns are the tangent directions of the inputs
+    start to stop-1, so a single pass propagates stop - start tangents at once
+    """
+    registry = VarRegistry()
+    for column in range(stop - start):
+        registry.index(column)
+
+    inputs = []
+    for i, val in enumerate(x):
+        val = np.asarray(val, dtype=float).reshape(-1)
+        tangents = np.zeros((len(val), stop - start))
+        if start <= i < stop:
+            tangents[:, i - start] = 1
+        inputs.append(DenseFnode(val, tangents, i, registry))
+    return inputs
+
+
+def jacobian(function, x, chunk_size=8):
+    """
+    Jacobian of a function of n inputs in ceil(n / chunk_size) forward passes
+
+    Parameters:
+    function: python function taking one node per input and returning a node or a list of nodes
+    x: list with the value of each input, either numbers or arrays holding several evaluation points
+    chunk_size: number of tangent directions carried by each pass, trading memory per node against
+                the number of passes
+
+    Returns:
+    A numpy array with one row per output and one column per input. A single output drops the row
+    axis, and inputs holding several points add a leading axis with one entry per point
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    num_vars = len(x)
+    num_points = max([np.size(val) for val in x] + [1])
+    single_output = False
+    result = None
+
+    for start in range(0, max(num_vars, 1), chunk_size):
+        stop = min(start + chunk_size, num_vars)
+        outputs = function(*_seeded_inputs(x, start, stop))
+        if not isinstance(outputs, (list, tuple)):
+            single_output = True
+            outputs = [outputs]
+        if result is None:
+            result = np.zeros((num_points, len(outputs), num_vars))
+        for r, output in enumerate(outputs):
+            if isinstance(output, DenseFnode):
+                result[:, r, start:stop] = output.jacobian
+
+    if all(np.ndim(val) == 0 for val in x):
+        result = result[0]
+    if single_output:
+        result = result[..., 0, :]
+    return result
+
+
+def gradient(function, x, chunk_size=8):
+    """
+    Gradient of a scalar function of n inputs in ceil(n / chunk_size) forward passes
+
+    Parameters:
+    function: python function taking one node per input and returning a node
+    x: list with the value of each input, either numbers or arrays holding several evaluation points
+    chunk_size: number of tangent directions carried by each pass
+
+    Returns:
+    A numpy array with the gradient, with a leading axis per point if the inputs hold several points
+    """
+    return jacobian(function, x, chunk_size)
@@ -0,0 +1,294 @@
+import numpy as np
+
+class VarRegistry:
+    def __init__(self):
+        """Constructor for the registry that interns variable names into column indices of DenseFnode derivatives"""
+        self._index = {}
+        self._names = []
+
+
+    def __len__(self):
+        return len(self._names)
+
+
+    def __contains__(self, var_name):
+        return var_name in self._index
+
+
+    @property
+    def names(self):
+        return list(self._names)
+
+
+    def index(self, var_name):
+        """
+        Returns the column of var_name, registering it if it is new
+        """
+        column = self._index.get(var_name)
+        if column is None:
+            column = self._index[var_name] = len(self._names)
+            self._names.append(var_name)
+        return column
+
+
+class DenseFnode:
+    def __init__(self, val, deriv=1, var_name="none", registry=None):
+        """Constructor for Node for Forward Automatic differentiaton with dense derivative storage.
+
+        All derivatives live in one (number of points x number of variables) array whose columns are
+        given by a VarRegistry, so every arithmetic rule is a single vectorized numpy expression. Nodes
+        with different registries can be combined: the variables of the other node are registered in the
+        registry of this one, which the result shares.
+
+        Parameters
+        ==========
+        val : list/int/float/numpy array
+            The value of the node
+        deriv : list/int/float/numpy array
+            The first derivative of the node with respect to var_name, or a 2-D array holding the
+            derivatives with respect to every registered variable
+        var_name : string
+            The name of the variable. The default "none" is not registered, so the node is a constant
+        registry : VarRegistry
+            The registry mapping variable names to columns, a new one by default
+        """
+        if isinstance(val, (int, float)):
+            self._val = np.array([val], dtype=float)
+        elif isinstance(val, (list, np.ndarray)):
+            self._val = np.asarray(val, dtype=float).reshape(-1)
+        else:
+            raise TypeError("val must be either a number, list, or numpy array")
+
+        self._registry = VarRegistry() if registry is None else registry
+        self._var_name = var_name
+
+        if isinstance(deriv, np.ndarray) and deriv.ndim == 2:
+            self._jac = deriv
+        elif var_name == "none" and isinstance(deriv, (int, float, list, np.ndarray)):
+            self._jac = np.zeros((len(self._val), 0))
+        elif isinstance(deriv, (int, float, list, np.ndarray)):
+            column = self._registry.index(var_name)
+            self._jac = np.zeros((len(self._val), len(self._registry)))
+            self._jac[:, column] = deriv
+        else:
+            raise TypeError("deriv must be either a number, list, or numpy array")
+
+
+    @property
+    def val(self):
+        return self._val
+
+
+    @property
+    def jacobian(self):
+        return self._jac
+
+
+    @property
+    def deriv(self):
+        names = self._registry.names
+        return {names[c]: self._jac[:, c] for c in range(self._jac.shape[1])}
+
+
+    @property
+    def var_name(self):
+        return self._var_name
+
+
+    @property
+    def registry(self):
+        return self._registry
+
+
+    def get_vars(self):
+        """
+        Returns the set of variables whose derivative is nonzero at some point
+        """
+        names = self._registry.names
+        return {names[c] for c in np.flatnonzero(np.any(self._jac != 0, axis=0))}
+
+
+    def _new(self, value, jac):
+        return DenseFnode(value, jac, self._var_name, self._registry)
+
+
+    def _in_registry(self, registry):
+        """
+        Returns this node with the columns of its derivatives given by registry, registering its variables
+        """
+        columns = [registry.index(name) for name in self._registry.names[:self._jac.shape[1]]]
+        jac = np.zeros((len(self._val), len(registry)))
+        jac[:, columns] = self._jac
+        return DenseFnode(self._val, jac, self._var_name, registry)
+
+
+    def _aligned(self, other):
+        """
+        Returns the derivative arrays of self and other with the same number of columns
+
+        Nodes created before later variables were registered have fewer columns; the missing
+        derivatives are zero. The derivatives of a node with another registry are first moved to the
+        columns of self's registry.
+        """
+        if other._registry is not self._registry:
+            other = other._in_registry(self._registry)
+        jac, other_jac = self._jac, other._jac
+        width = max(jac.shape[1], other_jac.shape[1])
+        if jac.shape[1] < width:
+            jac = np.pad(jac, ((0, 0), (0, width - jac.shape[1])))
+        if other_jac.shape[1] < width:
+            other_jac = np.pad(other_jac, ((0, 0), (0, width - other_jac.shape[1])))
+        return jac, other_jac
+
+
+    def _chain(self, value, local_deriv, second_deriv=None):
+        """
+        Applies the chain rule for an elementary function of this node
+
+        Parameters:
+        value: The value of the function at this node
+        local_deriv: The derivative of the function at this node
+        second_deriv: Function returning the second derivative of the function, unused by first order nodes
+
+        Returns:
+        A new DenseFnode object with the given value whose derivatives are those of self times local_deriv
+        """
+        return self._new(value, self._jac * np.reshape(local_deriv, (-1, 1)))
+
+
+    def __neg__(self):
+        """
+        Overloads negation
+
+        Returns:
+        A new DenseFnode object where the value and derivative are both negated
+        """
+        return self._new(-self._val, -self._jac)
+
+
+    def __add__(self, other):
+        """
+        Overloads addition
+
+        Parameters:
+        other: Value or DenseFnode to add
+
+        Returns:
+        A new DenseFnode object where the other is added to self for the value and derivative
+        """
+        if isinstance(other, DenseFnode):
+            jac, other_jac = self._aligned(other)
+            return self._new(self._val + other._val, jac + other_jac)
+        elif isinstance(other, (int, float)):
+            return self._new(self._val + other, self._jac)
+        else:
+            raise TypeError("Invalid input type: must add either DenseFnode, int, or float")
+
+
+    def __radd__(self, other):
+        return self.__add__(other)
+
+
+    def __sub__(self, other):
+        """
+        Overloads subtraction
+
+        Parameters:
+        other: Value or DenseFnode to subtract
+
+        Returns:
+        A new DenseFnode object where the other is subtracted from self for the value and derivative
+        """
+        if isinstance(other, DenseFnode):
+            jac, other_jac = self._aligned(other)
+            return self._new(self._val - other._val, jac - other_jac)
+        elif isinstance(other, (int, float)):
+            return self._new(self._val - other, self._jac)
+        else:
+            raise TypeError("Invalid input type: must subtract either DenseFnode, int, or float")
+
+
+    def __rsub__(self, other):
+        return -self + other
+
+
+    def __mul__(self, other):
+        """
+        Overloads multiplication
+
+        Parameters:
+        other: Value or DenseFnode to multiply against
+
+        Returns:
+        A new DenseFnode object where the self and other are multiplied according to the product rule
+        """
+        if isinstance(other, DenseFnode):
+            jac, other_jac = self._aligned(other)
+            return self._new(self._val * other._val, self._val[:, None] * other_jac + other._val[:, None] * jac)
+        elif isinstance(other, (int, float)):
+            return self._new(self._val * other, self._jac * other)
+        else:
+            raise TypeError("Invalid input type: must multiply either DenseFnode, int, or float")
+
+
+    def __rmul__(self, other):
+        return self.__mul__(other)
+
+
+    def __truediv__(self, other):
+        """
+        Overloads division
+
+        Parameters:
+        other: Value or DenseFnode to divide against
+
+        Returns:
+        A new DenseFnode object where the self and other are divided according to the quotient rule
+        """
+        if isinstance(other, DenseFnode):
+            jac, other_jac = self._aligned(other)
+            value = self._val / other._val
+            return self._new(value, (jac - value[:, None] * other_jac) / other._val[:, None])
+        elif isinstance(other, (int, float)):
+            return self._new(self._val / other, self._jac / other)
+        else:
+            raise TypeError("Invalid input type: must divide either DenseFnode, int, or float")
+
+
+    def __rtruediv__(self, other):
+        if isinstance(other, (int, float)):
+            value = other / self._val
+            return self._new(value, self._jac * (-value / self._val)[:, None])
+        else:
+            raise TypeError("Invalid input type: must divide either DenseFnode, int, or float")
+
+
+    def __pow__(self, other):
+        """
+        Overloads exponentiation (powers)
+
+        Parameters:
+        other: Value or DenseFnode that represents the power to raise the current DenseFnode by
+
+        Returns:
+        A new DenseFnode object where self is raised to other according to the power rule
+        """
+        if isinstance(other, DenseFnode):
+            jac, other_jac = self._aligned(other)
+            value = self._val ** other._val
+            current_value = self._val ** (other._val - 1)
+            total_jac = (other._val[:, None] * jac + (self._val * np.log(self._val))[:, None] * other_jac) \
+                * current_value[:, None]
+            return self._new(value, total_jac)
+        elif isinstance(other, (int, float)):
+            return self._new(self._val ** other, self._jac * (other * self._val ** (other - 1))[:, None])
+        else:
+            raise TypeError("Invalid input type: must raise to the power of an DenseFnode, int, or float")
+
+
+    def __rpow__(self, other):
+        if isinstance(other, (int, float)):
+            value = other ** self._val
+            return self._new(value, self._jac * (np.log(other) * value)[:, None])
+        else:
+            raise TypeError("Invalid input type: must raise to the power of an DenseFnode, int, or float")
@@ -1,7 +1,34 @@
-from src.auto_diff.forward_mode.fnode import Fnode
 import numpy as np
+from src.auto_diff.forward_mode.taylor import Taylor
+from src.auto_diff.reverse_mode.rnode import Rnode
+
+"""Elementary functions for forward mode, shared by Fnode, DenseFnode, HessianFnode and Taylor
+
+Each function hands its value, first derivative and a function returning its second derivative to the
+node's _chain, so the second derivative is only computed by second order nodes. Taylor nodes are
+dispatched to their own coefficient recurrences.
+"""
+
+def _chain(x, method, value, local_deriv, second_deriv, *args):
+    """
+    Applies an elementary function to a node
+
+    Parameters:
+    x: The node
+    method: The name of the Taylor method computing the function, called with args on Taylor nodes
+    value, local_deriv, second_deriv: see the _chain method of the forward mode nodes. Rnodes, so that
+                                      functions written with these elementary functions can also be
+                                      differentiated in reverse mode, only use value and local_deriv
+
+    Returns:
+    The node holding the function of x
+    """
+    if isinstance(x, Taylor):
+        return getattr(x, method)(*args)
+    if isinstance(x, Rnode):
+        return x._unary(value, local_deriv)
+    return x._chain(value, local_deriv, second_deriv)
 
-"""Elementary functions for forward mode"""
 
 def tan(x):
     """
@@ -17,11 +44,7 @@ def tan(x):
     if isinstance(x, (int, float)):
         return np.tan(x)
 
-    value = np.tan(x.val)
-    deriv_dict = {}
-    for var in x.get_vars():
-        deriv_dict[var] = x.deriv[var] / (np.cos(x.val) ** 2)
-    return Fnode(value, deriv_dict, x.var_name)
+    return _chain(x, 'tan', np.tan(x.val), 1 / (np.cos(x.val) ** 2), lambda: 2 * np.tan(x.val) / np.cos(x.val) ** 2)
     
 
 def arctan(x):
@@ -38,11 +61,7 @@ def arctan(x):
     if isinstance(x, (int, float)):
         return np.arctan(x)
 
-    value = np.arctan(x.val)
-    deriv_dict = {}
-    for var in x.get_vars():
-        deriv_dict[var] = x.deriv[var] * (1 / (1 + x._val**2))
-    return Fnode(value, deriv_dict, x.var_name)
+    return _chain(x, 'arctan', np.arctan(x.val), 1 / (1 + x.val**2), lambda: -2 * x.val / (1 + x.val ** 2) ** 2)
 
 
 def tanh(x):
@@ -59,11 +78,8 @@ def tanh(x):
     if isinstance(x, (int, float)):
         return np.tanh(x)
 
-    value = np.tanh(x.val)
-    deriv_dict = {}
-    for var in x.get_vars():
-        deriv_dict[var] = x.deriv[var] * (1 - np.tanh(x._val)**2)
-    return Fnode(value, deriv_dict, x.var_name)
+    return _chain(x, 'tanh', np.tanh(x.val), 1 - np.tanh(x.val)**2,
+                  lambda: -2 * np.tanh(x.val) * (1 - np.tanh(x.val) ** 2))
 
 def ln(x):
     """
@@ -79,14 +95,10 @@ def ln(x):
     if isinstance(x, (int, float)):
         return np.log(x)
 
-    if x.val <= 0:
+    if np.any(x.val <= 0):
         raise ValueError("The natural log is not defined for negative numbers")
 
-    value = np.log(x.val)
-    deriv_dict = {}
-    for var in x.get_vars():
-        deriv_dict[var] = x.deriv[var] * (1 / x.val)
-    return Fnode(value, deriv_dict, x.var_name)
+    return _chain(x, 'ln', np.log(x.val), 1 / x.val, lambda: -1 / x.val ** 2)
 
 
 def log(x, base):
@@ -104,14 +116,11 @@ def log(x, base):
     if isinstance(x, (int, float)):
         return np.log(x) / np.log(base)
 
-    if x.val <= 0:
+    if np.any(x.val <= 0):
         raise ValueError("Log is not defined for negative numbers or zero")
 
-    value = np.log(x.val) / np.log(base)
-    deriv_dict = {}
-    for var in x.get_vars():
-        deriv_dict[var] = x.deriv[var] * 1 / (x.val * np.log(base))
-    return Fnode(value, deriv_dict, x.var_name)
+    return _chain(x, 'log', np.log(x.val) / np.log(base), 1 / (x.val * np.log(base)),
+                  lambda: -1 / (x.val ** 2 * np.log(base)), base)
 
 
 def sqrt(x):
@@ -128,14 +137,10 @@ def sqrt(x):
     if isinstance(x, (int, float)):
         return np.sqrt(x)
 
-    if x.val < 0:
+    if np.any(x.val < 0):
         raise ValueError("Square root is not real for negative numbers")
 
-    value = np.sqrt(x.val)
-    deriv_dict = {}
-    for var in x.get_vars():
-        deriv_dict[var] = x.deriv[var] * (0.5 * x._val ** -0.5)
-    return Fnode(value, deriv_dict, x.var_name)
+    return _chain(x, 'sqrt', np.sqrt(x.val), 0.5 * x.val ** -0.5, lambda: -0.25 * x.val ** -1.5)
 
 
 def sin(x):
@@ -152,11 +157,7 @@ def sin(x):
     if isinstance(x, (int, float)):
         return np.sin(x)
 
-    value = np.sin(x.val)
-    deriv_dict = {}
-    for var in x.get_vars():
-        deriv_dict[var] = x.deriv[var] * np.cos(x.val)
-    return Fnode(value, deriv_dict, x.var_name)
+    return _chain(x, 'sin', np.sin(x.val), np.cos(x.val), lambda: -np.sin(x.val))
 
 
 def arcsin(x):
@@ -173,14 +174,10 @@ def arcsin(x):
     if isinstance(x, (int, float)):
         return np.arcsin(x)
 
-    if x.val < -1 or x.val > 1:
+    if np.any(x.val < -1) or np.any(x.val > 1):
         raise ValueError("The domain of arcsin is between -1 and 1 inclusive")
 
-    value = np.arcsin(x.val)
-    deriv_dict = {}
-    for var in x.get_vars():
-        deriv_dict[var] = x.deriv[var] * (1/((1 - x.val ** 2)) ** 0.5)
-    return Fnode(value, deriv_dict, x.var_name)
+    return _chain(x, 'arcsin', np.arcsin(x.val), 1/((1 - x.val ** 2)) ** 0.5, lambda: x.val / (1 - x.val ** 2) ** 1.5)
 
 
 def sinh(x):
@@ -197,11 +194,7 @@ def sinh(x):
     if isinstance(x, (int, float)):
         return np.sinh(x)
 
-    value = np.sinh(x.val)
-    deriv_dict = {}
-    for var in x.get_vars():
-        deriv_dict[var] = x.deriv[var] * np.cosh(x.val)
-    return Fnode(value, deriv_dict, x.var_name)
+    return _chain(x, 'sinh', np.sinh(x.val), np.cosh(x.val), lambda: np.sinh(x.val))
 
 
 def cos(x):
@@ -218,11 +211,7 @@ def cos(x):
     if isinstance(x, (int, float)):
         return np.cos(x)
 
-    value = np.cos(x.val)
-    deriv_dict = {}
-    for var in x.get_vars():
-        deriv_dict[var] = x.deriv[var] * -1 * np.sin(x.val)
-    return Fnode(value, deriv_dict, x.var_name)
+    return _chain(x, 'cos', np.cos(x.val), -1 * np.sin(x.val), lambda: -np.cos(x.val))
 
 
 def arccos(x):
@@ -239,14 +228,10 @@ def arccos(x):
     if isinstance(x, (int, float)):
         return np.arccos(x)
 
-    if x.val > 1 or x.val < -1:
+    if np.any(x.val > 1) or np.any(x.val < -1):
         raise ValueError("The domain of arccos is between -1 and 1 inclusive")
 
-    value = np.arccos(x.val)
-    deriv_dict = {}
-    for var in x.get_vars():
-        deriv_dict[var] = x.deriv[var] * (-1 / (1 - x._val ** 2) ** 0.5)
-    return Fnode(value, deriv_dict, x.var_name)
+    return _chain(x, 'arccos', np.arccos(x.val), -1 / (1 - x.val ** 2) ** 0.5, lambda: -x.val / (1 - x.val ** 2) ** 1.5)
     
 
 def cosh(x):
@@ -263,11 +248,7 @@ def cosh(x):
     if isinstance(x, (int, float)):
         return np.cosh(x)
 
-    value = np.cosh(x.val)
-    deriv_dict = {}
-    for var in x.get_vars():
-        deriv_dict[var] = x.deriv[var] * np.sinh(x.val)
-    return Fnode(value, deriv_dict, x.var_name)
+    return _chain(x, 'cosh', np.cosh(x.val), np.sinh(x.val), lambda: np.cosh(x.val))
 
 
 def exp(x):
@@ -285,10 +266,7 @@ def exp(x):
         return np.exp(x)
 
     value = np.exp(x.val)
-    deriv_dict = {}
-    for var in x.get_vars():
-        deriv_dict[var] = x.deriv[var] * np.exp(x.val)
-    return Fnode(value, deriv_dict, x.var_name)
+    return _chain(x, 'exp', value, value, lambda: value)
 
 
 def logistic_fn(x, x0, L, k):
@@ -308,8 +286,6 @@ def logistic_fn(x, x0, L, k):
     if isinstance(x, (int, float)):
         return L / (1 + np.exp(-k*(x -x0)))
 
-    value =  L / (1 + np.exp(-k*(x.val -x0)))
-    deriv_dict = {}
-    for var in x.get_vars():
-        deriv_dict[var] = x.deriv[var] * np.exp(x.val) / (1+np.exp(x.val))**2
-    return Fnode(value, deriv_dict, x.var_name)
+    s = 1 / (1 + np.exp(-k * (x.val - x0)))
+    return _chain(x, 'logistic', L * s, k * L * s * (1 - s), lambda: k ** 2 * L * s * (1 - s) * (1 - 2 * s),
+                  x0, L, k)
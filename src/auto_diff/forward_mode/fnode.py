@@ -54,6 +54,24 @@ class Fnode:
         return set(self._deriv.keys())
 
 
+    def _chain(self, value, local_deriv, second_deriv=None):
+        """
+        Applies the chain rule for an elementary function of this node
+
+        Parameters:
+        value: The value of the function at this node
+        local_deriv: The derivative of the function at this node
+        second_deriv: Function returning the second derivative of the function, unused by first order nodes
+
+        Returns:
+        A new Fnode object with the given value whose derivatives are those of self times local_deriv
+        """
+        total_deriv = {}
+        for var, deriv in self._deriv.items():
+            total_deriv[var] = deriv * local_deriv
+        return Fnode(value, total_deriv, self._var_name)
+
+
     def __neg__(self):
         """
         Overloads negation
@@ -222,7 +240,7 @@ class Fnode:
 
 
             for var in self.get_vars():
-                current_value = np.array([other ** (v - 1) for v in self._val])
+                current_value = np.array([other ** v for v in self._val])
                 total_deriv[var] = np.log(other) * current_value * self._deriv[var]
             return Fnode(total_value, total_deriv, self._var_name)
         else:
@@ -0,0 +1,249 @@
+import numpy as np
+from src.auto_diff.forward_mode.dense_fnode import DenseFnode, VarRegistry
+import src.auto_diff.forward_mode.elem as elem
+
+class HessianFnode(DenseFnode):
+    def __init__(self, val, deriv=1, var_name="none", registry=None, hess=None):
+        """Constructor for second order (hyper-dual) Node for Forward Automatic differentiaton.
+
+        Alongside the dense first derivatives of DenseFnode, every node carries its Hessian as one
+        (number of points x number of variables x number of variables) array, so a single forward pass
+        gives exact second derivatives with respect to all registered variables.
+
+        Parameters
+        ==========
+        val : list/int/float/numpy array
+            The value of the node
+        deriv : list/int/float/numpy array
+            The first derivative of the node with respect to var_name, or a 2-D array holding the
+            derivatives with respect to every registered variable
+        var_name : string
+            The name of the variable. The default "none" is not registered, so the node is a constant
+        registry : VarRegistry
+            The registry mapping variable names to columns, a new one by default
+        hess : numpy array
+            The 3-D array of second derivatives, zero by default
+        """
+        super().__init__(val, deriv, var_name, registry)
+        width = self._jac.shape[1]
+        self._hess = np.zeros((len(self._val), width, width)) if hess is None else hess
+
+
+    @property
+    def hessian(self):
+        return self._hess
+
+
+    def _new(self, value, jac, hess):
+        return HessianFnode(value, jac, self._var_name, self._registry, hess)
+
+
+    def _in_registry(self, registry):
+        columns = [registry.index(name) for name in self._registry.names[:self._jac.shape[1]]]
+        width = len(registry)
+        jac = np.zeros((len(self._val), width))
+        jac[:, columns] = self._jac
+        hess = np.zeros((len(self._val), width, width))
+        hess[np.ix_(np.arange(len(self._val)), columns, columns)] = self._hess
+        return HessianFnode(self._val, jac, self._var_name, registry, hess)
+
+
+    def _aligned(self, other):
+        """
+        Returns the derivative and Hessian arrays of self and other padded to the same number of variables
+        """
+        if other._registry is not self._registry:
+            other = other._in_registry(self._registry)
+        jac, other_jac = super()._aligned(other)
+        width = jac.shape[1]
+        return jac, self._padded_hess(width), other_jac, other._padded_hess(width)
+
+
+    def _padded_hess(self, width):
+        missing = width - self._hess.shape[1]
+        if missing == 0:
+            return self._hess
+        return np.pad(self._hess, ((0, 0), (0, missing), (0, missing)))
+
+
+    def _chain(self, value, local_deriv, second_deriv=None):
+        """
+        Applies the chain rule for an elementary function of this node
+
+        Parameters:
+        value: The value of the function at this node
+        local_deriv: The derivative of the function at this node
+        second_deriv: Function returning the second derivative of the function at this node
+
+        Returns:
+        A new HessianFnode object with the given value whose Hessian is
+        local_deriv * hessian + second_deriv * (gradient outer gradient)
+        """
+        local_deriv = np.reshape(local_deriv, (-1, 1))
+        hess = self._hess * local_deriv[:, :, None]
+        if second_deriv is not None:
+            hess = hess + np.reshape(second_deriv(), (-1, 1, 1)) * self._jac[:, :, None] * self._jac[:, None, :]
+        return self._new(value, self._jac * local_deriv, hess)
+
+
+    def __neg__(self):
+        """
+        Overloads negation
+
+        Returns:
+        A new HessianFnode object where the value, derivative and Hessian are all negated
+        """
+        return self._new(-self._val, -self._jac, -self._hess)
+
+
+    def __add__(self, other):
+        """
+        Overloads addition
+
+        Parameters:
+        other: Value or HessianFnode to add
+
+        Returns:
+        A new HessianFnode object where the other is added to self for the value, derivative and Hessian
+        """
+        if isinstance(other, HessianFnode):
+            jac, hess, other_jac, other_hess = self._aligned(other)
+            return self._new(self._val + other._val, jac + other_jac, hess + other_hess)
+        elif isinstance(other, (int, float)):
+            return self._new(self._val + other, self._jac, self._hess)
+        else:
+            raise TypeError("Invalid input type: must add either HessianFnode, int, or float")
+
+
+    def __radd__(self, other):
+        return self.__add__(other)
+
+
+    def __sub__(self, other):
+        """
+        Overloads subtraction
+
+        Parameters:
+        other: Value or HessianFnode to subtract
+
+        Returns:
+        A new HessianFnode object where the other is subtracted from self for the value, derivative and Hessian
+        """
+        if isinstance(other, HessianFnode):
+            jac, hess, other_jac, other_hess = self._aligned(other)
+            return self._new(self._val - other._val, jac - other_jac, hess - other_hess)
+        elif isinstance(other, (int, float)):
+            return self._new(self._val - other, self._jac, self._hess)
+        else:
+            raise TypeError("Invalid input type: must subtract either HessianFnode, int, or float")
+
+
+    def __rsub__(self, other):
+        return -self + other
+
+
+    def __mul__(self, other):
+        """
+        Overloads multiplication
+
+        Parameters:
+        other: Value or HessianFnode to multiply against
+
+        Returns:
+        A new HessianFnode object where the self and other are multiplied according to the product rule
+        """
+        if isinstance(other, HessianFnode):
+            jac, hess, other_jac, other_hess = self._aligned(other)
+            cross = jac[:, :, None] * other_jac[:, None, :]
+            total_hess = self._val[:, None, None] * other_hess + other._val[:, None, None] * hess \
+                + cross + cross.transpose(0, 2, 1)
+            return self._new(self._val * other._val, self._val[:, None] * other_jac + other._val[:, None] * jac,
+                             total_hess)
+        elif isinstance(other, (int, float)):
+            return self._new(self._val * other, self._jac * other, self._hess * other)
+        else:
+            raise TypeError("Invalid input type: must multiply either HessianFnode, int, or float")
+
+
+    def __rmul__(self, other):
+        return self.__mul__(other)
+
+
+    def __truediv__(self, other):
+        """
+        Overloads division
+
+        Parameters:
+        other: Value or HessianFnode to divide against
+
+        Returns:
+        A new HessianFnode object where the self and other are divided according to the quotient rule
+        """
+        if isinstance(other, (HessianFnode, int, float)):
+            return self * (other ** -1)
+        else:
+            raise TypeError("Invalid input type: must divide either HessianFnode, int, or float")
+
+
+    def __rtruediv__(self, other):
+        if isinstance(other, (int, float)):
+            return other * (self ** -1)
+        else:
+            raise TypeError("Invalid input type: must divide either HessianFnode, int, or float")
+
+
+    def __pow__(self, other):
+        """
+        Overloads exponentiation (powers)
+
+        Parameters:
+        other: Value or HessianFnode that represents the power to raise the current HessianFnode by
+
+        Returns:
+        A new HessianFnode object where self is raised to other according to the power rule
+        """
+        if isinstance(other, HessianFnode):
+            return elem.exp(other * elem.ln(self))
+        elif isinstance(other, (int, float)):
+            return self._chain(self._val ** other, other * self._val ** (other - 1),
+                               lambda: other * (other - 1) * self._val ** (other - 2))
+        else:
+            raise TypeError("Invalid input type: must raise to the power of an HessianFnode, int, or float")
+
+
+    def __rpow__(self, other):
+        if isinstance(other, (int, float)):
+            value = other ** self._val
+            return self._chain(value, np.log(other) * value, lambda: np.log(other) ** 2 * value)
+        else:
+            raise TypeError("Invalid input type: must raise to the power of an HessianFnode, int, or float")
+
+
+def hessian(function, x):
+    """
+    Value, gradient and exact Hessian of a scalar function in one second order forward pass
+
+    Parameters:
+    function: python function taking one node per input and returning a node
+    x: list with the value of each input, either numbers or arrays holding several evaluation points
+
+    Returns:
+    The value, the gradient and the Hessian as numpy arrays, with a leading axis per point if the
+    inputs hold several points
+    """
+    registry = VarRegistry()
+    inputs = [HessianFnode(val, 1, i, registry) for i, val in enumerate(x)]
+    output = function(*inputs)
+
+    num_points = max([np.size(val) for val in x] + [1])
+    value = np.broadcast_to(output.val if isinstance(output, HessianFnode) else output, (num_points,))
+    grad = np.zeros((num_points, len(x)))
+    hess = np.zeros((num_points, len(x), len(x)))
+    if isinstance(output, HessianFnode):
+        width = output.jacobian.shape[1]
+        grad[:, :width] = output.jacobian
+        hess[:, :width, :width] = output.hessian
+
+    if all(np.ndim(val) == 0 for val in x):
+        return value[0], grad[0], hess[0]
+    return np.array(value), grad, hess
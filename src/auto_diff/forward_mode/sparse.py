@@ -0,0 +1,146 @@
+import numpy as np
+from src.auto_diff.forward_mode.fnode import Fnode
+from src.auto_diff.forward_mode.dense_fnode import DenseFnode, VarRegistry
+
+"""Sparse Jacobians by sparsity detection and column coloring"""
+
+
+def sparsity_pattern(function, x):
+    """
+    Detects which inputs each output depends on from the derivative dictionaries of Fnodes
+
+    Parameters:
+    function: python function taking one node per input and returning a list of nodes
+    x: list with the value of each input
+
+    Returns:
+    The row and column index arrays of the structural nonzeros, sorted by row then column, and the
+    number of outputs
+    """
+    outputs = function(*[Fnode(float(val), 1, i) for i, val in enumerate(x)])
+    rows, cols = [], []
+    for r, output in enumerate(outputs):
+        if isinstance(output, Fnode):
+            for c in sorted(output.get_vars()):
+                rows.append(r)
+                cols.append(c)
+    return np.array(rows, dtype=int), np.array(cols, dtype=int), len(outputs)
+
+
+def color_columns(rows, cols, num_cols):
+    """
+    Greedy coloring of the columns so that no two columns of the same color have a nonzero in the same row
+
+    Columns are colored from the densest to the sparsest, each taking the smallest color not used by a
+    column it shares a row with.
+
+    Returns:
+    An array with the color of each column
+    """
+    rows_of_col = [[] for _ in range(num_cols)]
+    cols_of_row = {}
+    for r, c in zip(rows, cols):
+        rows_of_col[c].append(r)
+        cols_of_row.setdefault(r, []).append(c)
+
+    colors = np.full(num_cols, -1, dtype=int)
+    for c in sorted(range(num_cols), key=lambda c: -len(rows_of_col[c])):
+        used = {colors[other] for r in rows_of_col[c] for other in cols_of_row[r]}
+        color = 0
+        while color in used:
+            color += 1
+        colors[c] = color
+    return colors
+
+
+class SparseJacobian:
+    def __init__(self, function, x):
+        """Constructor for a sparse Jacobian whose sparsity pattern and column coloring are computed once
+
+        Structurally orthogonal columns share a color and are computed together, so every evaluation is a
+        single forward pass carrying one tangent direction per color instead of one per input.
+
+        Parameters
+        ==========
+        function : python function
+            function taking one node per input and returning a list of nodes
+        x : list
+            values of the inputs used to detect the sparsity pattern
+        """
+        self._function = function
+        self._num_inputs = len(x)
+        self._rows, self._cols, self._num_outputs = sparsity_pattern(function, x)
+        self._colors = color_columns(self._rows, self._cols, self._num_inputs)
+        self._num_colors = int(self._colors.max()) + 1 if self._num_inputs else 0
+
+
+    @property
+    def shape(self):
+        return self._num_outputs, self._num_inputs
+
+
+    @property
+    def pattern(self):
+        return self._rows, self._cols
+
+
+    @property
+    def colors(self):
+        return self._colors
+
+
+    @property
+    def num_colors(self):
+        return self._num_colors
+
+
+    def compressed(self, x):
+        """
+        Returns the (number of outputs x number of colors) Jacobian times the coloring seed matrix
+        """
+        registry = VarRegistry()
+        for color in range(self._num_colors):
+            registry.index(color)
+
+        inputs = []
+        for i, val in enumerate(x):
+            seed = np.zeros((1, self._num_colors))
+            seed[0, self._colors[i]] = 1
+            inputs.append(DenseFnode(float(val), seed, i, registry))
+
+        outputs = self._function(*inputs)
+        result = np.zeros((self._num_outputs, self._num_colors))
+        for r, output in enumerate(outputs):
+            if isinstance(output, DenseFnode):
+                result[r, :output.jacobian.shape[1]] = output.jacobian[0]
+        return result
+
+
+    def coo(self, x):
+        """
+        Returns the nonzero values, row indices and column indices of the Jacobian at x
+        """
+        data = self.compressed(x)[self._rows, self._colors[self._cols]]
+        return data, self._rows, self._cols
+
+
+    def todense(self, x):
+        """
+        Returns the Jacobian at x as a dense numpy array
+        """
+        data, rows, cols = self.coo(x)
+        result = np.zeros(self.shape)
+        result[rows, cols] = data
+        return result
+
+
+    def to_scipy(self, x):
+        """
+        Returns the Jacobian at x as a scipy.sparse.coo_matrix, scipy is only needed for this method
+        """
+        try:
+            from scipy.sparse import coo_matrix
+        except ImportError:
+            raise ImportError("to_scipy requires scipy, use coo for the raw COO arrays")
+        data, rows, cols = self.coo(x)
+        return coo_matrix((data, (rows, cols)), shape=self.shape)
@@ -0,0 +1,304 @@
+import numpy as np
+
+"""Univariate Taylor mode: truncated Taylor coefficient arithmetic with O(order^2) recurrences"""
+
+
+def _mul(a, b):
+    """Coefficients of the product of two truncated series, c_k = sum_j a_j b_(k-j)"""
+    c = np.zeros(a.shape)
+    for k in range(a.shape[-1]):
+        c[:, k] = np.sum(a[:, :k + 1] * b[:, k::-1], axis=-1)
+    return c
+
+
+def _div(a, b):
+    """Coefficients of a / b, c_k = (a_k - sum_(j<k) c_j b_(k-j)) / b_0"""
+    c = np.zeros(a.shape)
+    for k in range(a.shape[-1]):
+        c[:, k] = (a[:, k] - np.sum(c[:, :k] * b[:, k:0:-1], axis=-1)) / b[:, 0]
+    return c
+
+
+def _exp(a):
+    """Coefficients of exp(a), y_k = (1/k) sum_(j=1..k) j a_j y_(k-j)"""
+    y = np.zeros(a.shape)
+    y[:, 0] = np.exp(a[:, 0])
+    j = np.arange(a.shape[-1])
+    for k in range(1, a.shape[-1]):
+        y[:, k] = np.sum(j[1:k + 1] * a[:, 1:k + 1] * y[:, k - 1::-1], axis=-1) / k
+    return y
+
+
+def _ln(a):
+    """Coefficients of ln(a), y_k = (a_k - (1/k) sum_(j=1..k-1) j y_j a_(k-j)) / a_0"""
+    y = np.zeros(a.shape)
+    y[:, 0] = np.log(a[:, 0])
+    j = np.arange(a.shape[-1])
+    for k in range(1, a.shape[-1]):
+        y[:, k] = (a[:, k] - np.sum(j[1:k] * y[:, 1:k] * a[:, k - 1:0:-1], axis=-1) / k) / a[:, 0]
+    return y
+
+
+def _pow(a, r):
+    """Coefficients of a ** r for a constant r, y_k = (1/(k a_0)) sum_(j=1..k) ((r + 1) j - k) a_j y_(k-j)"""
+    y = np.zeros(a.shape)
+    y[:, 0] = a[:, 0] ** r
+    j = np.arange(a.shape[-1])
+    for k in range(1, a.shape[-1]):
+        y[:, k] = np.sum(((r + 1) * j[1:k + 1] - k) * a[:, 1:k + 1] * y[:, k - 1::-1], axis=-1) / (k * a[:, 0])
+    return y
+
+
+def _sin_cos(a, sign=-1):
+    """
+    Coefficients of sin(a) and cos(a), computed together since each recurrence needs the other:
+    s_k = (1/k) sum_(j=1..k) j a_j c_(k-j) and c_k = -(1/k) sum_(j=1..k) j a_j s_(k-j)
+    With sign=1 the pair is sinh(a) and cosh(a)
+    """
+    s, c = np.zeros(a.shape), np.zeros(a.shape)
+    if sign < 0:
+        s[:, 0], c[:, 0] = np.sin(a[:, 0]), np.cos(a[:, 0])
+    else:
+        s[:, 0], c[:, 0] = np.sinh(a[:, 0]), np.cosh(a[:, 0])
+    j = np.arange(a.shape[-1])
+    for k in range(1, a.shape[-1]):
+        ja = j[1:k + 1] * a[:, 1:k + 1]
+        s[:, k] = np.sum(ja * c[:, k - 1::-1], axis=-1) / k
+        c[:, k] = sign * np.sum(ja * s[:, k - 1::-1], axis=-1) / k
+    return s, c
+
+
+def _int_pow(a, n):
+    """Coefficients of a ** n for a non-negative integer n by repeated squaring, also valid where a_0 = 0"""
+    y = np.zeros(a.shape)
+    y[:, 0] = 1
+    while n:
+        if n % 2:
+            y = _mul(y, a)
+        n //= 2
+        if n:
+            a = _mul(a, a)
+    return y
+
+
+def _one_plus(a):
+    """Coefficients of 1 + a"""
+    y = a.copy()
+    y[:, 0] += 1
+    return y
+
+
+def _differentiate(a):
+    """Coefficients of da/dt, one order lower and padded with a trailing zero"""
+    da = np.zeros(a.shape)
+    da[:, :-1] = a[:, 1:] * np.arange(1, a.shape[-1])
+    return da
+
+
+def _integrate(value, da):
+    """Coefficients of the series with the given constant term whose derivative has coefficients da"""
+    a = np.zeros(da.shape)
+    a[:, 0] = value
+    a[:, 1:] = da[:, :-1] / np.arange(1, da.shape[-1])
+    return a
+
+
+class Taylor:
+    def __init__(self, val, deriv=1, order=1):
+        """Constructor for Node for univariate Taylor mode Automatic differentiaton.
+
+        The node stores the truncated Taylor coefficients x_k = x^(k) / k! of a variable moving along one
+        direction, so the derivatives up to the given order of any composite function follow from one pass
+        in which every operation costs O(order^2).
+
+        Parameters
+        ==========
+        val : list/int/float/numpy array
+            The value of the node, one entry per evaluation point
+        deriv : list/int/float/numpy array
+            The first derivative of the node along the direction
+        order : int
+            The highest derivative order that is propagated
+        """
+        if isinstance(val, (int, float, list, np.ndarray)):
+            val = np.asarray(val, dtype=float).reshape(-1)
+        else:
+            raise TypeError("val must be either a number, list, or numpy array")
+        if order < 0:
+            raise ValueError("order must be non-negative")
+
+        self._coeffs = np.zeros((len(val), order + 1))
+        self._coeffs[:, 0] = val
+        if order > 0:
+            self._coeffs[:, 1] = deriv
+
+
+    @classmethod
+    def from_coeffs(cls, coeffs):
+        """
+        Returns a Taylor node with the given (number of points x order + 1) array of Taylor coefficients
+        """
+        node = cls.__new__(cls)
+        node._coeffs = np.atleast_2d(np.asarray(coeffs, dtype=float))
+        return node
+
+
+    @property
+    def val(self):
+        return self._coeffs[:, 0]
+
+
+    @property
+    def coeffs(self):
+        return self._coeffs
+
+
+    @property
+    def order(self):
+        return self._coeffs.shape[-1] - 1
+
+
+    @property
+    def derivs(self):
+        """
+        The derivatives of orders 0 to order, one row per point
+        """
+        factorials = np.cumprod(np.concatenate(([1.0], np.arange(1, self._coeffs.shape[-1]))))
+        return self._coeffs * factorials
+
+
+    def _operand(self, other):
+        """
+        Returns the coefficients of other, where constants only have a constant term
+        """
+        if isinstance(other, Taylor):
+            if other._coeffs.shape[-1] != self._coeffs.shape[-1]:
+                raise ValueError("Taylor nodes must have the same order")
+            return other._coeffs
+        elif isinstance(other, (int, float)):
+            coeffs = np.zeros(self._coeffs.shape)
+            coeffs[:, 0] = other
+            return coeffs
+        else:
+            raise TypeError("Invalid input type: must be either Taylor, int, or float")
+
+
+    def __neg__(self):
+        return Taylor.from_coeffs(-self._coeffs)
+
+
+    def __add__(self, other):
+        return Taylor.from_coeffs(self._coeffs + self._operand(other))
+
+
+    def __radd__(self, other):
+        return self.__add__(other)
+
+
+    def __sub__(self, other):
+        return Taylor.from_coeffs(self._coeffs - self._operand(other))
+
+
+    def __rsub__(self, other):
+        return Taylor.from_coeffs(self._operand(other) - self._coeffs)
+
+
+    def __mul__(self, other):
+        if isinstance(other, (int, float)):
+            return Taylor.from_coeffs(self._coeffs * other)
+        return Taylor.from_coeffs(_mul(self._coeffs, self._operand(other)))
+
+
+    def __rmul__(self, other):
+        return self.__mul__(other)
+
+
+    def __truediv__(self, other):
+        if isinstance(other, (int, float)):
+            return Taylor.from_coeffs(self._coeffs / other)
+        return Taylor.from_coeffs(_div(self._coeffs, self._operand(other)))
+
+
+    def __rtruediv__(self, other):
+        return Taylor.from_coeffs(_div(self._operand(other), self._coeffs))
+
+
+    def __pow__(self, other):
+        if isinstance(other, Taylor):
+            return (other * self.ln()).exp()
+        elif isinstance(other, (int, float)):
+            if other >= 0 and float(other).is_integer():
+                return Taylor.from_coeffs(_int_pow(self._coeffs, int(other)))
+            return Taylor.from_coeffs(_pow(self._coeffs, other))
+        else:
+            raise TypeError("Invalid input type: must raise to the power of a Taylor, int, or float")
+
+
+    def __rpow__(self, other):
+        if isinstance(other, (int, float)):
+            return (self * np.log(other)).exp()
+        else:
+            raise TypeError("Invalid input type: must raise to the power of a Taylor, int, or float")
+
+
+    def exp(self):
+        return Taylor.from_coeffs(_exp(self._coeffs))
+
+
+    def ln(self):
+        return Taylor.from_coeffs(_ln(self._coeffs))
+
+
+    def log(self, base):
+        return Taylor.from_coeffs(_ln(self._coeffs) / np.log(base))
+
+
+    def sqrt(self):
+        return Taylor.from_coeffs(_pow(self._coeffs, 0.5))
+
+
+    def sin(self):
+        return Taylor.from_coeffs(_sin_cos(self._coeffs)[0])
+
+
+    def cos(self):
+        return Taylor.from_coeffs(_sin_cos(self._coeffs)[1])
+
+
+    def tan(self):
+        s, c = _sin_cos(self._coeffs)
+        return Taylor.from_coeffs(_div(s, c))
+
+
+    def sinh(self):
+        return Taylor.from_coeffs(_sin_cos(self._coeffs, 1)[0])
+
+
+    def cosh(self):
+        return Taylor.from_coeffs(_sin_cos(self._coeffs, 1)[1])
+
+
+    def tanh(self):
+        s, c = _sin_cos(self._coeffs, 1)
+        return Taylor.from_coeffs(_div(s, c))
+
+
+    def arctan(self):
+        a = self._coeffs
+        return Taylor.from_coeffs(_integrate(np.arctan(a[:, 0]), _div(_differentiate(a), _one_plus(_mul(a, a)))))
+
+
+    def arcsin(self):
+        a = self._coeffs
+        root = _pow(_one_plus(-_mul(a, a)), -0.5)
+        return Taylor.from_coeffs(_integrate(np.arcsin(a[:, 0]), _mul(_differentiate(a), root)))
+
+
+    def arccos(self):
+        a = self._coeffs
+        root = _pow(_one_plus(-_mul(a, a)), -0.5)
+        return Taylor.from_coeffs(_integrate(np.arccos(a[:, 0]), -_mul(_differentiate(a), root)))
+
+
+    def logistic(self, x0, L, k):
+        return L / (1 + (-k * (self - x0)).exp())
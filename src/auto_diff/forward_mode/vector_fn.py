@@ -29,30 +29,28 @@ class Vector_Fn:
         '''
         return np.array(self.val_by_var()).T
 
-    def get_deriv(self):
+    def get_deriv(self, out=None):
         '''
-        Returns the jacobian matrix
-        '''
-        var_names = set()
-        for func in self._function_list:
-            var_names = var_names.union(func.get_vars())
-        var_names = list(var_names)
-        var_names.sort()
+        Returns the sorted variable names and the jacobian as a 3-D np array indexed by
+        (point, function, variable)
 
-        jacobian_matrix = []
-        func_length = len(self._function_list[0].val)
-        num_func = len(self._function_list)
-        num_vars = len(var_names)
+        out: optional np array of that shape that the jacobian is written into and returned
+        '''
+        var_names = sorted(set().union(*[func.get_vars() for func in self._function_list]))
+        column = {var: c for c, var in enumerate(var_names)}
+        shape = (len(self._function_list[0].val), len(self._function_list), len(var_names))
 
-        for _ in range(func_length):
-            jacobian_matrix.append(np.zeros((num_func, num_vars)))
+        if out is None:
+            out = np.zeros(shape)
+        elif out.shape != shape:
+            raise ValueError("out must have shape {}".format(shape))
+        else:
+            out[...] = 0
 
-        for i in range(func_length):
-            for r in range(num_func):
-                func = self._function_list[r]
-                for c in range(num_vars):
-                    var = var_names[c]
-                    if var in func.get_vars():
-                        jacobian_matrix[i][r, c] = func.deriv[var][i]
+        for r, func in enumerate(self._function_list):
+            deriv = func.deriv
+            if deriv:
+                columns = [column[var] for var in deriv]
+                out[:, r, columns] = np.column_stack([np.broadcast_to(d, shape[:1]) for d in deriv.values()])
 
-        return var_names, jacobian_matrix
\ No newline at end of file
+        return var_names, out
@@ -0,0 +1,137 @@
+import numpy as np
+from src.auto_diff.forward_mode import chunked
+from src.auto_diff.forward_mode.dense_fnode import DenseFnode, VarRegistry
+from src.auto_diff.reverse_mode.rnode import Rnode
+from src.auto_diff.reverse_mode.vector_rn import Vector_Rn
+
+"""Jacobians, gradients and matrix-free Jacobian products"""
+
+
+def select_mode(num_inputs, num_outputs):
+    """
+    Returns the cheaper mode for a Jacobian with the given dimensions
+
+    Forward mode needs one tangent direction per input and reverse mode one adjoint per output, so
+    forward mode is chosen when there are no more inputs than outputs and reverse mode otherwise.
+    """
+    return 'forward' if num_inputs <= num_outputs else 'reverse'
+
+
+def jacobian(function, x, mode='auto', chunk_size=8):
+    """
+    Jacobian of a function at x in forward or reverse mode
+
+    Parameters:
+    function: python function taking one node per input and returning a node or a list of nodes, written
+              with the operators and the forward_mode.elem functions (which also accept Rnodes)
+    x: list or 1-D numpy array with the value of each input
+    mode: 'forward', 'reverse' or 'auto', which evaluates the function once on plain numbers to count its
+          outputs and applies select_mode
+    chunk_size: number of tangent directions per forward pass
+
+    Returns:
+    A numpy array with one row per output and one column per input, or the gradient if the function
+    returns a single node
+    """
+    x = [float(val) for val in x]
+    if mode == 'auto':
+        outputs = function(*x)
+        num_outputs = len(outputs) if isinstance(outputs, (list, tuple)) else 1
+        mode = select_mode(len(x), num_outputs)
+
+    if mode == 'forward':
+        return chunked.jacobian(function, x, chunk_size)
+    elif mode == 'reverse':
+        inputs = [Rnode(val) for val in x]
+        outputs = function(*inputs)
+        single_output = not isinstance(outputs, (list, tuple))
+        if single_output:
+            outputs = [outputs]
+        outputs = [output if isinstance(output, Rnode) else Rnode(output) for output in outputs]
+        result = Vector_Rn(outputs).get_deriv(inputs)
+        return result[0] if single_output else result
+    else:
+        raise ValueError("mode must be either 'auto', 'forward' or 'reverse'")
+
+
+def gradient(function, x, mode='auto', chunk_size=8):
+    """
+    Gradient of a scalar function at x in forward or reverse mode
+
+    Parameters:
+    function: python function taking one node per input and returning a node
+    x: list or 1-D numpy array with the value of each input
+    mode: 'forward', 'reverse' or 'auto' (reverse mode unless there is at most one input)
+    chunk_size: number of tangent directions per forward pass
+
+    Returns:
+    A numpy array with the gradient
+    """
+    return np.asarray(jacobian(function, x, mode, chunk_size)).reshape(len(x))
+
+
+def jvp(function, x, v):
+    """
+    Jacobian-vector products J v from one forward pass, without forming J
+
+    Parameters:
+    function: python function taking one node per input and returning a node or a list of nodes
+    x: list or 1-D numpy array with the value of each input
+    v: array with one entry per input, or a 2-D array with one direction per row, all carried by the
+       same forward pass
+
+    Returns:
+    A numpy array with one entry per output (a number for a single output), with a leading axis per
+    direction if v is 2-D
+    """
+    directions = np.asarray(v, dtype=float)
+    batch = directions.ndim == 2
+    directions = directions.reshape(-1, len(x))
+
+    registry = VarRegistry()
+    for k in range(len(directions)):
+        registry.index(k)
+    inputs = [DenseFnode(float(val), directions[:, i].reshape(1, -1), i, registry) for i, val in enumerate(x)]
+    outputs = function(*inputs)
+    single_output = not isinstance(outputs, (list, tuple))
+    if single_output:
+        outputs = [outputs]
+
+    result = np.zeros((len(directions), len(outputs)))
+    for r, output in enumerate(outputs):
+        if isinstance(output, DenseFnode):
+            result[:output.jacobian.shape[1], r] = output.jacobian[0]
+    if single_output:
+        result = result[:, 0]
+    return result if batch else result[0]
+
+
+def vjp(function, x, u):
+    """
+    Vector-Jacobian products u^T J from one reverse sweep, without forming J
+
+    Parameters:
+    function: python function taking one node per input and returning a node or a list of nodes, written
+              with the operators and the forward_mode.elem functions
+    x: list or 1-D numpy array with the value of each input
+    u: array with one entry per output (a number for a single output), or a 2-D array with one vector per
+       row, all carried by the same sweep
+
+    Returns:
+    A numpy array with one entry per input, with a leading axis per vector if u is 2-D
+    """
+    inputs = [Rnode(float(val)) for val in x]
+    outputs = function(*inputs)
+    if not isinstance(outputs, (list, tuple)):
+        outputs = [outputs]
+    outputs = [output if isinstance(output, Rnode) else Rnode(output) for output in outputs]
+
+    seeds = np.asarray(u, dtype=float)
+    batch = seeds.ndim == 2
+    seeds = seeds.reshape(-1, len(outputs))
+    adjoint = Vector_Rn(outputs).adjoints(seeds)
+    result = np.zeros((len(seeds), len(inputs)))
+    for i, var in enumerate(inputs):
+        if var in adjoint:
+            result[:, i] = adjoint[var]
+    return result if batch else result[0]
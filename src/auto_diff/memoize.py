@@ -0,0 +1,127 @@
+from collections import OrderedDict
+import numpy as np
+
+"""LRU memoization of value and derivative evaluations keyed by the input arrays"""
+
+
+def _key(args):
+    """Hashable key holding the exact shape and bytes of every argument as a float array"""
+    key = []
+    for arg in args:
+        arg = np.ascontiguousarray(arg, dtype=float)
+        key.append((arg.shape, arg.tobytes()))
+    return tuple(key)
+
+
+def _read_only(result):
+    """Read-only copies of the arrays of a result, so that neither the function (e.g. by reusing an output
+    buffer) nor the callers can change the cache"""
+    def frozen(item):
+        if isinstance(item, np.ndarray):
+            item = item.copy()
+            item.flags.writeable = False
+        return item
+
+    if isinstance(result, tuple):
+        return tuple(frozen(item) for item in result)
+    return frozen(result)
+
+
+class Memoized:
+    def __init__(self, function, maxsize=128):
+        """Constructor for a wrapper that caches the results of a derivative computation
+
+        Solvers often evaluate the value and the derivative at the same point in separate calls and
+        return to points they have already visited. The wrapped function computes both at once, and
+        its result is cached under the exact values of the inputs, evicting the least recently used
+        entry once maxsize points are stored.
+
+        Parameters
+        ==========
+        function : python function
+            function of one or more int/float/numpy array arguments returning a tuple (value, derivative),
+            for example CompiledTape.gradient, GeneratedFunction.gradient or HessianFnode's hessian
+        maxsize : int
+            The maximum number of cached points
+        """
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self._function = function
+        self._maxsize = maxsize
+        self._cache = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+
+    @property
+    def hits(self):
+        return self._hits
+
+
+    @property
+    def misses(self):
+        return self._misses
+
+
+    @property
+    def maxsize(self):
+        return self._maxsize
+
+
+    def __len__(self):
+        return len(self._cache)
+
+
+    def __call__(self, *args):
+        """
+        Returns the cached result of the function at args, computing it on a miss
+        """
+        key = _key(args)
+        result = self._cache.get(key)
+        if result is not None:
+            self._cache.move_to_end(key)
+            self._hits += 1
+            return result
+
+        self._misses += 1
+        result = _read_only(self._function(*args))
+        self._cache[key] = result
+        if len(self._cache) > self._maxsize:
+            self._cache.popitem(last=False)
+        return result
+
+
+    def value(self, *args):
+        """
+        Returns the value of the function at args
+        """
+        return self(*args)[0]
+
+
+    def derivative(self, *args):
+        """
+        Returns the derivative (gradient, Jacobian) of the function at args
+        """
+        return self(*args)[1]
+
+
+    def gradient(self, *args):
+        return self.derivative(*args)
+
+
+    def cache_clear(self):
+        """
+        Empties the cache and resets the hit and miss counters
+        """
+        self._cache.clear()
+        self._hits = 0
+        self._misses = 0
+
+
+def memoize(maxsize=128):
+    """
+    Decorator wrapping a function returning (value, derivative) in a Memoized cache of the given size
+    """
+    def decorator(function):
+        return Memoized(function, maxsize)
+    return decorator
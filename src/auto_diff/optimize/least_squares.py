@@ -0,0 +1,131 @@
+from collections import namedtuple
+import numpy as np
+from src.auto_diff.forward_mode.dense_fnode import DenseFnode, VarRegistry
+
+"""Gauss-Newton and Levenberg-Marquardt nonlinear least squares"""
+
+LeastSquaresResult = namedtuple('LeastSquaresResult', ['x', 'cost', 'grad', 'converged', 'iterations',
+                                                       'jacobian_evals'])
+
+
+def _chunks(data, chunk_size):
+    """Yield the data arrays restricted to consecutive blocks of chunk_size points"""
+    num_points = len(data[0]) if data else 1
+    for start in range(0, num_points, chunk_size):
+        block = [np.asarray(d, dtype=float)[start:start + chunk_size] for d in data]
+        yield block, min(chunk_size, num_points - start)
+
+
+def normal_equations(residual, params, data=(), chunk_size=4096, jacobian=True):
+    """
+    Accumulate J^T J, J^T r and the cost 0.5 r^T r of a residual vector block by block
+
+    Every block of points is one forward pass whose nodes carry one tangent per parameter, so only a
+    (chunk_size x number of parameters) block of the Jacobian exists at any time.
+
+    Parameters:
+    residual: python function taking one node per parameter followed by one node per data array and
+              returning a node whose values are the residuals of the points
+    params: list or numpy array with the value of each parameter
+    data: list of arrays with one entry per point (e.g. the abscissas and the measurements)
+    chunk_size: number of points per forward pass
+    jacobian: if False, only the cost is computed and the parameters carry no tangents
+
+    Returns:
+    The cost, and if jacobian is True the numpy arrays J^T J and J^T r
+    """
+    num_params = len(params)
+    jtj = np.zeros((num_params, num_params))
+    jtr = np.zeros(num_params)
+    cost = 0.0
+
+    for block, length in _chunks(list(data), chunk_size):
+        registry = VarRegistry()
+        width = num_params if jacobian else 0
+        for i in range(width):
+            registry.index(i)
+        inputs = []
+        for i, value in enumerate(params):
+            tangents = np.zeros((length, width))
+            if jacobian:
+                tangents[:, i] = 1
+            inputs.append(DenseFnode(np.full(length, float(value)), tangents, i, registry))
+        inputs += [DenseFnode(d, np.zeros((length, 0)), registry=registry) for d in block]
+
+        output = residual(*inputs)
+        r = np.broadcast_to(output.val, (length,))
+        cost += 0.5 * (r @ r)
+        if jacobian:
+            jac = np.zeros((length, num_params))
+            jac[:, :output.jacobian.shape[1]] = output.jacobian
+            jtj += jac.T @ jac
+            jtr += jac.T @ r
+
+    if jacobian:
+        return cost, jtj, jtr
+    return cost
+
+
+def levenberg_marquardt(residual, p0, data=(), method='lm', chunk_size=4096, damping=1e-3, gtol=1e-8,
+                        ftol=1e-12, max_iter=100):
+    """
+    Minimize 0.5 * sum(residual^2) over the parameters
+
+    Parameters:
+    residual: python function taking one node per parameter followed by one node per data array and
+              returning a node whose values are the residuals of the points, built from the operators and
+              the forward mode elementary functions
+    p0: list or numpy array with the initial parameters
+    data: list of arrays with one entry per point
+    method: 'lm' solves (J^T J + damping * diag(J^T J)) dp = -J^T r, increasing the damping after a step
+            that does not reduce the cost and decreasing it otherwise. 'gauss-newton' solves
+            J^T J dp = -J^T r and always takes the step
+    chunk_size: number of points per forward pass, see normal_equations
+    damping: initial damping of 'lm'
+    gtol: the iteration stops once the largest component of J^T r is below gtol
+    ftol: the iteration stops once an accepted step reduces the cost by less than ftol times the cost
+    max_iter: maximum number of iterations
+
+    Returns:
+    A LeastSquaresResult with the parameters x, the cost and its gradient J^T r there, whether the
+    iteration converged and the numbers of iterations and Jacobian evaluations
+    """
+    if method not in ('lm', 'gauss-newton'):
+        raise ValueError("method must be either 'lm' or 'gauss-newton'")
+    params = np.array(p0, dtype=float).reshape(-1)
+    cost, jtj, jtr = normal_equations(residual, params, data, chunk_size)
+    jacobian_evals = 1
+
+    for iteration in range(max_iter):
+        if np.max(np.abs(jtr)) < gtol:
+            return LeastSquaresResult(params, cost, jtr, True, iteration, jacobian_evals)
+
+        if method == 'gauss-newton':
+            params = params + np.linalg.lstsq(jtj, -jtr, rcond=None)[0]
+            new_cost, jtj, jtr = normal_equations(residual, params, data, chunk_size)
+            jacobian_evals += 1
+            converged = 0 <= cost - new_cost < ftol * cost
+            cost = new_cost
+            if converged:
+                return LeastSquaresResult(params, cost, jtr, True, iteration + 1, jacobian_evals)
+            continue
+
+        scale = np.diag(jtj).copy()
+        scale[scale <= 0] = 1.0
+        step = np.linalg.solve(jtj + damping * np.diag(scale), -jtr)
+        new_params = params + step
+        new_cost = normal_equations(residual, new_params, data, chunk_size, jacobian=False)
+        if new_cost < cost:
+            reduction = cost - new_cost
+            params = new_params
+            cost, jtj, jtr = normal_equations(residual, params, data, chunk_size)
+            jacobian_evals += 1
+            damping = max(damping / 10, 1e-12)
+            if reduction < ftol * cost:
+                return LeastSquaresResult(params, cost, jtr, True, iteration + 1, jacobian_evals)
+        else:
+            damping *= 10
+            if damping > 1e12:
+                return LeastSquaresResult(params, cost, jtr, False, iteration + 1, jacobian_evals)
+
+    return LeastSquaresResult(params, cost, jtr, bool(np.max(np.abs(jtr)) < gtol), max_iter, jacobian_evals)
@@ -0,0 +1,169 @@
+from collections import namedtuple
+import numpy as np
+from src.auto_diff.reverse_mode.rnode import Rnode
+from src.auto_diff.reverse_mode.codegen import codegen
+
+"""L-BFGS and first order descent methods driven by reverse mode gradients"""
+
+OptimizeResult = namedtuple('OptimizeResult', ['x', 'fun', 'grad', 'converged', 'iterations', 'function_evals'])
+
+
+def value_and_grad(function, x0, use_codegen=True):
+    """
+    Returns a function mapping a numpy array x to the value and the gradient of the objective at x
+
+    Parameters:
+    function: python function taking one node per variable and returning a node, built from the operators
+              and the reverse mode elementary functions
+    x0: list or numpy array used to record the objective
+    use_codegen: if True, the objective is traced on this call and evaluated with generated straight-line
+                 code, so it must not branch on the values of its inputs, and constants it reads from
+                 globals or enclosing scopes are fixed until the next call. If False, an Rnode graph is
+                 built and swept backward at every evaluation
+    """
+    if use_codegen:
+        generated = codegen(function, *[float(v) for v in x0])
+        return lambda x: generated.gradient(*x)
+
+    def evaluate(x):
+        inputs = [Rnode(float(v)) for v in x]
+        output = function(*inputs)
+        if not isinstance(output, Rnode):
+            return float(output), np.zeros(len(inputs))
+        output.backward(retain_graph=False)
+        return output.val, np.array([0.0 if v.grad_value is None else v.grad_value for v in inputs])
+    return evaluate
+
+
+def lbfgs(function, x0, m=10, tol=1e-8, max_iter=500, use_codegen=True):
+    """
+    Minimize an objective with the limited memory BFGS method
+
+    The search direction comes from the two-loop recursion over the last m step and gradient differences,
+    kept in preallocated ring buffers, and the step length from a backtracking line search on the
+    Armijo condition. Every evaluation of the objective returns its value and gradient from one reverse
+    sweep.
+
+    Parameters:
+    function: python function taking one node per variable and returning a node
+    x0: list or numpy array with the starting point
+    m: number of stored correction pairs
+    tol: the iteration stops once the largest component of the gradient is below tol
+    max_iter: maximum number of iterations
+    use_codegen: see value_and_grad
+
+    Returns:
+    An OptimizeResult with the minimizer x, the value fun and gradient grad there, whether the iteration
+    converged and the numbers of iterations and function evaluations
+    """
+    evaluate = value_and_grad(function, x0, use_codegen)
+    x = np.array(x0, dtype=float).reshape(-1)
+    n = len(x)
+    f, g = evaluate(x)
+    evals = 1
+
+    s_buf = np.zeros((m, n))
+    y_buf = np.zeros((m, n))
+    rho = np.zeros(m)
+    alpha = np.zeros(m)
+    direction = np.empty(n)
+    s_new = np.empty(n)
+    y_new = np.empty(n)
+    head = stored = 0
+
+    for iteration in range(max_iter):
+        if np.max(np.abs(g)) < tol:
+            return OptimizeResult(x, f, g, True, iteration, evals)
+
+        np.negative(g, out=direction)
+        recent = [(head - 1 - j) % m for j in range(stored)]
+        for k in recent:
+            alpha[k] = rho[k] * (s_buf[k] @ direction)
+            direction -= alpha[k] * y_buf[k]
+        if stored:
+            last = recent[0]
+            direction *= (s_buf[last] @ y_buf[last]) / (y_buf[last] @ y_buf[last])
+        for k in reversed(recent):
+            beta = rho[k] * (y_buf[k] @ direction)
+            direction += (alpha[k] - beta) * s_buf[k]
+
+        slope = g @ direction
+        if slope >= 0:
+            np.negative(g, out=direction)
+            slope = g @ direction
+            stored = 0
+
+        step = 1.0 if stored else min(1.0, 1.0 / np.linalg.norm(g))
+        while True:
+            x_new = x + step * direction
+            f_new, g_new = evaluate(x_new)
+            evals += 1
+            if f_new <= f + 1e-4 * step * slope or step < 1e-16:
+                break
+            step *= 0.5
+        if step < 1e-16:
+            return OptimizeResult(x, f, g, False, iteration, evals)
+
+        np.subtract(x_new, x, out=s_new)
+        np.subtract(g_new, g, out=y_new)
+        curvature = s_new @ y_new
+        if curvature > 1e-10 * np.linalg.norm(s_new) * np.linalg.norm(y_new):
+            s_buf[head] = s_new
+            y_buf[head] = y_new
+            rho[head] = 1.0 / curvature
+            head = (head + 1) % m
+            stored = min(stored + 1, m)
+        x, f, g = x_new, f_new, g_new
+
+    return OptimizeResult(x, f, g, bool(np.max(np.abs(g)) < tol), max_iter, evals)
+
+
+def gradient_descent(function, x0, learning_rate=1e-3, method='adam', momentum=0.9, beta_1=0.9, beta_2=0.999,
+                     epsilon=1e-8, tol=1e-8, max_iter=10000, use_codegen=True):
+    """
+    Minimize an objective with first order descent
+
+    Parameters:
+    function: python function taking one node per variable and returning a node
+    x0: list or numpy array with the starting point
+    learning_rate: step size
+    method: 'momentum' for heavy ball descent v = momentum * v - learning_rate * g, x += v, or 'adam' for
+            steps scaled by bias corrected running averages of the gradient and of its square
+    momentum: momentum factor of the 'momentum' method (0 gives plain gradient descent)
+    beta_1, beta_2, epsilon: decay rates and regularization of the 'adam' method
+    tol: the iteration stops once the largest component of the gradient is below tol
+    max_iter: maximum number of iterations
+    use_codegen: see value_and_grad
+
+    Returns:
+    An OptimizeResult as for lbfgs
+    """
+    if method not in ('momentum', 'adam'):
+        raise ValueError("method must be either 'momentum' or 'adam'")
+    evaluate = value_and_grad(function, x0, use_codegen)
+    x = np.array(x0, dtype=float).reshape(-1)
+    first = np.zeros_like(x)
+    second = np.zeros_like(x)
+    update = np.empty_like(x)
+
+    for iteration in range(max_iter):
+        f, g = evaluate(x)
+        if np.max(np.abs(g)) < tol:
+            return OptimizeResult(x, f, g, True, iteration, iteration + 1)
+
+        if method == 'momentum':
+            first *= momentum
+            first -= learning_rate * g
+            x += first
+        else:
+            first *= beta_1
+            first += (1 - beta_1) * g
+            second *= beta_2
+            second += (1 - beta_2) * g * g
+            np.sqrt(second / (1 - beta_2 ** (iteration + 1)), out=update)
+            update += epsilon
+            np.divide(first, update, out=update)
+            x -= learning_rate / (1 - beta_1 ** (iteration + 1)) * update
+
+    f, g = evaluate(x)
+    return OptimizeResult(x, f, g, bool(np.max(np.abs(g)) < tol), max_iter, max_iter + 1)
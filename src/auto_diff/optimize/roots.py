@@ -0,0 +1,96 @@
+from collections import namedtuple
+import numpy as np
+from src.auto_diff.forward_mode.fnode import Fnode
+from src.auto_diff.forward_mode.vector_fn import Vector_Fn
+
+"""Newton and Broyden root finding for systems of equations"""
+
+RootResult = namedtuple('RootResult', ['x', 'fun', 'converged', 'iterations', 'function_evals', 'jacobian_evals'])
+
+
+def _values(function, x):
+    """Evaluate the function on plain numbers, returning the residual vector"""
+    outputs = function(*[float(v) for v in x])
+    if not isinstance(outputs, (list, tuple)):
+        outputs = [outputs]
+    return np.array([float(np.ravel(output)[0]) for output in outputs])
+
+
+def jacobian(function, x):
+    """
+    Residuals and exact Jacobian of a system of equations with one forward pass through Vector_Fn
+
+    Parameters:
+    function: python function taking one node per unknown and returning a list of nodes
+    x: list or numpy array with the value of each unknown
+
+    Returns:
+    The numpy array of residuals and the numpy array of the Jacobian (one row per equation)
+    """
+    outputs = function(*[Fnode(float(v), 1, i) for i, v in enumerate(x)])
+    if not isinstance(outputs, (list, tuple)):
+        outputs = [outputs]
+    outputs = [output if isinstance(output, Fnode) else Fnode(float(output), {}) for output in outputs]
+
+    result = Vector_Fn(outputs)
+    var_names, derivs = result.get_deriv()
+    jac = np.zeros((len(outputs), len(x)))
+    jac[:, var_names] = derivs[0]
+    return result.get_vals()[0].astype(float), jac
+
+
+def newton(function, x0, tol=1e-10, max_iter=50, method='newton', refresh=None):
+    """
+    Solve function(x) = 0 for a square system with Newton or Broyden iterations
+
+    Parameters:
+    function: python function taking one node (or number) per unknown and returning a list with one node
+              per equation, built from the operators and the forward mode elementary functions
+    x0: list or numpy array with the initial guess
+    tol: the iteration stops once the norm of the residuals is below tol
+    max_iter: maximum number of iterations
+    method: 'newton' evaluates the exact Jacobian at every iterate. 'broyden' evaluates it once and then
+            applies the rank-one update J += (df - J dx) dx^T / (dx^T dx), only re-evaluating the exact
+            Jacobian every refresh iterations or when an update fails to decrease the residuals
+    refresh: number of Broyden iterations between exact Jacobians, never on a schedule by default
+
+    Returns:
+    A RootResult with the solution x, the residuals fun, whether the iteration converged and the number of
+    iterations, function evaluations and Jacobian evaluations. The iteration stops without converging
+    if the Jacobian becomes singular
+    """
+    if method not in ('newton', 'broyden'):
+        raise ValueError("method must be either 'newton' or 'broyden'")
+    x = np.array(x0, dtype=float).reshape(-1)
+    f, jac = jacobian(function, x)
+    if jac.shape[0] != jac.shape[1]:
+        raise ValueError("The system must have as many equations as unknowns")
+    function_evals = jacobian_evals = 1
+    since_refresh = 0
+
+    for iteration in range(max_iter):
+        if np.linalg.norm(f) < tol:
+            return RootResult(x, f, True, iteration, function_evals, jacobian_evals)
+
+        try:
+            step = np.linalg.solve(jac, -f)
+        except np.linalg.LinAlgError:
+            return RootResult(x, f, False, iteration, function_evals, jacobian_evals)
+        x_new = x + step
+        since_refresh += 1
+        exact = method == 'newton' or (refresh is not None and since_refresh >= refresh)
+        if not exact:
+            f_new = _values(function, x_new)
+            function_evals += 1
+            if np.linalg.norm(f_new) < np.linalg.norm(f):
+                jac += np.outer(f_new - f - jac @ step, step) / (step @ step)
+            else:
+                exact = True
+        if exact:
+            f_new, jac = jacobian(function, x_new)
+            function_evals += 1
+            jacobian_evals += 1
+            since_refresh = 0
+        x, f = x_new, f_new
+
+    return RootResult(x, f, bool(np.linalg.norm(f) < tol), max_iter, function_evals, jacobian_evals)
@@ -0,0 +1,91 @@
+import numpy as np
+from src.auto_diff.reverse_mode.rnode import Rnode, backward
+
+"""Gradient checkpointing for long reverse mode chains"""
+
+
+def _values(state):
+    """Return the values of a list of Rnodes (constants are passed through)"""
+    return [x.val if isinstance(x, Rnode) else x for x in state]
+
+
+def _advance(step, values, n_steps):
+    """Run n_steps steps from the given values without keeping their graphs"""
+    for _ in range(n_steps):
+        values = _values(step([Rnode(v) for v in values]))
+    return values
+
+
+def _reverse_segment(step, values, n_steps, adjoint):
+    """Record the graph of n_steps steps and pull the adjoint of their final state back to their initial state"""
+    leaves = [Rnode(v) for v in values]
+    state = leaves
+    for _ in range(n_steps):
+        state = step(state)
+
+    outputs = [(x, a) for x, a in zip(state, adjoint) if isinstance(x, Rnode)]
+    backward([x for x, _ in outputs], [a for _, a in outputs], retain_graph=False)
+    return [0 if leaf.grad_value is None else leaf.grad_value for leaf in leaves]
+
+
+def _reverse_bisection(step, values, n_steps, adjoint):
+    """Pull the adjoint back through n_steps steps, keeping only O(log(n_steps)) states alive"""
+    if n_steps <= 1:
+        return _reverse_segment(step, values, n_steps, adjoint)
+    half = n_steps // 2
+    middle = _advance(step, values, half)
+    adjoint = _reverse_bisection(step, middle, n_steps - half, adjoint)
+    return _reverse_bisection(step, values, half, adjoint)
+
+
+def checkpoint_grad(step, x0, n_steps, loss, n_checkpoints=None, schedule='uniform'):
+    """Gradient of loss(step^n_steps(x0)) with respect to x0 without recording the whole chain
+
+    Parameters:
+    step: python function mapping the list of state Rnodes to the list of state Rnodes of the next step
+    x0: list of int/float values of the initial state
+    n_steps: number of steps
+    loss: python function mapping the list of final state Rnodes to a scalar Rnode
+    n_checkpoints: number of stored states for the uniform schedule, defaults to ceil(sqrt(n_steps))
+    schedule: 'uniform' stores n_checkpoints evenly spaced states and recomputes each segment once during
+              the backward sweep (O(sqrt(n_steps)) memory, every step run twice). 'bisection' recursively
+              halves the chain (O(log(n_steps)) memory, every step run O(log(n_steps)) times)
+
+    Returns:
+    The value of the loss and a numpy array with its gradient with respect to x0
+
+    Notes:
+        Parameters of the simulation can be differentiated by appending them to the state and returning
+        them unchanged from step.
+    """
+    if n_steps < 0:
+        raise ValueError("n_steps must be non-negative")
+    initial = list(x0)
+
+    if schedule == 'uniform':
+        if n_checkpoints is None:
+            n_checkpoints = max(int(np.ceil(np.sqrt(n_steps))), 1)
+        if n_checkpoints < 1:
+            raise ValueError("n_checkpoints must be at least 1")
+        length = max(int(np.ceil(n_steps / n_checkpoints)), 1)
+        checkpoints = []
+        final = initial
+        for start in range(0, n_steps, length):
+            checkpoints.append((start, final))
+            final = _advance(step, final, min(length, n_steps - start))
+    elif schedule == 'bisection':
+        final = _advance(step, initial, n_steps)
+    else:
+        raise ValueError("schedule must be either 'uniform' or 'bisection'")
+
+    leaves = [Rnode(v) for v in final]
+    result = loss(leaves)
+    result.backward(retain_graph=False)
+    adjoint = [0 if leaf.grad_value is None else leaf.grad_value for leaf in leaves]
+
+    if schedule == 'uniform':
+        for start, saved in reversed(checkpoints):
+            adjoint = _reverse_segment(step, saved, min(length, n_steps - start), adjoint)
+    else:
+        adjoint = _reverse_bisection(step, initial, n_steps, adjoint)
+    return result.val, np.array(adjoint)
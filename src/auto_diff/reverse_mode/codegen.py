@@ -0,0 +1,236 @@
+import math
+import numpy as np
+from src.auto_diff.reverse_mode.tape import (CONST, VAR, ADD, SUB, MUL, NEG, POW, TAN, ARCTAN, TANH, LN, LOG, SQRT,
+                                             SIN, ARCSIN, SINH, COS, ARCCOS, COSH, EXP)
+from src.auto_diff.reverse_mode.compiled import _ScalarMath, trace
+
+"""Straight-line Python source generated from traced tapes"""
+
+# source of the value of every opcode, a and b are the parents
+_VALUE_SOURCE = {
+    ADD: '{a} + {b}',
+    SUB: '{a} - {b}',
+    MUL: '{a} * {b}',
+    NEG: '-{a}',
+    POW: 'power({a}, {b})',
+    TAN: 'tan({a})',
+    ARCTAN: 'arctan({a})',
+    TANH: 'tanh({a})',
+    LN: 'log({a})',
+    LOG: 'divide(log({a}), log({b}))',
+    SQRT: 'sqrt({a})',
+    SIN: 'sin({a})',
+    ARCSIN: 'arcsin({a})',
+    SINH: 'sinh({a})',
+    COS: 'cos({a})',
+    ARCCOS: 'arccos({a})',
+    COSH: 'cosh({a})',
+    EXP: 'exp({a})',
+}
+
+# source of the partial derivatives with respect to a and b, z is the value of the entry
+_PARTIAL_SOURCE = {
+    ADD: ('1.0', '1.0'),
+    SUB: ('1.0', '-1.0'),
+    MUL: ('{b}', '{a}'),
+    NEG: ('-1.0', None),
+    POW: ('{b} * power({a}, {b} - 1)', '{z} * log({a})'),
+    TAN: ('1 / cos({a}) ** 2', None),
+    ARCTAN: ('1 / (1 + {a} ** 2)', None),
+    TANH: ('1 / cosh({a}) ** 2', None),
+    LN: ('divide(1.0, {a})', None),
+    LOG: ('divide(1.0, {a} * log({b}))', None),
+    SQRT: ('divide(0.5, {z})', None),
+    SIN: ('cos({a})', None),
+    ARCSIN: ('divide(1.0, sqrt(1 - {a} ** 2))', None),
+    SINH: ('cosh({a})', None),
+    COS: ('-sin({a})', None),
+    ARCCOS: ('divide(-1.0, sqrt(1 - {a} ** 2))', None),
+    COSH: ('sinh({a})', None),
+    EXP: ('{z}', None),
+}
+
+_FUNCTIONS = ['divide', 'power', 'tan', 'arctan', 'tanh', 'log', 'sqrt', 'sin', 'arcsin', 'sinh', 'cos', 'arccos',
+              'cosh', 'exp']
+_SCALAR_NAMESPACE = {name: getattr(_ScalarMath, name) for name in _FUNCTIONS}
+_ARRAY_NAMESPACE = {name: getattr(np, name) for name in _FUNCTIONS}
+
+
+def _literal(value):
+    """Source of a constant, parenthesized when negative so that it can be an operand of ** and - """
+    value = float(value)
+    if math.isnan(value):
+        return "float('nan')"
+    if math.isinf(value):
+        return "float('inf')" if value > 0 else "(-float('inf'))"
+    if math.copysign(1.0, value) < 0:
+        return '({!r})'.format(value)
+    return repr(value)
+
+
+def _term(partial, adjoint):
+    """Source of partial * adjoint, folding the constant partials of the linear opcodes and the output seed"""
+    if adjoint == '1.0':
+        return partial
+    if partial == '1.0':
+        return adjoint
+    if partial == '-1.0':
+        return '-' + adjoint
+    return '({}) * {}'.format(partial, adjoint)
+
+
+def _sources(op, b, ops, consts):
+    """Source of the value and of the partials of an entry, with powers by small non-negative integer
+    constants written with ** so that python floats do not go through math.pow"""
+    if op == POW and ops[b] == CONST and consts[b] >= 0 and float(consts[b]).is_integer():
+        n = int(consts[b])
+        return '{{a}} ** {}'.format(n), ('{}.0 * {{a}} ** {}'.format(n, n - 1) if n > 0 else '0.0', None)
+    return _VALUE_SOURCE[op], _PARTIAL_SOURCE[op]
+
+
+def generate_source(compiled, name='generated'):
+    """Emit the value and gradient of a recorded tape as the source of one straight-line python function
+
+    Only the entries the output depends on are emitted, and adjoints are only propagated to entries that
+    depend on an input, so partials with respect to constants (e.g. the exponent of x ** 2) are never
+    computed.
+
+    Parameters:
+    compiled: CompiledTape of the function
+    name: name of the generated function
+
+    Returns:
+    The source of a function taking one argument per input and returning the value and a tuple with
+    the derivative with respect to each input
+    """
+    ops, parents, consts = compiled._ops, compiled._parents, compiled._consts
+    inputs, output = compiled._inputs, compiled._output
+
+    needed = {output}
+    for i in range(output, -1, -1):
+        if i in needed:
+            needed.update(p for p in parents[i] if p >= 0)
+
+    varying = set(inputs)
+    for i, op, p_0, p_1 in compiled._schedule:
+        if p_0 in varying or p_1 in varying:
+            varying.add(i)
+
+    args = ['x{}'.format(k) for k in range(len(inputs))]
+    names = {i: arg for i, arg in zip(inputs, args)}
+    lines = ['def {}({}):'.format(name, ', '.join(args))]
+    for i in sorted(needed):
+        if ops[i] == CONST:
+            names[i] = _literal(consts[i])
+        elif ops[i] != VAR:
+            names[i] = 'v{}'.format(i)
+            a, b = parents[i]
+            value = _sources(ops[i], b, ops, consts)[0]
+            lines.append('    {} = {}'.format(names[i], value.format(a=names[a], b=names.get(b))))
+
+    adjoints = {output: '1.0'} if output in varying else {}
+    for i in sorted(needed & varying, reverse=True):
+        if i not in adjoints or ops[i] == VAR:
+            continue
+        a, b = parents[i]
+        for parent, partial in zip((a, b), _sources(ops[i], b, ops, consts)[1]):
+            if parent < 0 or parent not in varying:
+                continue
+            term = _term(partial.format(a=names[a], b=names.get(b), z=names[i]), adjoints[i])
+            if parent in adjoints:
+                lines.append('    {} += {}'.format(adjoints[parent], term))
+            else:
+                adjoints[parent] = 'g{}'.format(parent)
+                lines.append('    {} = {}'.format(adjoints[parent], term))
+
+    grads = [adjoints.get(i, '0.0') for i in inputs]
+    lines.append('    return {}, ({}{})'.format(names[output], ', '.join(grads), ',' if len(grads) == 1 else ''))
+    return '\n'.join(lines) + '\n'
+
+
+class GeneratedFunction:
+    def __init__(self, compiled, name='generated'):
+        """Constructor for a function whose value and gradient are emitted as straight-line python code
+
+        The source is compiled once and executed with math functions for float inputs and numpy
+        functions for arrays of points, so evaluating it involves no node objects, tape or per
+        operation dispatch.
+
+        Parameters
+        compiled : CompiledTape
+            The recorded tape of the function
+        name : string
+            The name of the generated function, also used as its file name in tracebacks. It must be an
+            identifier other than the names of the math functions the code calls
+        """
+        if not name.isidentifier() or name in _FUNCTIONS:
+            raise ValueError("{!r} cannot be the name of the generated function".format(name))
+        self._num_inputs = compiled.num_inputs
+        self._source = generate_source(compiled, name)
+        code = compile(self._source, '<{}>'.format(name), 'exec')
+        scalar_namespace = dict(_SCALAR_NAMESPACE)
+        array_namespace = dict(_ARRAY_NAMESPACE)
+        exec(code, scalar_namespace)
+        exec(code, array_namespace)
+        self._scalar = scalar_namespace[name]
+        self._array = array_namespace[name]
+
+
+    @property
+    def source(self):
+        return self._source
+
+
+    @property
+    def num_inputs(self):
+        return self._num_inputs
+
+
+    def gradient(self, *args):
+        """Evaluate the generated code
+
+        Parameters:
+        args: one int/float per input, or arrays of points that broadcast together
+
+        Returns:
+        The value of the function and a numpy array with its gradient (one row per input)
+        """
+        if len(args) != self._num_inputs:
+            raise ValueError("Expected {} inputs but got {}".format(self._num_inputs, len(args)))
+        if any(np.ndim(x) > 0 for x in args):
+            args = np.broadcast_arrays(*[np.asarray(x, dtype=float) for x in args])
+            with np.errstate(all='ignore'):
+                value, grads = self._array(*args)
+            return np.broadcast_to(value, args[0].shape), np.array(np.broadcast_arrays(args[0], *grads)[1:])
+        value, grads = self._scalar(*[float(x) for x in args])
+        return value, np.array(grads)
+
+
+    def forward(self, *args):
+        return self.gradient(*args)[0]
+
+
+    def __call__(self, *args):
+        return self.forward(*args)
+
+
+def codegen(function, *args):
+    """Trace a function and generate straight-line code for its value and gradient
+
+    Parameters:
+    function: python function taking one node per input and returning a node, built from the
+              operators and the reverse mode elementary functions
+    args: int/float values of the inputs used for recording
+
+    Returns:
+    A GeneratedFunction
+
+    Notes:
+        Like trace, the function must not branch on the values of its inputs. The values of the constants
+        it reads (including globals and variables of enclosing scopes) are also fixed when it is traced,
+        so call codegen again after they change rather than reusing an older GeneratedFunction.
+    """
+    name = getattr(function, '__name__', 'generated')
+    if not name.isidentifier() or name in _FUNCTIONS:
+        name = 'generated'
+    return GeneratedFunction(trace(function, *args), name)
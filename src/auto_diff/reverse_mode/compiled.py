@@ -0,0 +1,443 @@
+import math
+import numpy as np
+from src.auto_diff.reverse_mode.tape import (Tape, Tnode, CONST, VAR, ADD, SUB, MUL, NEG, POW, TAN, ARCTAN, TANH,
+                                             LN, LOG, SQRT, SIN, ARCSIN, SINH, COS, ARCCOS, COSH, EXP)
+
+"""Record-once / replay-many reverse mode tapes"""
+
+
+def _nan_outside_domain(function):
+    """Wrap a math function so that it returns nan outside its domain like its numpy counterpart"""
+    def wrapped(*args):
+        try:
+            return function(*args)
+        except (ValueError, ZeroDivisionError):
+            return math.nan
+    return wrapped
+
+
+def _divide(a, b):
+    """Divide python floats, returning inf or nan on a zero divisor like numpy"""
+    try:
+        return a / b
+    except ZeroDivisionError:
+        if a == 0 or a != a:
+            return math.nan
+        return math.copysign(math.inf, a) * math.copysign(1.0, b)
+
+
+class _ScalarMath:
+    """The math functions used by the rules when replaying python floats"""
+    nan = math.nan
+    divide = staticmethod(_divide)
+    power = staticmethod(_nan_outside_domain(math.pow))
+    log = staticmethod(_nan_outside_domain(math.log))
+    sqrt = staticmethod(_nan_outside_domain(math.sqrt))
+    arcsin = staticmethod(_nan_outside_domain(math.asin))
+    arccos = staticmethod(_nan_outside_domain(math.acos))
+    arctan = staticmethod(math.atan)
+    sin = staticmethod(math.sin)
+    cos = staticmethod(math.cos)
+    tan = staticmethod(math.tan)
+    sinh = staticmethod(_nan_outside_domain(math.sinh))
+    cosh = staticmethod(_nan_outside_domain(math.cosh))
+    tanh = staticmethod(math.tanh)
+    exp = staticmethod(_nan_outside_domain(math.exp))
+
+
+def _rules(m):
+    """Return the forward rule and the partial derivative rule of every opcode
+
+    Parameters:
+    m: namespace providing the math functions (numpy for arrays, _ScalarMath for floats)
+
+    Returns:
+    A dictionary mapping each opcode to (value(a, b), partials(a, b, z)) where a and b are the values of
+    the parents and z is the value of the entry
+    """
+    return {
+        ADD: (lambda a, b: a + b, lambda a, b, z: (1.0, 1.0)),
+        SUB: (lambda a, b: a - b, lambda a, b, z: (1.0, -1.0)),
+        MUL: (lambda a, b: a * b, lambda a, b, z: (b, a)),
+        NEG: (lambda a, b: -a, lambda a, b, z: (-1.0, 0.0)),
+        POW: (lambda a, b: m.power(a, b), lambda a, b, z: (b * m.power(a, b - 1), z * m.log(a))),
+        TAN: (lambda a, b: m.tan(a), lambda a, b, z: (1 / (m.cos(a) ** 2), 0.0)),
+        ARCTAN: (lambda a, b: m.arctan(a), lambda a, b, z: (1 / (1 + a ** 2), 0.0)),
+        TANH: (lambda a, b: m.tanh(a), lambda a, b, z: (1 / (m.cosh(a) ** 2), 0.0)),
+        LN: (lambda a, b: m.log(a), lambda a, b, z: (m.divide(1.0, a), 0.0)),
+        LOG: (lambda a, b: m.divide(m.log(a), m.log(b)), lambda a, b, z: (m.divide(1.0, a * m.log(b)), 0.0)),
+        SQRT: (lambda a, b: m.sqrt(a), lambda a, b, z: (m.divide(0.5, z), 0.0)),
+        SIN: (lambda a, b: m.sin(a), lambda a, b, z: (m.cos(a), 0.0)),
+        ARCSIN: (lambda a, b: m.arcsin(a), lambda a, b, z: (m.divide(1.0, m.sqrt(1 - a ** 2)), 0.0)),
+        SINH: (lambda a, b: m.sinh(a), lambda a, b, z: (m.cosh(a), 0.0)),
+        COS: (lambda a, b: m.cos(a), lambda a, b, z: (-m.sin(a), 0.0)),
+        ARCCOS: (lambda a, b: m.arccos(a), lambda a, b, z: (m.divide(-1.0, m.sqrt(1 - a ** 2)), 0.0)),
+        COSH: (lambda a, b: m.cosh(a), lambda a, b, z: (m.sinh(a), 0.0)),
+        EXP: (lambda a, b: m.exp(a), lambda a, b, z: (z, 0.0)),
+    }
+
+
+_SCALAR_RULES = _rules(_ScalarMath)
+_ARRAY_RULES = _rules(np)
+
+# opcode of the scalar replay for powers by integer constants, which python floats evaluate directly
+_INT_POW = -1
+
+
+def _second_rules(m):
+    """Return the second partial derivative rule of every opcode
+
+    Parameters:
+    m: namespace providing the math functions
+
+    Returns:
+    A dictionary mapping each opcode to a function of (a, b, z) returning the second partial derivatives
+    (d2z/da2, d2z/dadb, d2z/db2)
+    """
+    zero = lambda a, b, z: (0.0, 0.0, 0.0)
+    return {
+        ADD: zero,
+        SUB: zero,
+        NEG: zero,
+        MUL: lambda a, b, z: (0.0, 1.0, 0.0),
+        POW: lambda a, b, z: (b * (b - 1) * m.power(a, b - 2), m.power(a, b - 1) * (1 + b * m.log(a)),
+                              z * m.log(a) ** 2),
+        TAN: lambda a, b, z: (2 * z / m.cos(a) ** 2, 0.0, 0.0),
+        ARCTAN: lambda a, b, z: (-2 * a / (1 + a ** 2) ** 2, 0.0, 0.0),
+        TANH: lambda a, b, z: (-2 * z * (1 - z ** 2), 0.0, 0.0),
+        LN: lambda a, b, z: (m.divide(-1.0, a ** 2), 0.0, 0.0),
+        LOG: lambda a, b, z: (m.divide(-1.0, a ** 2 * m.log(b)), 0.0, 0.0),
+        SQRT: lambda a, b, z: (m.divide(-0.25, a * z), 0.0, 0.0),
+        SIN: lambda a, b, z: (-z, 0.0, 0.0),
+        ARCSIN: lambda a, b, z: (m.divide(a, m.power(1 - a ** 2, 1.5)), 0.0, 0.0),
+        SINH: lambda a, b, z: (z, 0.0, 0.0),
+        COS: lambda a, b, z: (-z, 0.0, 0.0),
+        ARCCOS: lambda a, b, z: (m.divide(-a, m.power(1 - a ** 2, 1.5)), 0.0, 0.0),
+        COSH: lambda a, b, z: (z, 0.0, 0.0),
+        EXP: lambda a, b, z: (z, 0.0, 0.0),
+    }
+
+
+_SCALAR_SECOND_RULES = _second_rules(_ScalarMath)
+
+
+class CompiledTape:
+    def __init__(self, tape, inputs, output):
+        """Constructor for a recorded tape that can be replayed for new input values.
+
+        Only the entries up to the output are kept. Replaying never creates node objects: scalar inputs
+        are replayed with a straight-line loop over python floats, and arrays of inputs (many points at
+        once) with one vectorized numpy operation per opcode and graph level.
+
+        Parameters
+        tape : Tape
+            The tape the function was recorded on
+        inputs : list
+            The tape indices of the input variables, in argument order
+        output : int
+            The tape index of the output
+        """
+        n = max([output] + list(inputs)) + 1
+        self._ops = tape._ops[:n].tolist()
+        self._parents = tape._parents[:n].tolist()
+        self._consts = tape._vals[:n].copy()
+        self._inputs = list(inputs)
+        self._output = output
+        self._schedule = [(i, op, p[0], p[1]) for i, (op, p) in enumerate(zip(self._ops, self._parents))
+                          if op not in (CONST, VAR)]
+        self._scalar_schedule = [(i, _INT_POW if op == POW and self._ops[p_1] == CONST and
+                                  float(self._consts[p_1]).is_integer() else op, p_0, p_1)
+                                 for i, op, p_0, p_1 in self._schedule]
+        self._groups = None
+        self._eliminated = tape.eliminated
+
+
+    def __len__(self):
+        return len(self._ops)
+
+
+    @property
+    def num_inputs(self):
+        return len(self._inputs)
+
+
+    @property
+    def eliminated(self):
+        return self._eliminated
+
+
+    def _levels(self):
+        """Group the entries into (opcode, indices) batches ordered by depth in the graph"""
+        level = [0] * len(self._ops)
+        groups = {}
+        for i, op, p_0, p_1 in self._schedule:
+            level[i] = 1 + max(level[p_0], level[p_1] if p_1 >= 0 else 0)
+            groups.setdefault((level[i], op), []).append(i)
+
+        parents = np.array(self._parents, dtype=np.int64).reshape(-1, 2)
+        self._groups = []
+        for (_, op), indices in sorted(groups.items()):
+            indices = np.array(indices, dtype=np.int64)
+            parent_1 = parents[indices, 1] if parents[indices[0], 1] >= 0 else None
+            self._groups.append((op, indices, parents[indices, 0], parent_1))
+        return self._groups
+
+
+    def _check_args(self, args):
+        if len(args) != len(self._inputs):
+            raise ValueError("Expected {} inputs but got {}".format(len(self._inputs), len(args)))
+
+
+    def _replay_scalar(self, args, need_grad):
+        vals = self._consts.tolist()
+        for i, x in zip(self._inputs, args):
+            vals[i] = float(x)
+
+        sin, cos, log = math.sin, math.cos, math.log
+        for i, op, p_0, p_1 in self._scalar_schedule:
+            a = vals[p_0]
+            if op == MUL:
+                vals[i] = a * vals[p_1]
+            elif op == ADD:
+                vals[i] = a + vals[p_1]
+            elif op == SUB:
+                vals[i] = a - vals[p_1]
+            elif op == _INT_POW and a:
+                vals[i] = a ** vals[p_1]
+            elif op == POW and a > 0:
+                vals[i] = a ** vals[p_1]
+            elif op == SIN:
+                vals[i] = sin(a)
+            elif op == COS:
+                vals[i] = cos(a)
+            else:
+                op = POW if op == _INT_POW else op
+                vals[i] = _SCALAR_RULES[op][0](a, vals[p_1] if p_1 >= 0 else 0.0)
+        if not need_grad:
+            return vals[self._output], None
+
+        # the forward pass above only stored the values; the partials are computed from them during the
+        # reverse sweep, and only for entries whose adjoint is nonzero
+        adjoints = [0.0] * len(vals)
+        adjoints[self._output] = 1.0
+        for i, op, p_0, p_1 in reversed(self._scalar_schedule):
+            adjoint = adjoints[i]
+            if not adjoint:
+                continue
+            if op == MUL:
+                adjoints[p_0] += vals[p_1] * adjoint
+                adjoints[p_1] += vals[p_0] * adjoint
+            elif op == ADD:
+                adjoints[p_0] += adjoint
+                adjoints[p_1] += adjoint
+            elif op == SUB:
+                adjoints[p_0] += adjoint
+                adjoints[p_1] -= adjoint
+            else:
+                a = vals[p_0]
+                if op == _INT_POW and a:
+                    b = vals[p_1]
+                    adjoints[p_0] += b * a ** (b - 1) * adjoint
+                    continue
+                if op == SIN:
+                    adjoints[p_0] += cos(a) * adjoint
+                    continue
+                if op == COS:
+                    adjoints[p_0] -= sin(a) * adjoint
+                    continue
+                if op == EXP:
+                    adjoints[p_0] += vals[i] * adjoint
+                    continue
+                op = POW if op == _INT_POW else op
+                if op == POW and a > 0:
+                    b = vals[p_1]
+                    adjoints[p_0] += b * a ** (b - 1) * adjoint
+                    adjoints[p_1] += vals[i] * log(a) * adjoint
+                    continue
+                partial_0, partial_1 = _SCALAR_RULES[op][1](a, vals[p_1] if p_1 >= 0 else 0.0, vals[i])
+                adjoints[p_0] += partial_0 * adjoint
+                if p_1 >= 0:
+                    adjoints[p_1] += partial_1 * adjoint
+        return vals[self._output], np.array([adjoints[i] for i in self._inputs])
+
+
+    def _replay_array(self, args, need_grad):
+        args = np.broadcast_arrays(*[np.asarray(x, dtype=float) for x in args])
+        shape = args[0].shape
+        groups = self._groups if self._groups is not None else self._levels()
+
+        n = len(self._ops)
+        vals = np.empty((n,) + shape)
+        vals[...] = self._consts.reshape((n,) + (1,) * len(shape))
+        vals[self._inputs] = args
+        if need_grad:
+            partials_0 = np.zeros_like(vals)
+            partials_1 = np.zeros_like(vals)
+
+        rules = _ARRAY_RULES
+        with np.errstate(all='ignore'):
+            for op, indices, p_0, p_1 in groups:
+                a = vals[p_0]
+                b = vals[p_1] if p_1 is not None else None
+                value, partial = rules[op]
+                z = vals[indices] = value(a, b)
+                if need_grad:
+                    partial_0, partial_1 = partial(a, b, z)
+                    partials_0[indices] = partial_0
+                    partials_1[indices] = partial_1
+
+            if not need_grad:
+                return vals[self._output], None
+
+            adjoints = np.zeros_like(vals)
+            adjoints[self._output] = 1.0
+            for op, indices, p_0, p_1 in reversed(groups):
+                adjoint = adjoints[indices]
+                np.add.at(adjoints, p_0, partials_0[indices] * adjoint)
+                if p_1 is not None:
+                    np.add.at(adjoints, p_1, partials_1[indices] * adjoint)
+        return vals[self._output], adjoints[self._inputs]
+
+
+    def _replay(self, args, need_grad):
+        self._check_args(args)
+        if any(np.ndim(x) > 0 for x in args):
+            return self._replay_array(args, need_grad)
+        return self._replay_scalar(args, need_grad)
+
+
+    def forward(self, *args):
+        """Replay the recorded function for new input values
+
+        Parameters:
+        args: one int/float per input, or arrays of points that broadcast together
+
+        Returns:
+        The value of the function
+        """
+        return self._replay(args, False)[0]
+
+
+    def gradient(self, *args):
+        """Replay the recorded function and its reverse sweep for new input values
+
+        Parameters:
+        args: one int/float per input, or arrays of points that broadcast together
+
+        Returns:
+        The value of the function and a numpy array with its gradient (one row per input)
+        """
+        return self._replay(args, True)
+
+
+    def __call__(self, *args):
+        return self.forward(*args)
+
+
+    def hvp(self, x, v):
+        """Hessian-vector product by forward-over-reverse replay of the tape
+
+        The forward replay carries the directional derivative along v of every value and local partial,
+        and the reverse sweep carries the directional derivative of every adjoint, so the cost is a small
+        constant multiple of one gradient and the Hessian is never formed.
+
+        Parameters:
+        x: list of int/float values of the inputs
+        v: list of int/float components of the direction
+
+        Returns:
+        The value of the function, a numpy array with its gradient and a numpy array with H v
+        """
+        self._check_args(x)
+        self._check_args(v)
+        vals = self._consts.tolist()
+        n = len(vals)
+        tangents = [0.0] * n
+        for i, x_i, v_i in zip(self._inputs, x, v):
+            vals[i] = float(x_i)
+            tangents[i] += float(v_i)
+
+        # a term is only added when its tangent is nonzero, so that undefined partials with respect to
+        # constants (e.g. the exponent of x ** 2 at x < 0) do not turn the result into nan
+        partials = [None] * n
+        partial_tangents = [None] * n
+        for i, op, p_0, p_1 in self._schedule:
+            a = vals[p_0]
+            b = vals[p_1] if p_1 >= 0 else 0.0
+            t_a = tangents[p_0]
+            t_b = tangents[p_1] if p_1 >= 0 else 0.0
+            value, partial = _SCALAR_RULES[op]
+            z = vals[i] = value(a, b)
+            partial_0, partial_1 = partials[i] = partial(a, b, z)
+            d_aa, d_ab, d_bb = _SCALAR_SECOND_RULES[op](a, b, z)
+
+            tangent = partial_tangent_0 = partial_tangent_1 = 0.0
+            if t_a:
+                tangent += partial_0 * t_a
+                partial_tangent_0 += d_aa * t_a
+                partial_tangent_1 += d_ab * t_a
+            if t_b:
+                tangent += partial_1 * t_b
+                partial_tangent_0 += d_ab * t_b
+                partial_tangent_1 += d_bb * t_b
+            tangents[i] = tangent
+            partial_tangents[i] = (partial_tangent_0, partial_tangent_1)
+
+        adjoints = [0.0] * n
+        adjoint_tangents = [0.0] * n
+        adjoints[self._output] = 1.0
+        for i, op, p_0, p_1 in reversed(self._schedule):
+            adjoint = adjoints[i]
+            adjoint_tangent = adjoint_tangents[i]
+            if adjoint or adjoint_tangent:
+                partial_0, partial_1 = partials[i]
+                partial_tangent_0, partial_tangent_1 = partial_tangents[i]
+                adjoints[p_0] += partial_0 * adjoint
+                adjoint_tangents[p_0] += partial_tangent_0 * adjoint + partial_0 * adjoint_tangent
+                if p_1 >= 0:
+                    adjoints[p_1] += partial_1 * adjoint
+                    adjoint_tangents[p_1] += partial_tangent_1 * adjoint + partial_1 * adjoint_tangent
+        return (vals[self._output], np.array([adjoints[i] for i in self._inputs]),
+                np.array([adjoint_tangents[i] for i in self._inputs]))
+
+
+def trace(function, *args):
+    """Record a function once so that it can be replayed for other inputs
+
+    Parameters:
+    function: python function taking one node per input and returning a node, built from the
+              operators and the reverse mode elementary functions
+    args: int/float values of the inputs used for recording
+
+    Returns:
+    A CompiledTape of the function
+
+    Notes:
+        The function must not branch on the values of its inputs, since only the branch taken
+        during recording is replayed. The tape is recorded with common subexpression elimination,
+        and the number of eliminated operations is available as eliminated on the result.
+    """
+    tape = Tape(cse=True)
+    inputs = [tape.var(x) for x in args]
+    output = function(*inputs)
+    if not isinstance(output, Tnode):
+        raise TypeError("The traced function must return a node computed from its inputs")
+    return CompiledTape(tape, [x._index for x in inputs], output._index)
+
+
+def hvp(function, x, v):
+    """Hessian-vector product of a scalar function
+
+    Parameters:
+    function: python function taking one node per input and returning a node
+    x: list of int/float values of the inputs
+    v: list of int/float components of the direction
+
+    Returns:
+    A numpy array with the product of the Hessian of function at x with v
+
+    Notes:
+        This records the function on every call; trace it once and use CompiledTape.hvp when the same
+        function is evaluated repeatedly (e.g. inside Newton-CG).
+    """
+    return trace(function, *x).hvp(x, v)[2]
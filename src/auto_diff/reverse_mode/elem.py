@@ -1,7 +1,25 @@
-from src.auto_diff.reverse_mode.rnode import Rnode
 import numpy as np
+from src.auto_diff.reverse_mode.tape import Tnode
 
-"""Elementary functions for reverse mode"""
+"""Elementary functions for reverse mode, shared by Rnode and the tape-backed Tnode"""
+
+
+def _unary(x, op, val, partial, arg=None):
+    """Create the result of an elementary function applied to a node
+
+    Parameters:
+    x: Rnode or Tnode
+    op: name of the elementary function, recorded as the opcode of Tnodes
+    val: value of the result
+    partial: derivative of the result with respect to x
+    arg: optional constant second argument of the function (e.g. the base of log), recorded for Tnodes
+
+    Returns:
+    A new node of the same type as x
+    """
+    if isinstance(x, Tnode):
+        return x._unary(op, val, partial, arg)
+    return x._unary(val, partial)
 
 
 def tan(x):
@@ -15,9 +33,8 @@ def tan(x):
        For Rnodes, a new Rnode object with tangent computed for the value
        For values, the tangent function evaluated at that value
        """
-    z = Rnode(np.tan(x._val))
-    x._children.append((1 / (np.cos(x._val) ** 2), z))
-    return z
+    value = np.tan(x._val)
+    return _unary(x, 'tan', value, 1 + value ** 2)
 
 
 def arctan(x):
@@ -31,9 +48,7 @@ def arctan(x):
       For Rnodes, a new Rnode object with arctan computed for the value
       For values, the arctan function evaluated at that value
       """
-    z = Rnode(np.arctan(x._val))
-    x._children.append((1 / (1 + (x._val ** 2)), z))
-    return z
+    return _unary(x, 'arctan', np.arctan(x._val), 1 / (1 + (x._val ** 2)))
 
 
 def tanh(x):
@@ -47,9 +62,7 @@ def tanh(x):
      For Rnodes, a new Rnode object with tanh computed for the value
      For values, the tanh function evaluated at that value
      """
-    z = Rnode(np.tanh(x._val))
-    x._children.append((1 / (np.cosh(x._val) ** 2), z))
-    return z
+    return _unary(x, 'tanh', np.tanh(x._val), 1 / (np.cosh(x._val) ** 2))
 
 
 def ln(x):
@@ -64,9 +77,7 @@ def ln(x):
        For values, the natural log function evaluated at that value
        """
     if(np.all(x._val > 0)):
-        z = Rnode(np.log(x._val))
-        x._children.append((1/x._val, z))
-        return z
+        return _unary(x, 'ln', np.log(x._val), 1/x._val)
     else:
         raise ValueError("The natural log is not defined for negative numbers")
 
@@ -87,9 +98,7 @@ def log(x, base):
         raise ValueError("Logarithm base cannot be less than or equal to zero")
     
     if(np.all(x._val > 0)):
-        z = Rnode(np.log(x._val) / np.log(base))
-        x._children.append((1/(x._val * np.log(base)), z))
-        return z
+        return _unary(x, 'log', np.log(x._val) / np.log(base), 1/(x._val * np.log(base)), base)
     else:
         raise ValueError("Logarithm is not defined for negative numbers")
 
@@ -105,9 +114,8 @@ def sqrt(x):
        For Rnodes, a new Rnode object with natural log computed for the value
        For values, the natural log function evaluated at that value
        """
-    z = Rnode(x._val ** (1/2))
-    x._children.append(((1/2) * (x._val ** (-1/2)), z))
-    return z
+    value = x._val ** (1/2)
+    return _unary(x, 'sqrt', value, (1/2) / value)
 
 
 def sin(x):
@@ -121,9 +129,7 @@ def sin(x):
        For Rnodes, a new Rnode object with sin computed for the value
        For values, the sin function evaluated at that value
        """
-    z = Rnode(np.sin(x._val))
-    x._children.append((np.cos(x._val), z))
-    return z
+    return _unary(x, 'sin', np.sin(x._val), np.cos(x._val))
 
 
 def arcsin(x):
@@ -137,9 +143,7 @@ def arcsin(x):
     For Rnodes, a new Rnode object with arcsin computed for the value
     For values, the arcsin function evaluated at that value
     """
-    z = Rnode(np.arcsin(x._val))
-    x._children.append((1/(1 - x._val ** 2) ** 0.5, z))
-    return z
+    return _unary(x, 'arcsin', np.arcsin(x._val), 1/(1 - x._val ** 2) ** 0.5)
 
 
 def sinh(x):
@@ -153,9 +157,7 @@ def sinh(x):
         For Rnodes, a new Rnode object with sinh computed for the value
         For values, the sinh function evaluated at that value
         """
-    z = Rnode(np.sinh(x._val))
-    x._children.append((np.cosh(x._val), z))
-    return z
+    return _unary(x, 'sinh', np.sinh(x._val), np.cosh(x._val))
 
 
 def cos(x):
@@ -169,9 +171,7 @@ def cos(x):
       For Rnodes, a new Rnode object with cos computed for the value and derivative
       For values, the cos function evaluated at that value
       """
-    z = Rnode(np.cos(x._val))
-    x._children.append((-np.sin(x._val), z))
-    return z
+    return _unary(x, 'cos', np.cos(x._val), -np.sin(x._val))
 
 
 def arccos(x):
@@ -185,9 +185,7 @@ def arccos(x):
        For Rnodes, a new Rnode object with arccos computed for the value
        For values, the arccos function evaluated at that value
        """
-    z = Rnode(np.arccos(x._val))
-    x._children.append((-1 / (1 - x._val ** 2) ** 0.5, z))
-    return z
+    return _unary(x, 'arccos', np.arccos(x._val), -1 / (1 - x._val ** 2) ** 0.5)
 
 
 
@@ -202,9 +200,7 @@ def cosh(x):
        For Rnodes, a new Rnode object with cosh computed for the value and derivative
        For values, the cosh function evaluated at that value
        """
-    z = Rnode(np.cosh(x._val))
-    x._children.append((np.sinh(x._val), z))
-    return z
+    return _unary(x, 'cosh', np.cosh(x._val), np.sinh(x._val))
 
 
 def exp(x):
@@ -218,6 +214,5 @@ def exp(x):
        For Rnodes, a new Rnode object with exp computed for the value
        For values, the exp function evaluated at that value
        """
-    z = Rnode(np.exp(x._val))
-    x._children.append((np.exp(x._val), z))
-    return z
+    value = np.exp(x._val)
+    return _unary(x, 'exp', value, value)
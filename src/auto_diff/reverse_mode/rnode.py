@@ -1,18 +1,211 @@
 import numpy as np
 
 
+def topological_order(rnodes):
+    """return every node the given nodes depend on, ordered so that each node comes after its parents
+
+    The graph is walked with an explicit stack, so arbitrarily deep graphs do not hit the recursion limit.
+
+    Parameters:
+    rnodes: list of Rnode objects, usually the outputs of a function
+
+    Returns:
+    A list of Rnode objects
+    """
+    order = []
+    visited = set()
+    for root in rnodes:
+        if root in visited:
+            continue
+        visited.add(root)
+        stack = [(root, iter(root._parents))]
+        while stack:
+            rnode, parents = stack[-1]
+            for _, parent in parents:
+                if parent not in visited:
+                    visited.add(parent)
+                    stack.append((parent, iter(parent._parents)))
+                    break
+            else:
+                stack.pop()
+                order.append(rnode)
+    return order
+
+
+def unbroadcast(grad, shape, lead=0):
+    """return grad summed back to the given shape, undoing numpy broadcasting
+
+    Parameters:
+    grad: adjoint contribution, shaped like the result of the operation
+    shape: shape of the operand the contribution is for
+    lead: number of leading axes of grad to keep as they are (e.g. one row per seed)
+
+    Returns:
+    The contribution with shape grad.shape[:lead] + shape
+    """
+    if not isinstance(grad, np.ndarray):
+        return np.full(shape, grad) if shape else grad
+    target = grad.shape[:lead] + tuple(shape)
+    if grad.shape == target:
+        return grad
+    extra = grad.ndim - len(target)
+    if extra > 0:
+        grad = grad.sum(axis=tuple(range(lead, lead + extra)))
+    axes = tuple(lead + i for i, n in enumerate(shape) if n == 1 and grad.shape[lead + i] != 1)
+    if axes:
+        grad = grad.sum(axis=axes, keepdims=True)
+    if grad.shape != target:
+        grad = np.broadcast_to(grad, target).copy()
+    return grad
+
+
+def _weighted(weight, grad):
+    """return the adjoint contribution of an edge, weight is either a local partial or an adjoint rule"""
+    return weight(grad) if callable(weight) else weight * grad
+
+
+def _reduced_axes(ndim, axis):
+    """return the sorted non-negative axes reduced by a numpy reduction over axis"""
+    if axis is None:
+        return tuple(range(ndim))
+    if isinstance(axis, int):
+        axis = (axis,)
+    return tuple(sorted(a % ndim for a in axis))
+
+
+def _matmul_adjoints(a, b):
+    """return the adjoint rules of a @ b with respect to a and to b
+
+    1-D operands are promoted to matrices the way numpy.matmul does, and any leading axes of the adjoint
+    (e.g. one per seed) are carried through.
+    """
+    a_vec = np.ndim(a) == 1
+    b_vec = np.ndim(b) == 1
+    a_mat = a[np.newaxis, :] if a_vec else a
+    b_mat = b[:, np.newaxis] if b_vec else b
+
+    def as_matrix(grad):
+        grad = np.asarray(grad)
+        if b_vec:
+            grad = grad[..., np.newaxis]
+        if a_vec:
+            grad = np.expand_dims(grad, -2)
+        return grad
+
+    def adjoint_a(grad):
+        grad_a = as_matrix(grad) @ np.swapaxes(b_mat, -1, -2)
+        return grad_a[..., 0, :] if a_vec else grad_a
+
+    def adjoint_b(grad):
+        grad_b = np.swapaxes(a_mat, -1, -2) @ as_matrix(grad)
+        return grad_b[..., 0] if b_vec else grad_b
+
+    return adjoint_a, adjoint_b
+
+
+def _seed(rnode, seed):
+    """return the seed adjoint for rnode, ones by default"""
+    if seed is None:
+        seed = 1
+    if isinstance(rnode._val, np.ndarray):
+        return np.broadcast_to(np.asarray(seed, dtype=float), rnode._val.shape).copy()
+    return seed
+
+
+def _check_retained(order):
+    """raise ValueError if a node of order had its edges released by backward(retain_graph=False)"""
+    if any(rnode._released for rnode in order):
+        raise ValueError("The graph was released by backward(retain_graph=False) and cannot be differentiated "
+                         "again")
+
+
+def backward(rnodes, seeds=None, retain_graph=True):
+    """push seeded adjoints from several nodes back to every node they depend on in one sweep
+
+    Parameters:
+    rnodes: list of Rnode objects, usually outputs of the function
+    seeds: list with the adjoint of each node (None for ones), ones for every node by default
+    retain_graph: if False, release the edges of each node once its adjoint has been pushed to its parents
+
+    Notes:
+        Afterwards grad_value of every node holds the sum over the seeded nodes of seed times the
+        derivative of that node, i.e. a vector-Jacobian product.
+    """
+    order = topological_order(rnodes)
+    _check_retained(order)
+    if seeds is None:
+        seeds = [None] * len(rnodes)
+    for rnode in order:
+        rnode.grad_value = 0
+    for rnode, seed in zip(rnodes, seeds):
+        rnode.grad_value += _seed(rnode, seed)
+    for rnode in reversed(order):
+        for weight, parent in rnode._parents:
+            grad = _weighted(weight, rnode.grad_value)
+            if isinstance(grad, np.ndarray) or isinstance(parent._val, np.ndarray):
+                grad = unbroadcast(grad, np.shape(parent._val))
+            parent.grad_value += grad
+        if not retain_graph:
+            if rnode._parents:
+                rnode._released = True
+            rnode._parents.clear()
+            rnode._children.clear()
+
+
 class Rnode:
+    __slots__ = ('_val', 'grad_value', '_children', '_parents', '_released')
+    __array_ufunc__ = None
+
     def __init__(self, val):
         """Constructor for Node for Reverse Automatic Differentiaton.
 
         Parameters
-        val : int/float
-            The value of the node
+        val : int/float/list/numpy array
+            The value of the node. Array values are combined elementwise with numpy broadcasting
         """
+        if isinstance(val, list):
+            val = np.array(val, dtype=float)
+        elif isinstance(val, np.ndarray) and val.dtype.kind in 'biu':
+            val = val.astype(float)
 
         self._val = val
         self.grad_value = None
         self._children = []
+        self._parents = []
+        self._released = False
+
+
+    def _link(self, weight, z):
+        """Record the edge from this node to the node z it was used to compute
+
+        The edge and its weight are stored once, in z._parents. This node only keeps a reference to z in
+        _children (once per child, even when z uses it twice as in x * x) so that grad() can pull from it.
+
+        Parameters:
+        weight:
+            The local partial derivative of z with respect to this node, or a function mapping the
+            adjoint of z to the adjoint contribution for this node (for operations that are not elementwise)
+        z:
+            Rnode object computed from this node
+        """
+        z._parents.append((weight, self))
+        if not self._children or self._children[-1] is not z:
+            self._children.append(z)
+
+
+    def _unary(self, val, partial):
+        """Create the result of an elementary function applied to this node
+
+        Parameters:
+        val: value of the result
+        partial: derivative of the result with respect to this node
+
+        Returns:
+        A new Rnode linked to this node
+        """
+        z = Rnode(val)
+        self._link(partial, z)
+        return z
 
 
     def grad(self):
@@ -30,10 +223,52 @@ class Rnode:
             See test files for examples.
         """
         if self.grad_value is None:
-            self.grad_value = sum(weight * rnode.grad() for weight, rnode in self._children)
+            self.grad_value = sum(unbroadcast(_weighted(weight, rnode.grad()), np.shape(self._val))
+                                  for rnode in self._children for weight, parent in rnode._parents if parent is self)
         return self.grad_value
 
 
+    def _topological_order(self):
+        """return every node this node depends on, ordered so that each node comes after its parents"""
+        return topological_order([self])
+
+
+    def backward(self, seed=None, retain_graph=True):
+        """compute the gradient of this node with respect to every node it depends on in one sweep
+
+        Parameters:
+        self:
+            Rnode object, usually the output of the function
+        seed:
+            The adjoint of this node, 1 (or an array of ones for array valued nodes) by default
+        retain_graph:
+            If False, the edges of every node are released as soon as its adjoint has been pushed to its
+            parents, so the graph can be garbage collected while the inputs are still in use. The
+            computed grad_value of every node is kept, but the graph can no longer be differentiated:
+            calling backward() again on this node, on another computed node of the graph, or on a node
+            computed from it afterwards raises ValueError.
+
+        Notes:
+            The graph is ordered once and adjoints are pushed from this node to its parents, so
+            grad_value does not need to be set by hand. Afterwards grad() (or grad_value) on any
+            input returns its derivative. For an array valued node, the derivative of the sum of its
+            elements is computed. Calling backward() again, with another seed or on another output of
+            the same graph, recomputes the gradients from scratch.
+        """
+        backward([self], [seed], retain_graph)
+
+
+    def zero_grad(self):
+        """reset the gradient stored on this node and on every node it depends on
+
+        Notes:
+            Call this on the previous output before seeding another output by hand and using grad(),
+            since grad() reuses gradients it has already computed.
+        """
+        for rnode in self._topological_order():
+            rnode.grad_value = None
+
+
     @property
     def val(self):
         return self._val
@@ -52,17 +287,17 @@ class Rnode:
         """
         try:
             z = Rnode(self._val ** other._val)
-            self._children.append(( other._val * self._val ** (other._val - 1), z))
-            other._children.append((self._val ** other._val * np.log(self._val), z))
+            self._link(other._val * self._val ** (other._val - 1), z)
+            other._link(self._val ** other._val * np.log(self._val), z)
         except AttributeError:
             z = Rnode(self._val ** other)
-            self._children.append((other * self._val ** (other - 1), z))
+            self._link(other * self._val ** (other - 1), z)
         return z
 
 
     def __rpow__(self, other):
         z = Rnode(other ** self._val)
-        self._children.append(( np.log(other) * other ** (self._val), z))
+        self._link(np.log(other) * other ** (self._val), z)
         return z
 
 
@@ -74,7 +309,7 @@ class Rnode:
             A new Rnode object where the value is negated
         """
         z = Rnode(-self._val)
-        self._children.append((-1, z))
+        self._link(-1, z)
         return z
 
 
@@ -88,12 +323,14 @@ class Rnode:
         Returns:
             A new Rnode object where the value is the value of self added with the value of other
         """
-        if isinstance(other, (int, float)):
-            return Rnode(self._val + other)
+        if not isinstance(other, Rnode):
+            z = Rnode(self._val + other)
+            self._link(1, z)
+            return z
         else:
             z = Rnode(self._val + other._val)
-            self._children.append((np.ones(self._val), z))
-            other._children.append((np.ones(self._val), z))
+            self._link(1, z)
+            other._link(1, z)
             return z
 
 
@@ -112,17 +349,21 @@ class Rnode:
             A new Rnode object where the value is the value of self minus the value of other
         """
 
-        if isinstance(other, (int, float)):
-            return Rnode(self._val - other)
+        if not isinstance(other, Rnode):
+            z = Rnode(self._val - other)
+            self._link(1, z)
+            return z
         else:
             z = Rnode(self._val - other._val)
-            self._children.append((np.ones(self._val), z))
-            other._children.append((np.ones(self._val), z))
+            self._link(1, z)
+            other._link(-1, z)
             return z
 
 
     def __rsub__(self, other):
-        return Rnode(other - self._val)
+        z = Rnode(other - self._val)
+        self._link(-1, z)
+        return z
 
         
     def __mul__(self, other):
@@ -136,12 +377,14 @@ class Rnode:
         For Rnodes, a new Rnode object where the self and other Rnodes are multiplied according to the product rule
         For values, a new Rnode object where the self and other values are multiplied according to the product rule
         """
-        if isinstance(other, (int, float)):
-            return Rnode(self._val * other)
+        if not isinstance(other, Rnode):
+            z = Rnode(self._val * other)
+            self._link(other, z)
+            return z
         else:
             z = Rnode(self._val * other._val)
-            self._children.append((other._val, z))
-            other._children.append((self._val, z))
+            self._link(other._val, z)
+            other._link(self._val, z)
             return z
 
     
@@ -165,3 +408,130 @@ class Rnode:
 
     def __rtruediv__(self, other):
         return other * (self ** (-1))
+
+
+    def __matmul__(self, other):
+        """
+        Overloads matrix multiplication
+
+        Parameters:
+        other: numpy array or Rnode to multiply with, following numpy.matmul
+
+        Returns:
+        A new Rnode object holding the matrix product, recorded as a single operation
+        """
+        other_val = other._val if isinstance(other, Rnode) else np.asarray(other)
+        z = Rnode(self._val @ other_val)
+        adjoint_self, adjoint_other = _matmul_adjoints(self._val, other_val)
+        self._link(adjoint_self, z)
+        if isinstance(other, Rnode):
+            other._link(adjoint_other, z)
+        return z
+
+
+    def __rmatmul__(self, other):
+        other = np.asarray(other)
+        z = Rnode(other @ self._val)
+        self._link(_matmul_adjoints(other, self._val)[1], z)
+        return z
+
+
+    def dot(self, other):
+        """
+        Dot product of vectors or matrix product of matrices
+
+        Parameters:
+        other: numpy array or Rnode with one or two dimensions
+
+        Returns:
+        A new Rnode object holding the product
+        """
+        return self @ other
+
+
+    def sum(self, axis=None):
+        """
+        Sum of the elements
+
+        Parameters:
+        axis: None, int or tuple of ints, the axes to sum over (all of them by default)
+
+        Returns:
+        A new Rnode object holding the sum
+        """
+        shape = np.shape(self._val)
+        axes = _reduced_axes(len(shape), axis)
+        z = Rnode(np.sum(self._val, axis=axes))
+
+        def adjoint(grad):
+            grad = np.asarray(grad)
+            lead = grad.ndim - (len(shape) - len(axes))
+            grad = np.expand_dims(grad, tuple(lead + a for a in axes))
+            return np.broadcast_to(grad, grad.shape[:lead] + shape)
+
+        self._link(adjoint, z)
+        return z
+
+
+    def mean(self, axis=None):
+        """
+        Mean of the elements
+
+        Parameters:
+        axis: None, int or tuple of ints, the axes to average over (all of them by default)
+
+        Returns:
+        A new Rnode object holding the mean
+        """
+        shape = np.shape(self._val)
+        count = int(np.prod([shape[a] for a in _reduced_axes(len(shape), axis)]))
+        return self.sum(axis) * (1 / count)
+
+
+    def transpose(self, axes=None):
+        """
+        Permute the axes (reverse them by default), following numpy.transpose
+
+        Returns:
+        A new Rnode object holding the transposed value
+        """
+        ndim = np.ndim(self._val)
+        axes = tuple(range(ndim))[::-1] if axes is None else tuple(a % ndim for a in axes)
+        inverse = tuple(np.argsort(axes))
+        z = Rnode(np.transpose(self._val, axes))
+
+        def adjoint(grad):
+            lead = np.ndim(grad) - ndim
+            return np.transpose(grad, tuple(range(lead)) + tuple(lead + a for a in inverse))
+
+        self._link(adjoint, z)
+        return z
+
+
+    @property
+    def T(self):
+        return self.transpose()
+
+
+    def reshape(self, *shape):
+        """
+        Give the value a new shape, following numpy.reshape
+
+        Parameters:
+        shape: int or tuple of ints, the new shape
+
+        Returns:
+        A new Rnode object holding the reshaped value
+        """
+        if len(shape) == 1 and isinstance(shape[0], (tuple, list)):
+            shape = tuple(shape[0])
+        old_shape = np.shape(self._val)
+        z = Rnode(np.reshape(self._val, shape))
+        ndim = np.ndim(z._val)
+
+        def adjoint(grad):
+            lead = np.ndim(grad) - ndim
+            return np.reshape(grad, np.shape(grad)[:lead] + old_shape)
+
+        self._link(adjoint, z)
+        return z
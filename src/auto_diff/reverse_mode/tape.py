@@ -0,0 +1,305 @@
+import struct
+import numpy as np
+
+"""Array-backed Wengert tape for reverse mode"""
+
+CONST = 0
+VAR = 1
+ADD = 2
+SUB = 3
+MUL = 4
+NEG = 5
+POW = 6
+TAN = 7
+ARCTAN = 8
+TANH = 9
+LN = 10
+LOG = 11
+SQRT = 12
+SIN = 13
+ARCSIN = 14
+SINH = 15
+COS = 16
+ARCCOS = 17
+COSH = 18
+EXP = 19
+
+OPCODES = {
+    'tan': TAN,
+    'arctan': ARCTAN,
+    'tanh': TANH,
+    'ln': LN,
+    'log': LOG,
+    'sqrt': SQRT,
+    'sin': SIN,
+    'arcsin': ARCSIN,
+    'sinh': SINH,
+    'cos': COS,
+    'arccos': ARCCOS,
+    'cosh': COSH,
+    'exp': EXP,
+}
+
+
+class Tape:
+    def __init__(self, capacity=1024, cse=False):
+        """Constructor for the tape that records reverse mode operations in contiguous arrays.
+
+        Every operation is one entry holding its opcode, the indices of up to two parent entries
+        (-1 when unused), the local partial derivative with respect to each parent and its value.
+        The arrays double in size whenever they fill up.
+
+        Parameters
+        capacity : int
+            The number of entries to preallocate
+        cse : bool
+            If True, the tape hash-conses its entries: recording an operation that is already on the tape
+            with the same operands (or a constant with the same value) returns the existing entry, so
+            common subexpressions are stored, replayed and swept backward only once
+        """
+        capacity = max(int(capacity), 1)
+        self._ops = np.empty(capacity, dtype=np.int8)
+        self._parents = np.empty((capacity, 2), dtype=np.int64)
+        self._partials = np.empty((capacity, 2))
+        self._vals = np.empty(capacity)
+        self._size = 0
+        self._adjoints = None
+        self._entries = {} if cse else None
+        self._eliminated = 0
+
+
+    def __len__(self):
+        return self._size
+
+
+    @property
+    def capacity(self):
+        return len(self._ops)
+
+
+    @property
+    def eliminated(self):
+        """The number of recorded operations (constants excluded) that were replaced by an existing entry"""
+        return self._eliminated
+
+
+    def _grow(self):
+        """Double the capacity of every array on the tape"""
+        capacity = 2 * self.capacity
+        self._ops = np.resize(self._ops, capacity)
+        self._parents = np.resize(self._parents, (capacity, 2))
+        self._partials = np.resize(self._partials, (capacity, 2))
+        self._vals = np.resize(self._vals, capacity)
+
+
+    def record(self, op, val, parent_0=-1, partial_0=0.0, parent_1=-1, partial_1=0.0):
+        """Append an entry to the tape
+
+        Parameters:
+        op: opcode of the operation
+        val: value of the result
+        parent_0, parent_1: indices of the operands, -1 when unused
+        partial_0, partial_1: local partial derivatives with respect to the operands
+
+        Returns:
+        The index of the new entry, or of the identical entry already on the tape when hash-consing
+        """
+        if self._entries is not None and op != VAR:
+            if op == CONST:
+                # the bit pattern keeps -0.0 apart from 0.0 and merges equal nans
+                key = (CONST, struct.pack('d', val))
+            elif op in (ADD, MUL) and parent_1 < parent_0:
+                key = (op, parent_1, parent_0)
+            else:
+                key = (op, parent_0, parent_1)
+            index = self._entries.get(key)
+            if index is not None:
+                if op != CONST:
+                    self._eliminated += 1
+                return index
+            self._entries[key] = self._size
+        if self._size == self.capacity:
+            self._grow()
+        i = self._size
+        self._ops[i] = op
+        self._parents[i, 0] = parent_0
+        self._parents[i, 1] = parent_1
+        self._partials[i, 0] = partial_0
+        self._partials[i, 1] = partial_1
+        self._vals[i] = val
+        self._size = i + 1
+        return i
+
+
+    def var(self, val):
+        """Create an input variable on the tape
+
+        Parameters:
+        val: int/float value of the variable
+
+        Returns:
+        A Tnode handle for the variable
+        """
+        return Tnode(self, self.record(VAR, val))
+
+
+    def const(self, val):
+        """Record a constant and return its index"""
+        return self.record(CONST, val)
+
+
+    def backward(self, output):
+        """Compute the adjoint of every entry with respect to the entry at index output
+
+        The sweep is a single loop from the output back to the start of the tape.
+
+        Parameters:
+        output: index of the output entry
+
+        Returns:
+        A numpy array holding the adjoint of every entry
+        """
+        n = self._size
+        parents = self._parents[:output + 1].tolist()
+        partials = self._partials[:output + 1].tolist()
+        adjoints = [0.0] * n
+        adjoints[output] = 1.0
+        for i in range(output, -1, -1):
+            adjoint = adjoints[i]
+            if adjoint:
+                parent_0, parent_1 = parents[i]
+                partial_0, partial_1 = partials[i]
+                if parent_0 >= 0:
+                    adjoints[parent_0] += partial_0 * adjoint
+                if parent_1 >= 0:
+                    adjoints[parent_1] += partial_1 * adjoint
+        self._adjoints = np.array(adjoints)
+        return self._adjoints
+
+
+class Tnode:
+    __slots__ = ('_tape', '_index')
+
+    def __init__(self, tape, index):
+        """Constructor for the handle to an entry on a Tape.
+
+        Parameters
+        tape : Tape
+            The tape the entry lives on
+        index : int
+            The index of the entry
+        """
+        self._tape = tape
+        self._index = index
+
+
+    @property
+    def val(self):
+        return self._tape._vals[self._index]
+
+
+    @property
+    def _val(self):
+        return self._tape._vals[self._index]
+
+
+    @property
+    def tape(self):
+        return self._tape
+
+
+    def backward(self):
+        """compute the gradient of this node with respect to every entry recorded before it"""
+        self._tape.backward(self._index)
+
+
+    def grad(self):
+        """return the gradient computed by the last backward() on this node's tape
+
+        Returns:
+            The float value of the gradient
+        """
+        if self._tape._adjoints is None:
+            raise ValueError("backward() must be called on the output before grad()")
+        return self._tape._adjoints[self._index]
+
+
+    def _operand(self, other):
+        """Return the tape index and value of the other operand, recording it as a constant if needed"""
+        if isinstance(other, Tnode):
+            if other._tape is not self._tape:
+                raise ValueError("Tnodes must be recorded on the same tape")
+            return other._index, other._val
+        return self._tape.const(other), other
+
+
+    def _unary(self, op, val, partial, arg=None):
+        """Record the result of an elementary function applied to this node
+
+        Parameters:
+        op: name of the elementary function
+        val: value of the result
+        partial: derivative of the result with respect to this node
+        arg: optional constant second argument of the function (e.g. the base of log)
+
+        Returns:
+        A new Tnode for the result
+        """
+        if arg is None:
+            index = self._tape.record(OPCODES[op], val, self._index, partial)
+        else:
+            index = self._tape.record(OPCODES[op], val, self._index, partial, self._tape.const(arg))
+        return Tnode(self._tape, index)
+
+
+    def __neg__(self):
+        return Tnode(self._tape, self._tape.record(NEG, -self._val, self._index, -1.0))
+
+
+    def __add__(self, other):
+        index, val = self._operand(other)
+        return Tnode(self._tape, self._tape.record(ADD, self._val + val, self._index, 1.0, index, 1.0))
+
+
+    def __radd__(self, other):
+        return self + other
+
+
+    def __sub__(self, other):
+        index, val = self._operand(other)
+        return Tnode(self._tape, self._tape.record(SUB, self._val - val, self._index, 1.0, index, -1.0))
+
+
+    def __rsub__(self, other):
+        index, val = self._operand(other)
+        return Tnode(self._tape, self._tape.record(SUB, val - self._val, index, 1.0, self._index, -1.0))
+
+
+    def __mul__(self, other):
+        index, val = self._operand(other)
+        return Tnode(self._tape, self._tape.record(MUL, self._val * val, self._index, val, index, self._val))
+
+
+    def __rmul__(self, other):
+        return self * other
+
+
+    def __truediv__(self, other):
+        return self * (other ** (-1))
+
+
+    def __rtruediv__(self, other):
+        return other * (self ** (-1))
+
+
+    def __pow__(self, other):
+        index, val = self._operand(other)
+        z = self._val ** val
+        partial_1 = z * np.log(self._val) if isinstance(other, Tnode) else 0.0
+        return Tnode(self._tape, self._tape.record(POW, z, self._index, val * self._val ** (val - 1), index, partial_1))
+
+
+    def __rpow__(self, other):
+        index, val = self._operand(other)
+        z = val ** self._val
+        return Tnode(self._tape, self._tape.record(POW, z, index, 0.0, self._index, z * np.log(val)))
@@ -0,0 +1,71 @@
+import numpy as np
+from src.auto_diff.reverse_mode.rnode import _check_retained, topological_order, unbroadcast
+
+class Vector_Rn:
+    def __init__(self, function):
+        """Constructor for the Vector_Rn class that enables vector valued reverse mode automatic differentiation
+
+        Parameters
+        ==========
+        function_list : list
+            list of output Rnodes, all recorded on one forward graph
+        """
+        self._function_list = function
+
+    def val_by_var(self):
+        '''
+        Returns list of values
+        '''
+        return [function.val for function in self._function_list]
+
+    def get_vals(self):
+        '''
+        Returns an np array of values, array valued outputs are flattened in order
+        '''
+        return np.concatenate([np.ravel(val) for val in self.val_by_var()])
+
+    def adjoints(self, seeds=None):
+        '''
+        Runs one reverse sweep seeded with the identity matrix, so every node carries the derivatives of
+        all (flattened) outputs at once
+
+        seeds: optional (number of seeds x number of flattened outputs) array replacing the identity, so
+        every node carries the vector-Jacobian products of the rows of seeds instead
+
+        Returns a dictionary mapping each node to the array of derivatives of the outputs with respect to it,
+        with one leading row per output (or per row of seeds)
+        '''
+        sizes = [np.size(val) for val in self.val_by_var()]
+        seeds = np.eye(sum(sizes)) if seeds is None else np.asarray(seeds, dtype=float).reshape(-1, sum(sizes))
+        adjoint = {}
+        offset = 0
+        for func, size in zip(self._function_list, sizes):
+            seed = seeds[:, offset:offset + size].reshape((len(seeds),) + np.shape(func.val))
+            adjoint[func] = adjoint.get(func, 0) + seed
+            offset += size
+
+        order = topological_order(self._function_list)
+        _check_retained(order)
+        for rnode in reversed(order):
+            seed = adjoint.get(rnode)
+            if seed is None:
+                continue
+            for weight, parent in rnode._parents:
+                contribution = unbroadcast(weight(seed) if callable(weight) else weight * seed, np.shape(parent._val), 1)
+                adjoint[parent] = adjoint.get(parent, 0) + contribution
+        return adjoint
+
+    def get_deriv(self, inputs):
+        '''
+        Returns the jacobian matrix with one row per output and one column per input Rnode
+        (array valued outputs and inputs contribute one row or column per element)
+        '''
+        adjoint = self.adjoints()
+        num_func = int(sum(np.size(val) for val in self.val_by_var()))
+        columns = []
+        for var in inputs:
+            if var in adjoint:
+                columns.append(adjoint[var].reshape(num_func, -1))
+            else:
+                columns.append(np.zeros((num_func, np.size(var.val))))
+        return np.hstack(columns)
@@ -0,0 +1,26 @@
+from benchmarks.run import CASES, compare, run
+
+
+def test_compare():
+    rows, regressions = compare({'a': 2.0, 'b': 1.0, 'c': 1.0}, {'a': 1.0, 'b': 1.0}, threshold=1.5)
+    assert [row[0] for row in rows] == ['a', 'b']
+    assert rows[0][3] == 2.0
+    assert regressions == ['a']
+
+
+def test_run_quick():
+    results = run(['rosenbrock_reverse_codegen', 'ode_rollout_checkpoint'], quick=True, min_time=0, repeats=1,
+                  verbose=False)
+    assert set(results) == {'rosenbrock_reverse_codegen[n=2]', 'ode_rollout_checkpoint[steps=100]'}
+    assert all(t > 0 for t in results.values())
+
+
+def test_cases_run():
+    for name, (setup, sizes, dimension) in CASES.items():
+        setup(sizes[0])()
+
+
+if __name__ == '__main__':
+    test_compare()
+    test_run_quick()
+    test_cases_run()
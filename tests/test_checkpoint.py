@@ -0,0 +1,62 @@
+import pytest
+from src.auto_diff.reverse_mode.rnode import Rnode
+from src.auto_diff.reverse_mode.checkpoint import checkpoint_grad
+import src.auto_diff.reverse_mode.elem as elem
+import numpy as np
+
+def step(state):
+    x, v, k = state
+    return [x + 0.01 * v, v - 0.01 * k * elem.sin(x), k]
+
+
+def loss(state):
+    x, v, k = state
+    return x ** 2 + 0.5 * v ** 2
+
+
+def full_graph_grad(x0, n_steps):
+    leaves = [Rnode(v) for v in x0]
+    state = leaves
+    for _ in range(n_steps):
+        state = step(state)
+    res = loss(state)
+    res.backward()
+    return res.val, np.array([leaf.grad() for leaf in leaves])
+
+
+def test_uniform():
+    x0 = [1.0, 0.0, 2.0]
+    expected_val, expected_grad = full_graph_grad(x0, 100)
+    for n_checkpoints in [None, 1, 7, 100]:
+        val, grad = checkpoint_grad(step, x0, 100, loss, n_checkpoints=n_checkpoints)
+        assert np.isclose(val, expected_val)
+        assert np.allclose(grad, expected_grad)
+
+
+def test_bisection():
+    x0 = [1.0, 0.0, 2.0]
+    expected_val, expected_grad = full_graph_grad(x0, 37)
+    val, grad = checkpoint_grad(step, x0, 37, loss, schedule='bisection')
+    assert np.isclose(val, expected_val)
+    assert np.allclose(grad, expected_grad)
+
+
+def test_no_steps():
+    val, grad = checkpoint_grad(step, [1.0, 2.0, 3.0], 0, loss)
+    assert val == 3.0
+    assert np.array_equal(grad, np.array([2.0, 2.0, 0]))
+
+
+def test_errors():
+    with pytest.raises(ValueError):
+        checkpoint_grad(step, [1.0, 0.0, 2.0], 10, loss, schedule='revolve')
+
+    with pytest.raises(ValueError):
+        checkpoint_grad(step, [1.0, 0.0, 2.0], 10, loss, n_checkpoints=0)
+
+
+if __name__ == '__main__':
+    test_uniform()
+    test_bisection()
+    test_no_steps()
+    test_errors()
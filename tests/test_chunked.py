@@ -0,0 +1,47 @@
+import pytest
+from src.auto_diff.forward_mode.chunked import gradient, jacobian
+import src.auto_diff.forward_mode.elem as elem
+import numpy as np
+
+def rosenbrock(*x):
+    total = 0
+    for i in range(len(x) - 1):
+        total = total + 100 * (x[i + 1] - x[i] ** 2) ** 2 + (1 - x[i]) ** 2
+    return total
+
+
+def rosenbrock_grad(x):
+    grad = np.zeros(len(x))
+    grad[:-1] += -400 * x[:-1] * (x[1:] - x[:-1] ** 2) - 2 * (1 - x[:-1])
+    grad[1:] += 200 * (x[1:] - x[:-1] ** 2)
+    return grad
+
+
+def test_gradient_chunk_sizes():
+    x = np.linspace(-1, 1, 11)
+    expected = rosenbrock_grad(x)
+    for chunk_size in [1, 3, 4, 11, 20]:
+        assert np.allclose(gradient(rosenbrock, list(x), chunk_size), expected)
+
+
+def test_gradient_points():
+    x = [np.array([0.5, 1.0]), np.array([2.0, -1.0]), 0.3]
+    grad = gradient(rosenbrock, x, chunk_size=2)
+    assert grad.shape == (2, 3)
+    assert np.allclose(grad[0], rosenbrock_grad(np.array([0.5, 2.0, 0.3])))
+    assert np.allclose(grad[1], rosenbrock_grad(np.array([1.0, -1.0, 0.3])))
+
+
+def test_jacobian():
+    f = lambda x, y, z: [x * y, elem.sin(z) + x, 4.0]
+    jac = jacobian(f, [2.0, 3.0, 0.5], chunk_size=2)
+    assert np.allclose(jac, np.array([[3.0, 2.0, 0.0], [1.0, 0.0, np.cos(0.5)], [0.0, 0.0, 0.0]]))
+
+    with pytest.raises(ValueError):
+        jacobian(f, [2.0, 3.0, 0.5], chunk_size=0)
+
+
+if __name__ == '__main__':
+    test_gradient_chunk_sizes()
+    test_gradient_points()
+    test_jacobian()
@@ -0,0 +1,110 @@
+import pytest
+from src.auto_diff.reverse_mode.codegen import GeneratedFunction, codegen, generate_source
+from src.auto_diff.reverse_mode.compiled import trace
+import src.auto_diff.reverse_mode.elem as elem
+import numpy as np
+
+def f(x, y):
+    return x * y + elem.sin(x) ** 2 - 3 * elem.exp(y / x) + elem.log(y, 2) + elem.sqrt(x) * elem.arctan(y)
+
+
+def f_grad(x, y):
+    return np.array([
+        y + 2 * np.sin(x) * np.cos(x) + 3 * np.exp(y / x) * y / x ** 2 + np.arctan(y) / (2 * np.sqrt(x)),
+        x - 3 * np.exp(y / x) / x + 1 / (y * np.log(2)) + np.sqrt(x) / (1 + y ** 2)])
+
+
+def test_gradient():
+    g = codegen(f, 1.0, 2.0)
+    for x, y in [(1.0, 2.0), (0.5, 3.0), (2.5, 0.1)]:
+        value, grad = g.gradient(x, y)
+        assert np.isclose(value, x * y + np.sin(x) ** 2 - 3 * np.exp(y / x) + np.log2(y) + np.sqrt(x) * np.arctan(y))
+        assert np.allclose(grad, f_grad(x, y))
+        assert np.isclose(g(x, y), value)
+
+
+def test_matches_compiled():
+    funcs = [
+        lambda x, y: elem.tan(x) * elem.tanh(y) - elem.cosh(x) / elem.sinh(y),
+        lambda x, y: elem.arcsin(x / 2) + elem.arccos(y / 3) - elem.ln(x) * elem.cos(y),
+        lambda x, y: x ** y + 2 ** x - (-x) ** 3,
+    ]
+    for func in funcs:
+        g = codegen(func, 0.7, 1.2)
+        c = trace(func, 0.7, 1.2)
+        for x, y in [(0.7, 1.2), (1.3, 0.4)]:
+            value, grad = g.gradient(x, y)
+            expected_value, expected_grad = c.gradient(x, y)
+            assert np.isclose(value, expected_value)
+            assert np.allclose(grad, expected_grad)
+
+
+def test_points():
+    g = codegen(f, 1.0, 2.0)
+    x = np.array([1.0, 0.5, 2.5])
+    values, grads = g.gradient(x, 2.0)
+    assert grads.shape == (2, 3)
+    assert np.allclose(grads, f_grad(x, 2.0))
+
+    values, grads = codegen(lambda x, y: x + 1, 1.0, 2.0).gradient(x, 2.0)
+    assert np.allclose(values, x + 1)
+    assert np.allclose(grads, [[1, 1, 1], [0, 0, 0]])
+
+
+def test_domain_edges():
+    for function, x in [(elem.sqrt, 0.0), (elem.ln, 0.0), (elem.arcsin, 1.0), (elem.arccos, -1.0)]:
+        g = codegen(lambda x: function(x), 0.5)
+        assert np.isinf(g.gradient(x)[1][0])
+        assert np.isinf(g.gradient(np.array([x]))[1][0, 0])
+
+
+def test_source():
+    source = generate_source(trace(lambda x, y: x ** 2 * 3 + y, 1.0, 2.0), 'square')
+    assert source.startswith('def square(x0, x1):')
+    assert 'power' not in source
+    assert 'log' not in source
+
+
+target = 1.0
+
+
+def test_retrace():
+    def objective(x):
+        return (x - target) ** 2
+
+    global target
+    assert codegen(objective, 0.0).gradient(0.0)[1][0] == -2.0
+    target = 5.0
+    assert codegen(objective, 0.0).gradient(0.0)[1][0] == -10.0
+    target = 1.0
+
+    absolute = lambda x: x if x.val > 0 else -x
+    assert codegen(absolute, 2.0).gradient(-3.0)[1][0] == 1.0
+    assert codegen(absolute, -2.0).gradient(-3.0)[1][0] == -1.0
+
+
+def test_constants():
+    g = codegen(lambda x: x * float('inf') + x * float('nan') - 2.0 ** x + (-0.5) ** 2 * x, 1.0)
+    value, grad = g.gradient(1.0)
+    assert np.isnan(value) and np.isnan(grad[0])
+    assert np.isclose(codegen(lambda x: x * -0.5 + (-x) ** 2, 1.0)(2.0), 3.0)
+    assert codegen(elem.sqrt, 4.0).gradient(4.0)[1][0] == 0.25
+
+
+def test_errors():
+    assert isinstance(codegen(f, 1.0, 2.0), GeneratedFunction)
+    with pytest.raises(ValueError):
+        codegen(f, 1.0, 2.0).gradient(1.0)
+    with pytest.raises(ValueError):
+        GeneratedFunction(trace(f, 1.0, 2.0), 'sqrt')
+
+
+if __name__ == '__main__':
+    test_gradient()
+    test_matches_compiled()
+    test_points()
+    test_domain_edges()
+    test_source()
+    test_retrace()
+    test_constants()
+    test_errors()
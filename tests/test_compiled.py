@@ -0,0 +1,155 @@
+import pytest
+from src.auto_diff.reverse_mode.rnode import Rnode
+from src.auto_diff.reverse_mode.compiled import trace, hvp
+import src.auto_diff.reverse_mode.elem as elem
+import numpy as np
+
+def f(x, y):
+    return x * y ** 2 + elem.sin(x) / elem.sqrt(y) - elem.log(y, 10) + 2 ** x - elem.exp(-x)
+
+
+def rnode_gradient(x, y):
+    x, y = Rnode(x), Rnode(y)
+    res = f(x, y)
+    res.backward()
+    return res.val, np.array([x.grad(), y.grad()])
+
+
+def test_replay_matches_retracing():
+    compiled = trace(f, 1.0, 2.0)
+    for point in [(1.0, 2.0), (0.3, 4.0), (-2.0, 0.5)]:
+        val, grad = compiled.gradient(*point)
+        expected_val, expected_grad = rnode_gradient(*point)
+        assert np.isclose(val, expected_val)
+        assert np.allclose(grad, expected_grad)
+        assert np.isclose(compiled(*point), expected_val)
+
+
+def test_replay_batch():
+    compiled = trace(f, 1.0, 2.0)
+    xs = np.array([1.0, 0.3, -2.0])
+    ys = np.array([2.0, 4.0, 0.5])
+    vals, grads = compiled.gradient(xs, ys)
+
+    assert vals.shape == (3,)
+    assert grads.shape == (2, 3)
+    for i in range(3):
+        expected_val, expected_grad = rnode_gradient(xs[i], ys[i])
+        assert np.isclose(vals[i], expected_val)
+        assert np.allclose(grads[:, i], expected_grad)
+
+
+def test_shared_subexpression():
+    compiled = trace(lambda x: x * x + x, 3.0)
+    val, grad = compiled.gradient(5.0)
+    assert val == 30.0
+    assert grad[0] == 11.0
+
+    vals, grads = compiled.gradient(np.array([5.0, 1.0]))
+    assert np.array_equal(grads[0], np.array([11.0, 3.0]))
+
+    compiled = trace(lambda x, y: elem.exp(x * y) * (y * x) + elem.exp(x * y), 0.5, 2.0)
+    assert compiled.eliminated == 3
+    val, grad = compiled.gradient(1.0, 3.0)
+    assert np.isclose(val, np.exp(3.0) * 4.0)
+    assert np.allclose(grad, [np.exp(3.0) * (3 * 3.0 + 3 + 3), np.exp(3.0) * (3 * 1.0 + 1 + 1)])
+
+
+def test_returns_input():
+    compiled = trace(lambda x, y: x, 1.0, 2.0)
+    val, grad = compiled.gradient(3.0, 4.0)
+    assert val == 3.0
+    assert np.array_equal(grad, [1.0, 0.0])
+    assert compiled.forward(3.0, 4.0) == 3.0
+
+    vals, grads = compiled.gradient(np.array([3.0, 5.0]), np.array([4.0, 6.0]))
+    assert np.array_equal(vals, [3.0, 5.0])
+    assert np.array_equal(grads, [[1.0, 1.0], [0.0, 0.0]])
+
+    val, grad, h_v = compiled.hvp([3.0, 4.0], [1.0, 1.0])
+    assert val == 3.0
+    assert np.array_equal(grad, [1.0, 0.0])
+    assert np.array_equal(h_v, [0.0, 0.0])
+
+    compiled = trace(lambda x, y: x * 2, 1.0, 2.0)
+    assert np.array_equal(compiled.gradient(3.0, 4.0)[1], [2.0, 0.0])
+
+
+def test_errors():
+    with pytest.raises(TypeError):
+        trace(lambda x: 3.0, 1.0)
+
+    compiled = trace(f, 1.0, 2.0)
+    with pytest.raises(ValueError):
+        compiled.gradient(1.0)
+
+
+def test_domain_edges():
+    # the partials are infinite at the edges of the domains, as when recording
+    for function, x in [(elem.sqrt, 0.0), (elem.ln, 0.0), (elem.arcsin, 1.0), (elem.arccos, -1.0)]:
+        compiled = trace(function, 0.5)
+        grad = compiled.gradient(x)[1]
+        assert np.isinf(grad[0])
+        assert np.isinf(compiled.gradient(np.array([x]))[1][0, 0])
+        assert np.isinf(compiled.hvp([x], [1.0])[1][0])
+
+
+def rosenbrock(*x):
+    total = 0
+    for i in range(len(x) - 1):
+        total = total + 100 * (x[i + 1] - x[i] ** 2) ** 2 + (1 - x[i]) ** 2
+    return total
+
+
+def rosenbrock_hessian(x):
+    n = len(x)
+    hessian = np.zeros((n, n))
+    for i in range(n - 1):
+        hessian[i, i] += 1200 * x[i] ** 2 - 400 * x[i + 1] + 2
+        hessian[i + 1, i + 1] += 200
+        hessian[i, i + 1] -= 400 * x[i]
+        hessian[i + 1, i] -= 400 * x[i]
+    return hessian
+
+
+def test_hvp_rosenbrock():
+    x = [-1.2, 1.0, 0.5, 2.0]
+    v = [0.3, -1.0, 2.0, 0.5]
+    assert np.allclose(hvp(rosenbrock, x, v), rosenbrock_hessian(np.array(x)) @ np.array(v))
+
+    compiled = trace(rosenbrock, *x)
+    val, grad, h_v = compiled.hvp([0.5, 0.2, -0.3, 1.0], [1.0, 0.0, 0.0, 0.0])
+    expected_val, expected_grad = compiled.gradient(0.5, 0.2, -0.3, 1.0)
+    assert np.isclose(val, expected_val)
+    assert np.allclose(grad, expected_grad)
+    assert np.allclose(h_v, rosenbrock_hessian(np.array([0.5, 0.2, -0.3, 1.0]))[:, 0])
+
+
+def test_hvp_elementary():
+    x = [0.5, 1.5]
+    compiled = trace(f, *x)
+    h = 1e-5
+    for v in [[1.0, 0.0], [0.0, 1.0], [0.7, -0.2]]:
+        plus = compiled.gradient(*(np.array(x) + h * np.array(v)))[1]
+        minus = compiled.gradient(*(np.array(x) - h * np.array(v)))[1]
+        assert np.allclose(compiled.hvp(x, v)[2], (plus - minus) / (2 * h), atol=1e-5)
+
+    g = lambda x, y: elem.tan(x) * elem.arcsin(y) + elem.arccos(y) * elem.arctan(x) + elem.tanh(x * y) \
+        + elem.sinh(x) * elem.cosh(y) + elem.ln(x) * elem.cos(y) + x ** y
+    x = [0.4, 0.3]
+    compiled = trace(g, *x)
+    for v in [[1.0, 0.0], [0.0, 1.0]]:
+        plus = compiled.gradient(*(np.array(x) + h * np.array(v)))[1]
+        minus = compiled.gradient(*(np.array(x) - h * np.array(v)))[1]
+        assert np.allclose(compiled.hvp(x, v)[2], (plus - minus) / (2 * h), atol=1e-5)
+
+
+if __name__ == '__main__':
+    test_replay_matches_retracing()
+    test_replay_batch()
+    test_shared_subexpression()
+    test_returns_input()
+    test_errors()
+    test_domain_edges()
+    test_hvp_rosenbrock()
+    test_hvp_elementary()
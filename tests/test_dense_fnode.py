@@ -0,0 +1,88 @@
+import pytest
+from src.auto_diff.forward_mode.fnode import Fnode
+from src.auto_diff.forward_mode.dense_fnode import DenseFnode, VarRegistry
+import src.auto_diff.forward_mode.elem as elem
+import numpy as np
+
+def f(x, y):
+    return (x * y + x ** 2 - y / x + 2 ** x - 3 / y + elem.sin(x * y) * elem.exp(-x)
+            + elem.log(y, 2) ** 3 - elem.sqrt(y) + elem.arctan(x - y) + x ** y - 1 - (2 - y))
+
+
+def test_matches_fnode():
+    registry = VarRegistry()
+    x = DenseFnode([0.5, 1.0, 1.5], 1, 'x', registry)
+    y = DenseFnode([2.0, 3.0, 4.0], 1, 'y', registry)
+    res = f(x, y)
+    expected = f(Fnode([0.5, 1.0, 1.5], 1, 'x'), Fnode([2.0, 3.0, 4.0], 1, 'y'))
+
+    assert np.allclose(res.val, expected.val)
+    assert res.jacobian.shape == (3, 2)
+    assert res.get_vars() == {'x', 'y'}
+    assert np.allclose(res.deriv['x'], expected.deriv['x'])
+    assert np.allclose(res.deriv['y'], expected.deriv['y'])
+    assert np.allclose(res.jacobian[:, registry.index('y')], expected.deriv['y'])
+
+
+def test_elem():
+    registry = VarRegistry()
+    vals = [0.2, 0.4]
+    functions = [elem.sin, elem.cos, elem.tan, elem.arcsin, elem.arccos, elem.arctan, elem.sinh, elem.cosh,
+                 elem.tanh, elem.exp, elem.ln, elem.sqrt, lambda v: elem.log(v, 10),
+                 lambda v: elem.logistic_fn(v, 0, 1, 1)]
+    for function in functions:
+        res = function(DenseFnode(vals, 2, 'x', registry))
+        expected = function(Fnode(vals, 2, 'x'))
+        assert np.allclose(res.val, expected.val)
+        assert np.allclose(res.deriv['x'], expected.deriv['x'])
+
+    with pytest.raises(ValueError):
+        elem.ln(DenseFnode([1.0, -1.0], 1, 'x', registry))
+
+
+def test_late_variable():
+    registry = VarRegistry()
+    x = DenseFnode(2.0, 1, 'x', registry)
+    v_1 = x * 3
+    y = DenseFnode(5.0, 1, 'y', registry)
+    res = v_1 * y
+
+    assert v_1.jacobian.shape == (1, 1)
+    assert np.array_equal(res.jacobian, np.array([[15.0, 6.0]]))
+
+
+def test_separate_registries():
+    x = DenseFnode(2.0, 1, 'x')
+    y = DenseFnode(3.0, 1, 'y', VarRegistry())
+    res = x * y + y
+    assert res.registry is x.registry
+    assert res.get_vars() == {'x', 'y'}
+    assert res.deriv == {'x': 3.0, 'y': 3.0}
+    assert (y * x).deriv == {'y': 2.0, 'x': 3.0}
+
+    for i in range(100):
+        DenseFnode(1.0, 1, 'v{}'.format(i))
+    assert (DenseFnode(1.0, 1, 'a') * DenseFnode(2.0, 1, 'b')).jacobian.shape == (1, 2)
+
+    constant = DenseFnode(5.0)
+    assert constant.jacobian.shape == (1, 0)
+    assert constant.get_vars() == set()
+    assert (x * constant).get_vars() == {'x'}
+    assert (x * 0 + y).get_vars() == {'y'}
+
+
+def test_errors():
+    with pytest.raises(TypeError):
+        DenseFnode(2.0, 1, 'x') + 'y'
+    with pytest.raises(TypeError):
+        DenseFnode('x')
+    with pytest.raises(TypeError):
+        DenseFnode(1.0, {'x': 1})
+
+
+if __name__ == '__main__':
+    test_matches_fnode()
+    test_elem()
+    test_late_variable()
+    test_separate_registries()
+    test_errors()
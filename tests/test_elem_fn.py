@@ -148,7 +148,12 @@ def test_logistic():
     v_1 = elem.logistic_fn(v_0, 1, 1, 1)
 
     assert v_1.val == 1 / (1 + np.exp(-1*(3 -1)))
-    assert v_1.deriv['x'] ==  1 * np.exp(3) / (1+np.exp(3))**2
+    assert np.isclose(v_1.deriv['x'], np.exp(-2) / (1 + np.exp(-2)) ** 2)
+
+    v_2 = elem.logistic_fn(Fnode(1.0, 1.0, 'x'), 2.0, 3.0, 0.5)
+    s = 1 / (1 + np.exp(0.5))
+    assert np.isclose(v_2.val, 3 * s)
+    assert np.isclose(v_2.deriv['x'], 0.5 * 3 * s * (1 - s))
 
 if __name__ == '__main__':
     test_cos()
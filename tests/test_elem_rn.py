@@ -94,6 +94,24 @@ def test_exp():
     assert v_0.grad() == np.exp(10)
 
 
+def test_array():
+    vals = np.array([0.1, 0.4, 0.7])
+    functions = [(elem.sin, np.cos), (elem.cos, lambda x: -np.sin(x)), (elem.tan, lambda x: 1 / np.cos(x) ** 2),
+                 (elem.arcsin, lambda x: 1 / np.sqrt(1 - x ** 2)), (elem.arccos, lambda x: -1 / np.sqrt(1 - x ** 2)),
+                 (elem.arctan, lambda x: 1 / (1 + x ** 2)), (elem.sinh, np.cosh), (elem.cosh, np.sinh),
+                 (elem.tanh, lambda x: 1 / np.cosh(x) ** 2), (elem.exp, np.exp), (elem.ln, lambda x: 1 / x),
+                 (elem.sqrt, lambda x: 0.5 / np.sqrt(x)), (lambda x: elem.log(x, 3), lambda x: 1 / (x * np.log(3)))]
+    for function, deriv in functions:
+        v_0 = Rnode(vals)
+        v_1 = function(v_0)
+        v_1.backward()
+        assert v_1.val.shape == (3,)
+        assert np.allclose(v_0.grad(), deriv(vals))
+
+    with pytest.raises(ValueError):
+        elem.ln(Rnode(np.array([1.0, -1.0])))
+
+
 def test_error():
     with pytest.raises(ValueError):
         v_0 = Rnode(-3)
@@ -122,4 +140,5 @@ if __name__ == '__main__':
     test_arctan()
     test_tanh()
     test_exp()
+    test_array()
     test_error()
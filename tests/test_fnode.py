@@ -73,7 +73,7 @@ def test_rpow():
     v_1 = 3 ** v_0
     try:
         assert v_1.val == 27, "__rpow__ on fnode gave wrong value"
-        assert v_1.deriv['x'] == np.log(3) * 9 * 2, "__rpow__ on fnode gave wrong derivative"
+        assert v_1.deriv['x'] == np.log(3) * 27 * 2, "__rpow__ on fnode gave wrong derivative"
     except AssertionError as e:
         print(e)
         raise AssertionError
@@ -0,0 +1,91 @@
+import pytest
+from src.auto_diff.forward_mode.hessian_fnode import HessianFnode, hessian
+from src.auto_diff.forward_mode.dense_fnode import VarRegistry
+import src.auto_diff.forward_mode.elem as elem
+import numpy as np
+
+def test_elem_second_derivs():
+    funcs = [
+        (elem.tan, lambda v: 2 * np.tan(v) / np.cos(v) ** 2, 0.4),
+        (elem.arctan, lambda v: -2 * v / (1 + v ** 2) ** 2, 0.4),
+        (elem.tanh, lambda v: -2 * np.tanh(v) / np.cosh(v) ** 2, 0.4),
+        (elem.ln, lambda v: -1 / v ** 2, 0.4),
+        (lambda x: elem.log(x, 2), lambda v: -1 / (v ** 2 * np.log(2)), 0.4),
+        (elem.sqrt, lambda v: -0.25 * v ** -1.5, 0.4),
+        (elem.sin, lambda v: -np.sin(v), 0.4),
+        (elem.arcsin, lambda v: v / (1 - v ** 2) ** 1.5, 0.4),
+        (elem.sinh, lambda v: np.sinh(v), 0.4),
+        (elem.cos, lambda v: -np.cos(v), 0.4),
+        (elem.arccos, lambda v: -v / (1 - v ** 2) ** 1.5, 0.4),
+        (elem.cosh, lambda v: np.cosh(v), 0.4),
+        (elem.exp, lambda v: np.exp(v), 0.4),
+        (lambda x: x ** 3.5, lambda v: 3.5 * 2.5 * v ** 1.5, 0.4),
+        (lambda x: 3 ** x, lambda v: np.log(3) ** 2 * 3 ** v, 0.4),
+        (lambda x: 1 / x, lambda v: 2 / v ** 3, 0.4),
+    ]
+    for func, second, v in funcs:
+        x = HessianFnode(v, 1, 'x', VarRegistry())
+        assert np.allclose(func(x).hessian[0, 0, 0], second(v))
+
+
+def test_hessian():
+    def f(x, y, z):
+        return x * y * z + elem.sin(x) * elem.exp(y) + x ** 3 / y + z ** y
+
+    x, y, z = 0.7, 1.3, 2.1
+    value, grad, hess = hessian(f, [x, y, z])
+
+    expected_grad = np.array([
+        y * z + np.cos(x) * np.exp(y) + 3 * x ** 2 / y,
+        x * z + np.sin(x) * np.exp(y) - x ** 3 / y ** 2 + z ** y * np.log(z),
+        x * y + y * z ** (y - 1)])
+    expected_hess = np.array([
+        [-np.sin(x) * np.exp(y) + 6 * x / y, z + np.cos(x) * np.exp(y) - 3 * x ** 2 / y ** 2, y],
+        [0, np.sin(x) * np.exp(y) + 2 * x ** 3 / y ** 3 + z ** y * np.log(z) ** 2,
+         x + z ** (y - 1) + y * z ** (y - 1) * np.log(z)],
+        [0, 0, y * (y - 1) * z ** (y - 2)]])
+    expected_hess = np.triu(expected_hess) + np.triu(expected_hess, 1).T
+
+    assert np.isclose(value, x * y * z + np.sin(x) * np.exp(y) + x ** 3 / y + z ** y)
+    assert np.allclose(grad, expected_grad)
+    assert np.allclose(hess, expected_hess)
+
+
+def test_hessian_points():
+    value, grad, hess = hessian(lambda x, y: x ** 2 * y - 4, [np.array([1.0, 2.0]), np.array([3.0, 5.0])])
+    assert np.allclose(value, [-1, 16])
+    assert np.allclose(grad, [[6, 1], [20, 4]])
+    assert np.allclose(hess, [[[6, 2], [2, 0]], [[10, 4], [4, 0]]])
+
+    value, grad, hess = hessian(lambda x, y: 2.0, [1.0, 2.0])
+    assert value == 2.0
+    assert np.allclose(hess, np.zeros((2, 2)))
+
+
+def test_invalid():
+    x = HessianFnode(1.0, 1, 'x', VarRegistry())
+    with pytest.raises(TypeError):
+        x + 'a'
+    with pytest.raises(TypeError):
+        x * 'a'
+    with pytest.raises(TypeError):
+        x / 'a'
+    with pytest.raises(TypeError):
+        x ** 'a'
+
+
+def test_separate_registries():
+    x = HessianFnode(1.0, 1, 'x', VarRegistry())
+    y = HessianFnode(2.0, 1, 'y', VarRegistry())
+    res = y ** 2 * x
+    assert np.array_equal(res.jacobian, [[4.0, 4.0]])
+    assert res.registry.names == ['y', 'x']
+    assert np.array_equal(res.hessian[0], [[2.0, 4.0], [4.0, 0.0]])
+
+
+if __name__ == '__main__':
+    test_elem_second_derivs()
+    test_hessian()
+    test_hessian_points()
+    test_invalid()
+    test_separate_registries()
@@ -0,0 +1,76 @@
+import pytest
+from src.auto_diff.jacobian import gradient, jacobian, jvp, select_mode, vjp
+import src.auto_diff.forward_mode.elem as elem
+import numpy as np
+
+def f(x, y):
+    return [x * y, elem.sin(x) + y ** 2, elem.exp(x - y), 3.0]
+
+
+def f_jac(x, y):
+    return np.array([[y, x], [np.cos(x), 2 * y], [np.exp(x - y), -np.exp(x - y)], [0, 0]])
+
+
+def g(*x):
+    return sum(elem.ln(1 + v ** 2) for v in x) + x[0] * x[-1]
+
+
+def g_grad(x):
+    grad = 2 * x / (1 + x ** 2)
+    grad[0] += x[-1]
+    grad[-1] += x[0]
+    return grad
+
+
+def test_select_mode():
+    assert select_mode(2, 4) == 'forward'
+    assert select_mode(3, 3) == 'forward'
+    assert select_mode(10, 1) == 'reverse'
+
+
+def test_jacobian_modes():
+    for mode in ['auto', 'forward', 'reverse']:
+        assert np.allclose(jacobian(f, [0.5, 2.0], mode), f_jac(0.5, 2.0))
+
+    with pytest.raises(ValueError):
+        jacobian(f, [0.5, 2.0], 'sideways')
+
+
+def test_gradient_modes():
+    x = np.linspace(-1, 2, 20)
+    for mode in ['auto', 'forward', 'reverse']:
+        assert np.allclose(gradient(g, x, mode), g_grad(x))
+    assert np.allclose(gradient(lambda v: elem.tanh(v), [0.3]), [1 - np.tanh(0.3) ** 2])
+
+
+def test_jvp():
+    jac = f_jac(0.5, 2.0)
+    v = np.array([1.5, -2.0])
+    assert np.allclose(jvp(f, [0.5, 2.0], v), jac @ v)
+
+    vs = np.array([[1.0, 0.0], [0.0, 1.0], [1.5, -2.0]])
+    assert np.allclose(jvp(f, [0.5, 2.0], vs), vs @ jac.T)
+
+    x = np.linspace(-1, 2, 20)
+    assert np.isclose(jvp(g, x, np.ones(20)), g_grad(x).sum())
+
+
+def test_vjp():
+    jac = f_jac(0.5, 2.0)
+    u = np.array([1.0, -1.0, 2.0, 5.0])
+    assert np.allclose(vjp(f, [0.5, 2.0], u), u @ jac)
+
+    us = np.array([[1.0, 0.0, 0.0, 0.0], [1.0, -1.0, 2.0, 5.0]])
+    assert np.allclose(vjp(f, [0.5, 2.0], us), us @ jac)
+
+    x = np.linspace(-1, 2, 20)
+    assert np.allclose(vjp(g, x, 2.0), 2 * g_grad(x))
+    assert np.allclose(vjp(g, x, [[1.0], [3.0]]), [g_grad(x), 3 * g_grad(x)])
+
+
+if __name__ == '__main__':
+    test_select_mode()
+    test_jacobian_modes()
+    test_gradient_modes()
+    test_jvp()
+    test_vjp()
@@ -0,0 +1,45 @@
+import pytest
+from src.auto_diff.optimize.least_squares import levenberg_marquardt, normal_equations
+import src.auto_diff.forward_mode.elem as elem
+import numpy as np
+
+t = np.linspace(0, 2, 5000)
+y = 2.5 * np.exp(-1.3 * t) + 0.5 * np.sin(3 * t)
+
+
+def model(a, b, c, t, y):
+    return a * elem.exp(b * t) + c * elem.sin(3 * t) - y
+
+
+def test_normal_equations():
+    params = [1.0, -0.5, 0.2]
+    jac = np.column_stack([np.exp(-0.5 * t), t * np.exp(-0.5 * t), np.sin(3 * t)])
+    r = np.exp(-0.5 * t) + 0.2 * np.sin(3 * t) - y
+
+    cost, jtj, jtr = normal_equations(model, params, [t, y], chunk_size=777)
+    assert np.isclose(cost, 0.5 * r @ r)
+    assert np.allclose(jtj, jac.T @ jac)
+    assert np.allclose(jtr, jac.T @ r)
+    assert np.isclose(normal_equations(model, params, [t, y], jacobian=False), cost)
+
+
+def test_levenberg_marquardt():
+    result = levenberg_marquardt(model, [1.0, -0.5, 0.2], [t, y], chunk_size=1000)
+    assert result.converged
+    assert np.allclose(result.x, [2.5, -1.3, 0.5], atol=1e-6)
+    assert result.cost < 1e-12
+
+
+def test_gauss_newton():
+    result = levenberg_marquardt(model, [2.0, -1.0, 0.4], [t, y], method='gauss-newton')
+    assert result.converged
+    assert np.allclose(result.x, [2.5, -1.3, 0.5], atol=1e-6)
+
+    with pytest.raises(ValueError):
+        levenberg_marquardt(model, [2.0, -1.0, 0.4], [t, y], method='dogleg')
+
+
+if __name__ == '__main__':
+    test_normal_equations()
+    test_levenberg_marquardt()
+    test_gauss_newton()
@@ -0,0 +1,82 @@
+import pytest
+from src.auto_diff.memoize import Memoized, memoize
+from src.auto_diff.reverse_mode.compiled import trace
+import src.auto_diff.reverse_mode.elem as elem
+import numpy as np
+
+def test_value_and_gradient():
+    calls = []
+    compiled = trace(lambda x, y: x * elem.exp(y), 1.0, 2.0)
+
+    def evaluate(x):
+        calls.append(x)
+        return compiled.gradient(*x)
+
+    f = Memoized(evaluate)
+    x = np.array([1.5, 0.5])
+    assert np.isclose(f.value(x), 1.5 * np.exp(0.5))
+    assert np.allclose(f.gradient(x), [np.exp(0.5), 1.5 * np.exp(0.5)])
+    assert np.allclose(f.derivative([1.5, 0.5]), [np.exp(0.5), 1.5 * np.exp(0.5)])
+    assert len(calls) == 1
+    assert (f.hits, f.misses) == (2, 1)
+
+    f.value(np.array([1.5, 0.25]))
+    assert len(calls) == 2
+    assert (f.hits, f.misses) == (2, 2)
+
+    with pytest.raises(ValueError):
+        f.gradient(x)[0] = 0.0
+
+
+def test_lru_eviction():
+    @memoize(maxsize=2)
+    def f(x):
+        return np.sum(x ** 2), 2 * x
+
+    f(np.array([1.0]))
+    f(np.array([2.0]))
+    f(np.array([1.0]))
+    f(np.array([3.0]))
+    assert len(f) == 2
+    assert (f.hits, f.misses) == (1, 3)
+
+    f(np.array([1.0]))
+    assert f.hits == 2
+    f(np.array([2.0]))
+    assert f.misses == 4
+
+    f.cache_clear()
+    assert len(f) == 0
+    assert (f.hits, f.misses) == (0, 0)
+
+    with pytest.raises(ValueError):
+        Memoized(f, maxsize=0)
+
+
+def test_multiple_args():
+    f = Memoized(lambda x, y: (x * y, (y, x)))
+    assert f(2.0, 3.0)[0] == 6.0
+    assert f(2, 3)[0] == 6.0
+    assert f(3.0, 2.0)[0] == 6.0
+    assert (f.hits, f.misses) == (1, 2)
+
+
+def test_reused_buffer():
+    buffer = np.zeros(2)
+
+    def function(x):
+        buffer[:] = 2 * x
+        return x.sum(), buffer
+
+    f = Memoized(function)
+    assert np.array_equal(f.gradient(np.array([1.0, 2.0])), [2.0, 4.0])
+    assert np.array_equal(f.gradient(np.array([3.0, 4.0])), [6.0, 8.0])
+    assert np.array_equal(f.gradient(np.array([1.0, 2.0])), [2.0, 4.0])
+    assert buffer.flags.writeable
+
+
+if __name__ == '__main__':
+    test_value_and_gradient()
+    test_lru_eviction()
+    test_multiple_args()
+    test_reused_buffer()
@@ -0,0 +1,61 @@
+import pytest
+from src.auto_diff.optimize.minimize import gradient_descent, lbfgs, value_and_grad
+import src.auto_diff.reverse_mode.elem as elem
+import numpy as np
+
+def rosenbrock(*x):
+    total = 0
+    for i in range(len(x) - 1):
+        total = total + 100 * (x[i + 1] - x[i] ** 2) ** 2 + (1 - x[i]) ** 2
+    return total
+
+
+def quadratic(x, y):
+    return (x - 1) ** 2 + 10 * (y + 2) ** 2 + elem.exp(x - x)
+
+
+def test_value_and_grad():
+    for use_codegen in [True, False]:
+        evaluate = value_and_grad(quadratic, [0.0, 0.0], use_codegen)
+        value, grad = evaluate(np.array([2.0, -1.0]))
+        assert np.isclose(value, 12.0)
+        assert np.allclose(grad, [2.0, 20.0])
+
+
+def test_lbfgs():
+    for use_codegen in [True, False]:
+        result = lbfgs(rosenbrock, [-1.2, 1.0], use_codegen=use_codegen)
+        assert result.converged
+        assert np.allclose(result.x, [1.0, 1.0], atol=1e-6)
+
+    result = lbfgs(rosenbrock, np.zeros(10), m=5)
+    assert result.converged
+    assert np.allclose(result.x, np.ones(10), atol=1e-6)
+    assert result.function_evals < 200
+
+
+def test_gradient_descent():
+    result = gradient_descent(quadratic, [0.0, 0.0], learning_rate=0.02, method='momentum', tol=1e-6)
+    assert result.converged
+    assert np.allclose(result.x, [1.0, -2.0], atol=1e-5)
+
+    result = gradient_descent(quadratic, [0.0, 0.0], learning_rate=0.05, method='adam', max_iter=3000)
+    assert np.allclose(result.x, [1.0, -2.0], atol=1e-3)
+    assert np.isclose(result.fun, 1.0, atol=1e-5)
+
+    with pytest.raises(ValueError):
+        gradient_descent(quadratic, [0.0, 0.0], method='sgd')
+
+
+def test_changing_objective():
+    for target in [1.0, 5.0]:
+        objective = lambda x: (x - target) ** 2
+        assert np.allclose(lbfgs(objective, [0.0]).x, [target])
+        assert np.allclose(gradient_descent(objective, [0.0], learning_rate=0.1, method='momentum').x, [target])
+
+
+if __name__ == '__main__':
+    test_value_and_grad()
+    test_lbfgs()
+    test_gradient_descent()
+    test_changing_objective()
@@ -1,5 +1,5 @@
 import pytest
-from src.auto_diff.reverse_mode.rnode import Rnode
+from src.auto_diff.reverse_mode.rnode import Rnode, backward
 import numpy as np
 
 def test_pow():
@@ -50,7 +50,7 @@ def test_add():
     res1.grad_value = 1
 
     assert res1.val == 5
-    assert v_0.grad() == 0
+    assert v_0.grad() == 1
 
     v_0 = Rnode(1)
     v_1 = Rnode(2)
@@ -67,7 +67,7 @@ def test_radd():
     v_1.grad_value = 1
 
     assert v_1.val == 5
-    assert v_0.grad() == 0
+    assert v_0.grad() == 1
 
 
 def test_sub():
@@ -77,7 +77,7 @@ def test_sub():
     res1.grad_value = 1
 
     assert res1.val == -3
-    assert v_0.grad() == 0
+    assert v_0.grad() == 1
 
     v_0 = Rnode(1)
     v_1 = Rnode(2)
@@ -86,6 +86,7 @@ def test_sub():
 
     assert res2.val == -1
     assert v_0.grad() == 1
+    assert v_1.grad() == -1
 
 
 def test_rsub():
@@ -94,7 +95,7 @@ def test_rsub():
     v_1.grad_value = 1
 
     assert v_1.val == 3
-    assert v_0.grad() == 0
+    assert v_0.grad() == -1
 
 
 def test_mul():
@@ -104,7 +105,7 @@ def test_mul():
     res1.grad_value = 1
 
     assert res1.val == 5
-    assert v_0.grad() == 0
+    assert v_0.grad() == 5
 
     v_0 = Rnode(1)
     v_1 = Rnode(2)
@@ -121,7 +122,7 @@ def test_rmul():
     v_1.grad_value = 1
 
     assert v_1.val == 9
-    assert v_0.grad() == 0
+    assert v_0.grad() == 3
 
 
 def test_truediv():
@@ -131,7 +132,7 @@ def test_truediv():
     res1.grad_value = 1
 
     assert res1.val == 0.8
-    assert v_0.grad() == 0
+    assert v_0.grad() == 0.2
 
     v_0 = Rnode(4)
     v_1 = Rnode(8)
@@ -148,7 +149,234 @@ def test_rtruediv():
     v_1.grad_value = 1
 
     assert v_1.val == 1
-    assert v_0.grad() == 0
+    assert v_0.grad() == -0.25
+
+
+def test_backward():
+    x = Rnode(2.0)
+    y = Rnode(3.0)
+    f = x * y + x ** 2 - y / x
+    f.backward()
+
+    assert f.grad_value == 1
+    assert x.grad() == 3.0 + 4.0 + 3.0 / 4.0
+    assert y.grad() == 2.0 - 0.5
+
+
+def test_backward_shared_node():
+    x = Rnode(3.0)
+    v_1 = x * x
+    f = v_1 + v_1 * x
+    f.backward()
+
+    assert v_1.grad_value == 1 + 3.0
+    assert x.grad() == 2 * 3.0 + 3 * 3.0 ** 2
+
+
+def test_grad_shared_node():
+    x = Rnode(3.0)
+    v_1 = x * x
+    f = v_1 + v_1 * x
+    f.grad_value = 1
+
+    assert x._children == [v_1, f._parents[1][1]]
+    assert v_1.grad() == 1 + 3.0
+    assert x.grad() == 2 * 3.0 + 3 * 3.0 ** 2
+
+
+def test_backward_deep_graph():
+    x = Rnode(1.0)
+    f = x
+    for _ in range(5000):
+        f = f * 1.0001 + 0.5
+    f.backward()
+
+    assert np.isclose(x.grad(), 1.0001 ** 5000)
+
+
+def test_slots():
+    v_0 = Rnode(1.0)
+    assert not hasattr(v_0, '__dict__')
+    with pytest.raises(AttributeError):
+        v_0.name = 'x'
+
+
+def test_backward_release_graph():
+    x = Rnode(2.0)
+    y = Rnode(3.0)
+    v_1 = x * y
+    f = v_1 + x ** 2
+    f.backward(retain_graph=False)
+
+    assert x.grad() == 3.0 + 4.0
+    assert y.grad() == 2.0
+    for rnode in [x, y, v_1, f]:
+        assert rnode._parents == []
+        assert rnode._children == []
+
+    with pytest.raises(ValueError):
+        f.backward()
+    with pytest.raises(ValueError):
+        v_1.backward()
+    g = x * 5
+    g.backward()
+    assert x.grad() == 5.0
+
+
+def test_backward_released_intermediate():
+    x = Rnode(3.0)
+    y = x * x
+    f_1 = y + 1
+    f_2 = y * 2
+    f_1.backward(retain_graph=False)
+    assert x.grad() == 6.0
+    with pytest.raises(ValueError):
+        f_2.backward()
+
+    z = x * 4
+    z.backward(retain_graph=False)
+    w = z * 3
+    with pytest.raises(ValueError):
+        w.backward()
+
+
+def test_array_values():
+    x = Rnode([1.0, 2.0, 3.0])
+    y = Rnode(np.array([4, 5, 6]))
+    f = x * y + x ** 2 - 1 / y
+    f.backward()
+
+    assert np.array_equal(f.val, np.array([1.0, 2.0, 3.0]) * np.array([4.0, 5.0, 6.0]) + np.array([1.0, 4.0, 9.0]) - 1 / np.array([4.0, 5.0, 6.0]))
+    assert np.allclose(x.grad(), np.array([4.0, 5.0, 6.0]) + 2 * np.array([1.0, 2.0, 3.0]))
+    assert np.allclose(y.grad(), np.array([1.0, 2.0, 3.0]) + 1 / np.array([4.0, 5.0, 6.0]) ** 2)
+
+
+def test_array_broadcasting():
+    x = Rnode(np.ones((2, 3)))
+    y = Rnode(np.array([1.0, 2.0, 3.0]))
+    b = Rnode(np.array([[1.0], [2.0]]))
+    s = Rnode(2.0)
+    f = x * y + b * s
+    f.backward()
+
+    assert f.val.shape == (2, 3)
+    assert np.array_equal(x.grad(), np.array([[1.0, 2.0, 3.0], [1.0, 2.0, 3.0]]))
+    assert np.array_equal(y.grad(), np.array([2.0, 2.0, 2.0]))
+    assert np.array_equal(b.grad(), np.array([[6.0], [6.0]]))
+    assert s.grad() == 9.0
+
+
+def test_array_constants():
+    x = Rnode(np.array([1.0, 2.0]))
+    c = np.array([3.0, 4.0])
+    f = c * x + c - x / c + 2.0 ** x
+    f.backward()
+
+    assert isinstance(f, Rnode)
+    assert np.allclose(x.grad(), c - 1 / c + np.log(2.0) * 2.0 ** x.val)
+
+
+def test_backward_seed():
+    x = Rnode(2.0)
+    y = Rnode(3.0)
+    f = x * y
+    g = x + y ** 2
+
+    f.backward()
+    assert (x.grad(), y.grad()) == (3.0, 2.0)
+
+    g.backward(seed=2.0)
+    assert (x.grad(), y.grad()) == (2.0, 12.0)
+
+    f.backward(seed=-1)
+    assert (x.grad(), y.grad()) == (-3.0, -2.0)
+
+    backward([f, g], [1.0, 0.5])
+    assert (x.grad(), y.grad()) == (3.5, 5.0)
+
+
+def test_backward_array_seed():
+    x = Rnode(np.array([1.0, 2.0, 3.0]))
+    f = x ** 2
+    f.backward(seed=np.array([1.0, 0.0, 2.0]))
+    assert np.array_equal(x.grad(), np.array([2.0, 0.0, 12.0]))
+
+    with pytest.raises(ValueError):
+        f.backward(seed=np.array([1.0, 0.0]))
+
+
+def test_zero_grad():
+    x = Rnode(2.0)
+    v_1 = x * x
+    f = v_1 * 3
+    g = v_1 + x
+
+    f.grad_value = 1
+    assert x.grad() == 12.0
+
+    f.zero_grad()
+    assert x.grad_value is None and v_1.grad_value is None and f.grad_value is None
+    g.grad_value = 1
+    assert x.grad() == 5.0
+
+
+def numerical_grad(f, x, h=1e-6):
+    grad = np.zeros_like(x)
+    for i in np.ndindex(x.shape):
+        step = np.zeros_like(x)
+        step[i] = h
+        grad[i] = (f(x + step) - f(x - step)) / (2 * h)
+    return grad
+
+
+def test_dense_layer():
+    rng = np.random.default_rng(0)
+    w_val = rng.normal(size=(3, 4))
+    x_val = rng.normal(size=4)
+    b_val = rng.normal(size=3)
+
+    w, x, b = Rnode(w_val), Rnode(x_val), Rnode(b_val)
+    f = ((w @ x + b) ** 2).sum()
+    f.backward()
+
+    loss = lambda w_, x_, b_: np.sum((w_ @ x_ + b_) ** 2)
+    assert np.isclose(f.val, loss(w_val, x_val, b_val))
+    assert np.allclose(w.grad(), numerical_grad(lambda v: loss(v, x_val, b_val), w_val))
+    assert np.allclose(x.grad(), numerical_grad(lambda v: loss(w_val, v, b_val), x_val))
+    assert np.allclose(b.grad(), numerical_grad(lambda v: loss(w_val, x_val, v), b_val))
+    assert len(f._parents) == 1
+
+
+def test_matmul_shapes():
+    rng = np.random.default_rng(1)
+    a_val = rng.normal(size=(2, 3))
+    b_val = rng.normal(size=(3, 4))
+    v_val = rng.normal(size=3)
+
+    a, b, v = Rnode(a_val), Rnode(b_val), Rnode(v_val)
+    f = (a @ b).sum() + (v @ b).mean() + v.dot(v) + (a_val.T @ a @ v).sum()
+    f.backward()
+
+    loss = lambda a_, b_, v_: np.sum(a_ @ b_) + np.mean(v_ @ b_) + v_ @ v_ + np.sum(a_val.T @ a_ @ v_)
+    assert np.isclose(f.val, loss(a_val, b_val, v_val))
+    assert np.allclose(a.grad(), numerical_grad(lambda x: loss(x, b_val, v_val), a_val))
+    assert np.allclose(b.grad(), numerical_grad(lambda x: loss(a_val, x, v_val), b_val))
+    assert np.allclose(v.grad(), numerical_grad(lambda x: loss(a_val, b_val, x), v_val))
+
+
+def test_reductions_and_shapes():
+    x_val = np.arange(24.0).reshape(2, 3, 4) / 10
+    x = Rnode(x_val)
+    f = (x.sum(axis=1) ** 2).sum() + (x.mean(axis=(0, 2)) * np.array([1.0, 2.0, 3.0])).sum() \
+        + (x.transpose((2, 0, 1)).reshape(4, 6) @ np.ones(6)).sum()
+    f.backward()
+
+    def loss(v):
+        return (np.sum(np.sum(v, axis=1) ** 2) + np.sum(np.mean(v, axis=(0, 2)) * np.array([1.0, 2.0, 3.0]))
+                + np.sum(np.transpose(v, (2, 0, 1)).reshape(4, 6) @ np.ones(6)))
+
+    assert np.isclose(f.val, loss(x_val))
+    assert np.allclose(x.grad(), numerical_grad(loss, x_val))
 
 
 if __name__ == '__main__':
@@ -163,3 +391,19 @@ if __name__ == '__main__':
     test_rmul()
     test_truediv()
     test_rtruediv()
+    test_backward()
+    test_backward_shared_node()
+    test_grad_shared_node()
+    test_backward_deep_graph()
+    test_slots()
+    test_backward_release_graph()
+    test_backward_released_intermediate()
+    test_array_values()
+    test_array_broadcasting()
+    test_array_constants()
+    test_backward_seed()
+    test_backward_array_seed()
+    test_zero_grad()
+    test_dense_layer()
+    test_matmul_shapes()
+    test_reductions_and_shapes()
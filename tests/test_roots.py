@@ -0,0 +1,66 @@
+import pytest
+from src.auto_diff.optimize.roots import jacobian, newton
+import src.auto_diff.forward_mode.elem as elem
+import numpy as np
+
+def circle(x, y):
+    return [x ** 2 + y ** 2 - 4, x * y - 1]
+
+
+def broyden_tridiagonal(*x):
+    n = len(x)
+    return [(3 - 2 * x[i]) * x[i] - (x[i - 1] if i > 0 else 0) - 2 * (x[i + 1] if i + 1 < n else 0) + 1
+            for i in range(n)]
+
+
+def test_jacobian():
+    f, jac = jacobian(lambda x, y, z: [x * y, elem.exp(z), 2.0], [2.0, 3.0, 0.0])
+    assert np.allclose(f, [6.0, 1.0, 2.0])
+    assert np.allclose(jac, [[3.0, 2.0, 0.0], [0.0, 0.0, 1.0], [0.0, 0.0, 0.0]])
+
+
+def test_newton():
+    result = newton(circle, [2.0, 0.5])
+    assert result.converged
+    assert np.allclose(circle(*result.x), 0, atol=1e-9)
+    assert result.jacobian_evals == result.function_evals == result.iterations + 1
+
+
+def test_broyden():
+    x0 = -np.ones(20)
+    exact = newton(broyden_tridiagonal, x0)
+    quasi = newton(broyden_tridiagonal, x0, method='broyden')
+    assert exact.converged and quasi.converged
+    assert np.allclose(quasi.x, exact.x, atol=1e-8)
+    assert quasi.jacobian_evals < exact.jacobian_evals
+
+    refreshed = newton(broyden_tridiagonal, x0, method='broyden', refresh=3)
+    assert refreshed.converged
+    assert np.allclose(refreshed.x, exact.x, atol=1e-8)
+
+
+def test_errors():
+    with pytest.raises(ValueError):
+        newton(circle, [2.0, 0.5], method='secant')
+    with pytest.raises(ValueError):
+        newton(lambda x, y: [x + y], [1.0, 2.0])
+
+    result = newton(circle, [2.0, 0.5], max_iter=1)
+    assert not result.converged
+
+
+def test_singular_jacobian():
+    # the derivative vanishes at the starting point
+    for method in ['newton', 'broyden']:
+        result = newton(lambda x: [x * x + 1], [0.0], method=method)
+        assert not result.converged
+        assert result.iterations == 0
+        assert np.array_equal(result.x, [0.0])
+
+
+if __name__ == '__main__':
+    test_jacobian()
+    test_newton()
+    test_broyden()
+    test_singular_jacobian()
+    test_errors()
@@ -0,0 +1,78 @@
+import pytest
+from src.auto_diff.forward_mode.sparse import SparseJacobian, color_columns, sparsity_pattern
+import src.auto_diff.forward_mode.elem as elem
+import numpy as np
+
+def residuals(*x):
+    n = len(x)
+    return [2 * x[i] - x[i - 1] * elem.sin(x[i]) - (x[i + 1] if i + 1 < n else 1.0) for i in range(n)]
+
+
+def residuals_jac(x):
+    n = len(x)
+    jac = np.zeros((n, n))
+    for i in range(n):
+        jac[i, i] = 2 - (x[i - 1] * np.cos(x[i]) if i > 0 else 0)
+        if i > 0:
+            jac[i, i - 1] = -np.sin(x[i])
+        if i + 1 < n:
+            jac[i, i + 1] = -1
+    return jac
+
+
+def residuals_first(*x):
+    n = len(x)
+    return [2 * x[0] - (x[1] if n > 1 else 1.0)] + residuals(*x)[1:]
+
+
+def test_pattern():
+    rows, cols, num_outputs = sparsity_pattern(residuals_first, [1.0, 2.0, 3.0])
+    assert num_outputs == 3
+    assert rows.tolist() == [0, 0, 1, 1, 1, 2, 2]
+    assert cols.tolist() == [0, 1, 0, 1, 2, 1, 2]
+
+
+def test_coloring():
+    rows = np.array([0, 0, 1, 1, 2])
+    cols = np.array([0, 1, 1, 2, 3])
+    colors = color_columns(rows, cols, 4)
+    for r in range(3):
+        row_colors = colors[cols[rows == r]]
+        assert len(set(row_colors)) == len(row_colors)
+    assert colors.max() + 1 == 2
+
+
+def test_tridiagonal():
+    n = 40
+    x = np.linspace(0.1, 2.0, n)
+    jac = SparseJacobian(residuals_first, list(x))
+    assert jac.shape == (n, n)
+    assert jac.num_colors == 3
+
+    expected = residuals_jac(x)
+    expected[0, :] = 0
+    expected[0, 0], expected[0, 1] = 2, -1
+    assert np.allclose(jac.todense(list(x)), expected)
+
+    x_new = x[::-1] * 0.5
+    expected = residuals_jac(x_new)
+    expected[0, :] = 0
+    expected[0, 0], expected[0, 1] = 2, -1
+    data, rows, cols = jac.coo(list(x_new))
+    assert len(data) == 3 * n - 2
+    assert np.allclose(data, expected[rows, cols])
+
+
+def test_to_scipy():
+    scipy_sparse = pytest.importorskip('scipy.sparse')
+    jac = SparseJacobian(lambda x, y, z: [x * y, z + 1], [1.0, 2.0, 3.0])
+    matrix = jac.to_scipy([1.0, 2.0, 3.0])
+    assert isinstance(matrix, scipy_sparse.coo_matrix)
+    assert np.allclose(matrix.toarray(), np.array([[2.0, 1.0, 0.0], [0.0, 0.0, 1.0]]))
+
+
+if __name__ == '__main__':
+    test_pattern()
+    test_coloring()
+    test_tridiagonal()
+    test_to_scipy()
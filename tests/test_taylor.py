@@ -0,0 +1,97 @@
+import pytest
+from src.auto_diff.forward_mode.taylor import Taylor
+from src.auto_diff.forward_mode.fnode import Fnode
+from src.auto_diff.forward_mode.hessian_fnode import HessianFnode
+from src.auto_diff.forward_mode.dense_fnode import VarRegistry
+import src.auto_diff.forward_mode.elem as elem
+import numpy as np
+from math import factorial
+
+def test_exp_sin():
+    x = Taylor(0.0, 1, order=8)
+    assert np.allclose(elem.exp(x).coeffs[0], [1 / factorial(k) for k in range(9)])
+    assert np.allclose(elem.sin(x).derivs[0], [0, 1, 0, -1, 0, 1, 0, -1, 0])
+    assert np.allclose(elem.cos(x).derivs[0], [1, 0, -1, 0, 1, 0, -1, 0, 1])
+    assert np.allclose(elem.sinh(x).derivs[0], [0, 1, 0, 1, 0, 1, 0, 1, 0])
+    assert np.allclose(elem.cosh(x).derivs[0], [1, 0, 1, 0, 1, 0, 1, 0, 1])
+
+
+def test_series():
+    order = 10
+    x = Taylor(0.0, 1, order=order)
+    # ln(1 + x) = sum (-1)^(k+1) x^k / k
+    expected = [0] + [(-1) ** (k + 1) / k for k in range(1, order + 1)]
+    assert np.allclose(elem.ln(1 + x).coeffs[0], expected)
+    # 1 / (1 - x) = sum x^k
+    assert np.allclose((1 / (1 - x)).coeffs[0], np.ones(order + 1))
+    # arctan(x) = sum (-1)^k x^(2k+1) / (2k+1)
+    expected = [0 if k % 2 == 0 else (-1) ** (k // 2) / k for k in range(order + 1)]
+    assert np.allclose(elem.arctan(x).coeffs[0], expected)
+    # sqrt(1 + x) = sum binom(1/2, k) x^k
+    binom = [1.0]
+    for k in range(1, order + 1):
+        binom.append(binom[-1] * (0.5 - k + 1) / k)
+    assert np.allclose(elem.sqrt(1 + x).coeffs[0], binom)
+    # x ** 3 at 0 is exact
+    assert np.allclose((x ** 3).derivs[0], [0, 0, 0, 6] + [0] * (order - 3))
+
+
+def test_against_nested():
+    v = 0.3
+    x = Taylor(v, 1, order=4)
+    funcs = [
+        (elem.tan, [np.tan(v), 1 / np.cos(v) ** 2, 2 * np.tan(v) / np.cos(v) ** 2]),
+        (elem.tanh, [np.tanh(v), 1 - np.tanh(v) ** 2, -2 * np.tanh(v) * (1 - np.tanh(v) ** 2)]),
+        (elem.arcsin, [np.arcsin(v), (1 - v ** 2) ** -0.5, v * (1 - v ** 2) ** -1.5]),
+        (elem.arccos, [np.arccos(v), -(1 - v ** 2) ** -0.5, -v * (1 - v ** 2) ** -1.5]),
+        (lambda x: elem.log(x, 2), [np.log2(v), 1 / (v * np.log(2)), -1 / (v ** 2 * np.log(2))]),
+        (lambda x: x ** 2.5, [v ** 2.5, 2.5 * v ** 1.5, 3.75 * v ** 0.5]),
+        (lambda x: 2 ** x, [2 ** v, np.log(2) * 2 ** v, np.log(2) ** 2 * 2 ** v]),
+        (lambda x: x ** x, [v ** v, v ** v * (np.log(v) + 1), v ** v * ((np.log(v) + 1) ** 2 + 1 / v)]),
+        (lambda x: elem.logistic_fn(x, 0.1, 2, 3),
+         [2 / (1 + np.exp(-3 * 0.2)), 3 * 2 * np.exp(-0.6) / (1 + np.exp(-0.6)) ** 2,
+          9 * 2 * np.exp(-0.6) * (np.exp(-0.6) - 1) / (1 + np.exp(-0.6)) ** 3]),
+    ]
+    for func, expected in funcs:
+        derivs = func(x).derivs[0]
+        for k, value in enumerate(expected):
+            if value is not None:
+                assert np.isclose(derivs[k], value)
+
+
+def test_logistic_matches_fnode():
+    taylor = elem.logistic_fn(Taylor(1.0, order=2), 3.0, 2.0, 0.5).derivs[0]
+    fnode = elem.logistic_fn(Fnode(1.0, 1, 'x'), 3.0, 2.0, 0.5)
+    hess = elem.logistic_fn(HessianFnode(1.0, 1, 'x', VarRegistry()), 3.0, 2.0, 0.5)
+    assert np.isclose(taylor[0], fnode.val[0])
+    assert np.isclose(taylor[1], fnode.deriv['x'][0])
+    assert np.isclose(taylor[2], hess.hessian[0, 0, 0])
+
+
+def test_points():
+    x = Taylor(np.array([0.0, 1.0]), 1, order=3)
+    y = x * x * x - 2 * x
+    assert np.allclose(y.derivs, [[0, -2, 0, 6], [-1, 1, 6, 6]])
+
+
+def test_invalid():
+    x = Taylor(1.0, 1, order=3)
+    with pytest.raises(TypeError):
+        x + 'a'
+    with pytest.raises(TypeError):
+        x ** 'a'
+    with pytest.raises(ValueError):
+        x + Taylor(1.0, 1, order=2)
+    with pytest.raises(ValueError):
+        Taylor(1.0, 1, order=-1)
+    with pytest.raises(TypeError):
+        Taylor('a')
+
+
+if __name__ == '__main__':
+    test_exp_sin()
+    test_series()
+    test_against_nested()
+    test_logistic_matches_fnode()
+    test_points()
+    test_invalid()
@@ -15,5 +15,29 @@ def test_vector():
     assert np.array_equal(res.get_deriv()[1][0][:, res.get_deriv()[0].index('x')], np.array([4, np.cos(3)]))
     assert np.array_equal(res.get_deriv()[1][0][:, res.get_deriv()[0].index('y')], np.array([12, np.cos(3)]))
 
+def test_deriv_array():
+    x = Fnode(np.array([1.0, 2.0, 3.0]), 1, 'x')
+    y = Fnode(np.array([0.5, 1.5, 2.5]), 1, 'y')
+    z = Fnode(np.array([2.0, 1.0, 0.0]), 1, 'z')
+    res = Vector_Fn([x * y, elem.exp(z) + y, x - 4])
+    var_names, jac = res.get_deriv()
+
+    assert var_names == ['x', 'y', 'z']
+    assert jac.shape == (3, 3, 3)
+    for i in range(3):
+        expected = np.array([[y.val[i], x.val[i], 0],
+                             [0, 1, np.exp(z.val[i])],
+                             [1, 0, 0]])
+        assert np.allclose(jac[i], expected)
+
+    out = np.full((3, 3, 3), 7.0)
+    assert res.get_deriv(out)[1] is out
+    assert np.allclose(out, jac)
+
+    with pytest.raises(ValueError):
+        res.get_deriv(np.zeros((3, 3, 2)))
+
+
 if __name__ == '__main__':
-    test_vector()
\ No newline at end of file
+    test_vector()
+    test_deriv_array()
\ No newline at end of file
@@ -0,0 +1,77 @@
+from src.auto_diff.reverse_mode.rnode import Rnode
+import src.auto_diff.reverse_mode.elem as elem
+from src.auto_diff.reverse_mode.vector_rn import Vector_Rn
+from src.auto_diff.forward_mode.fnode import Fnode
+import src.auto_diff.forward_mode.elem as f_elem
+from src.auto_diff.forward_mode.vector_fn import Vector_Fn
+import numpy as np
+import pytest
+
+def test_vector():
+    x = Rnode(1)
+    y = Rnode(2)
+    f1 = 2 * x ** 2 + 3 * y ** 2
+    f2 = elem.sin(x + y)
+    res = Vector_Rn([f1, f2])
+
+    assert np.array_equal(res.get_vals(), np.array([14, np.sin(3)]))
+    assert np.array_equal(res.get_deriv([x, y]), np.array([[4, 12], [np.cos(3), np.cos(3)]]))
+
+
+def test_matches_forward_mode():
+    x, y, z = Rnode(0.5), Rnode(1.5), Rnode(2.0)
+    res = Vector_Rn([x * y * z, elem.exp(x) / y, elem.sqrt(z) - x, z])
+
+    x_f, y_f, z_f = Fnode(0.5, 1, 'x'), Fnode(1.5, 1, 'y'), Fnode(2.0, 1, 'z')
+    res_f = Vector_Fn([x_f * y_f * z_f, f_elem.exp(x_f) / y_f, f_elem.sqrt(z_f) - x_f, z_f * 1])
+    var_names, jacobian = res_f.get_deriv()
+
+    assert np.allclose(res.get_deriv([x, y, z]), jacobian[0])
+
+
+def test_unused_input():
+    x, y = Rnode(1.0), Rnode(2.0)
+    res = Vector_Rn([x * 3, x + x])
+
+    assert np.array_equal(res.get_deriv([x, y]), np.array([[3, 0], [2, 0]]))
+
+
+def test_array_valued():
+    x = Rnode(np.array([1.0, 2.0]))
+    y = Rnode(3.0)
+    res = Vector_Rn([x * y, elem.exp(y)])
+
+    assert np.array_equal(res.get_vals(), np.array([3.0, 6.0, np.exp(3.0)]))
+    assert np.allclose(res.get_deriv([x, y]), np.array([[3, 0, 1], [0, 3, 2], [0, 0, np.exp(3.0)]]))
+
+
+def test_linear_algebra():
+    w_val = np.arange(6.0).reshape(2, 3)
+    w = Rnode(w_val)
+    x = Rnode(np.array([1.0, 2.0, 3.0]))
+    res = Vector_Rn([w @ x, x.sum(), x.reshape(3, 1).T.mean()])
+
+    jacobian = res.get_deriv([x, w])
+    assert jacobian.shape == (4, 9)
+    assert np.array_equal(jacobian[:2, :3], w_val)
+    assert np.array_equal(jacobian[:2, 3:], np.kron(np.eye(2), x.val))
+    assert np.array_equal(jacobian[2:, :3], np.array([[1.0, 1.0, 1.0], [1 / 3, 1 / 3, 1 / 3]]))
+    assert np.array_equal(jacobian[2:, 3:], np.zeros((2, 6)))
+
+
+def test_released_graph():
+    x = Rnode(2.0)
+    y = x * x
+    res = Vector_Rn([y + 1, elem.sin(y)])
+    (y * 3).backward(retain_graph=False)
+    with pytest.raises(ValueError):
+        res.get_deriv([x])
+
+
+if __name__ == '__main__':
+    test_vector()
+    test_matches_forward_mode()
+    test_unused_input()
+    test_array_valued()
+    test_linear_algebra()
+    test_released_graph()